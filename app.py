@@ -1,9 +1,32 @@
 import streamlit as st
 import pandas as pd
-import altair as alt
 import io
-import re
-from collections import Counter
+import os
+import time
+import shutil
+import zipfile
+import tempfile
+import threading
+
+from wos_prep.merge import NEAR_DUP_MODES, NEAR_DUP_DEFAULT_THRESHOLD, format_dedup_counts
+from wos_prep.classify import (
+    DEFAULT_PROFILE_NAME, compile_rule_profiles, profile_classifier, summarize_profile_labels, with_matching,
+)
+from wos_prep.diagnostics import diagnose_merged_quality, diagnose_quality_counts
+from wos_prep.export import (
+    SCIMAT_DEFAULT_PART_RECORDS, iter_scimat_wos_chunks, write_scimat_wos_zip,
+    write_excel_workbook, count_excel_overflow_cells,
+)
+from wos_prep.parser import LAZY_FIELD_TAGS
+from wos_prep.pipeline import split_classified, compute_upload_key
+from wos_prep.stages import StagedWosPipeline, stage_key
+from wos_prep.diskcache import CorpusDiskCache
+from wos_prep.sources import get_server_directory, find_wos_inputs, open_wos_sources
+from wos_prep.streaming import stream_merge_wos_files
+from wos_prep.jobs import BackgroundJob, JOB_POLL_SECONDS
+from wos_prep.search import build_search_index, WosQueryError, SEARCH_RESULT_COLUMNS
+from wos_prep.rules import load_rule_profiles, get_rules_file, RULES_FILE_ENV
+from wos_prep.profiling import PipelineProfile, memory_tracing_requested, start_memory_tracing, TRACE_MEMORY_ENV
 
 # --- 페이지 설정 ---
 st.set_page_config(
@@ -12,6 +35,10 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# 단계별 최대 할당량 측정 (tracemalloc, 처리 속도가 느려지므로 환경 변수로 켠 경우에만)
+if memory_tracing_requested():
+    start_memory_tracing()
+
 # --- 토스 스타일 CSS ---
 st.markdown("""
 <style>
@@ -331,356 +358,467 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# --- 다중 WOS Plain Text 파일 로딩 및 병합 함수 ---
-def load_and_merge_wos_files(uploaded_files):
-    """다중 WOS Plain Text 파일을 로딩하고 병합 - 중복 제거 완전 수정"""
-    all_dataframes = []
-    file_status = []
-    
-    for i, uploaded_file in enumerate(uploaded_files):
-        try:
-            file_bytes = uploaded_file.getvalue()
-            encodings_to_try = ['utf-8-sig', 'utf-8', 'latin1', 'iso-8859-1']
-            
-            df = None
-            encoding_used = None
-            
-            for encoding in encodings_to_try:
-                try:
-                    file_content = file_bytes.decode(encoding)
-                    
-                    # WOS 원본 형식 검증 (FN으로 시작해야 함)
-                    if not file_content.strip().startswith('FN '):
-                        continue
-                        
-                    # WOS 형식 파싱
-                    df = parse_wos_format(file_content)
-                    if df is not None and len(df) > 0:
-                        encoding_used = encoding
-                        break
-                        
-                except Exception:
-                    continue
-            
-            if df is not None:
-                all_dataframes.append(df)
-                file_status.append({
-                    'filename': uploaded_file.name,
-                    'status': 'SUCCESS',
-                    'papers': len(df),
-                    'encoding': encoding_used,
-                    'message': f'✅ {len(df)}편 논문 로딩 성공'
-                })
-            else:
-                file_status.append({
-                    'filename': uploaded_file.name,
-                    'status': 'ERROR',
-                    'papers': 0,
-                    'encoding': 'N/A',
-                    'message': '❌ WOS Plain Text 형식이 아님'
-                })
-                
-        except Exception as e:
-            file_status.append({
-                'filename': uploaded_file.name,
-                'status': 'ERROR',
-                'papers': 0,
-                'encoding': 'N/A',
-                'message': f'❌ 파일 처리 오류: {str(e)[:50]}'
-            })
-    
-    # 모든 데이터프레임 병합
-    if all_dataframes:
-        merged_df = pd.concat(all_dataframes, ignore_index=True)
-        original_count = len(merged_df)
-        
-        # 중복 제거 로직 - 완전히 새로 작성
-        duplicates_removed = 0
-        
-        if 'UT' in merged_df.columns:
-            # UT 필드의 실제 값들 확인
-            ut_series = merged_df['UT'].copy()
-            
-            # 유효한 UT 값만 필터링 (더 엄격한 조건)
-            def is_meaningful_ut(value):
-                if pd.isna(value):
-                    return False
-                str_value = str(value).strip()
-                # 빈 문자열, 'nan', 'None', 매우 짧은 값들 제외
-                if len(str_value) == 0 or str_value.lower() in ['nan', 'none', 'null', '']:
-                    return False
-                # WOS UT는 일반적으로 'WOS:' 또는 문자+숫자 조합
-                # 최소 10자 이상의 의미있는 값만 유효한 것으로 간주
-                if len(str_value) < 10:
-                    return False
-                # 'WOS:' 로 시작하거나 충분히 긴 영숫자 조합인 경우만 유효
-                if str_value.startswith('WOS:') or (len(str_value) >= 15 and any(c.isalnum() for c in str_value)):
-                    return True
-                return False
-            
-            # 유효한 UT를 가진 행들만 선별
-            meaningful_ut_mask = ut_series.apply(is_meaningful_ut)
-            rows_with_meaningful_ut = merged_df[meaningful_ut_mask]
-            rows_without_meaningful_ut = merged_df[~meaningful_ut_mask]
-            
-            # 실제로 의미있는 UT가 있는 경우에만 중복 검사
-            if len(rows_with_meaningful_ut) > 1:  # 최소 2개 이상 있어야 중복 검사 의미
-                # 중복 제거 전후 비교
-                before_dedup = len(rows_with_meaningful_ut)
-                deduplicated_meaningful = rows_with_meaningful_ut.drop_duplicates(subset=['UT'], keep='first')
-                after_dedup = len(deduplicated_meaningful)
-                
-                actual_duplicates = before_dedup - after_dedup
-                
-                if actual_duplicates > 0:
-                    duplicates_removed = actual_duplicates
-                    
-                    # 중복 제거된 결과와 UT 없는 행들 재결합
-                    merged_df = pd.concat([deduplicated_meaningful, rows_without_meaningful_ut], ignore_index=True)
-        
-        # 대안: UT가 없거나 신뢰할 수 없는 경우 제목+저자 기준 중복 제거
-        if duplicates_removed == 0 and 'TI' in merged_df.columns:
-            # 제목과 첫 번째 저자 기준으로 중복 확인 (매우 보수적)
-            title_author_before = len(merged_df)
-            
-            # 제목이 있고 저자가 있는 행들만 대상
-            has_title = merged_df['TI'].notna() & (merged_df['TI'].str.strip() != '')
-            has_author = merged_df.get('AU', pd.Series()).notna() if 'AU' in merged_df.columns else pd.Series([False] * len(merged_df))
-            
-            complete_rows = merged_df[has_title & has_author] if 'AU' in merged_df.columns else merged_df[has_title]
-            incomplete_rows = merged_df[~(has_title & has_author)] if 'AU' in merged_df.columns else merged_df[~has_title]
-            
-            if len(complete_rows) > 1:
-                dedup_columns = ['TI', 'AU'] if 'AU' in merged_df.columns else ['TI']
-                deduplicated_complete = complete_rows.drop_duplicates(subset=dedup_columns, keep='first')
-                title_author_removed = len(complete_rows) - len(deduplicated_complete)
-                
-                if title_author_removed > 0:
-                    duplicates_removed = title_author_removed
-                    merged_df = pd.concat([deduplicated_complete, incomplete_rows], ignore_index=True)
-        
-        return merged_df, file_status, duplicates_removed
-    else:
-        return None, file_status, 0
+# --- 파이프라인 결과 캐시 ---
+# 위젯 클릭 등으로 스크립트가 재실행될 때 병합/분류/내보내기를 다시 수행하지 않도록
+# 병합/분류는 세션별 단계 파이프라인이 단계별 키(상위 단계 키 + 단계 파라미터)로 보관하고, 내보내기 결과는
+# 분류 단계 키 + 내보내기 옵션으로 메모이즈 (최대 개수 초과 시 오래된 항목부터 제거)
+PIPELINE_CACHE_MAX_ENTRIES = 8
 
-def parse_wos_format(content):
-    """WOS Plain Text 형식을 DataFrame으로 변환"""
-    lines = content.split('\n')
-    records = []
-    current_record = {}
-    current_field = None
-    
-    for line in lines:
-        line = line.rstrip()
-        
-        if not line:
-            continue
-            
-        # 레코드 종료
-        if line == 'ER':
-            if current_record:
-                records.append(current_record.copy())
-                current_record = {}
-                current_field = None
-            continue
-            
-        # 헤더 라인 건너뛰기
-        if line.startswith(('FN ', 'VR ')):
-            continue
-            
-        # 새 필드 시작
-        if not line.startswith('   ') and ' ' in line:
-            parts = line.split(' ', 1)
-            if len(parts) == 2:
-                field_tag, field_value = parts
-                current_field = field_tag
-                current_record[field_tag] = field_value.strip()
-        
-        # 기존 필드 연속
-        elif line.startswith('   ') and current_field and current_field in current_record:
-            continuation_value = line[3:].strip()
-            if continuation_value:
-                current_record[current_field] += '; ' + continuation_value
-    
-    # 마지막 레코드 처리
-    if current_record:
-        records.append(current_record)
-    
-    if not records:
-        return None
-        
-    return pd.DataFrame(records)
+# 단계별 계측 패널 표시명
+PROFILE_STAGE_LABELS = {
+    'read': '파일 읽기',
+    'parse': '디코딩 + 파싱',
+    'dedup_keys': '중복 키 생성',
+    'encoding_sniff': '인코딩 판별 (파싱에 포함)',
+    'concat': '파일 병합 (concat)',
+    'dedup': '중복 제거',
+    'compact': '저장 형식 압축',
+    'disk_cache_load': '디스크 캐시 로딩',
+    'disk_cache_store': '디스크 캐시 저장',
+    'near_duplicates': '유사 중복 탐지',
+    'classify': '논문 분류',
+    'diagnose': '품질 진단',
+    'chart_build': '차트 생성',
+    'scimat_build': 'SCIMAT 파일 생성',
+    'scimat_zip_build': 'SCIMAT 분할 ZIP 생성',
+    'excel_build': '엑셀 파일 생성',
+    'stream_merge': '스트리밍 병합 (파일별 파싱 → 기록)',
+    'table_spool': '테이블 조각 임시 저장',
+    'table_build': 'CSV 테이블 생성',
+    'search_index': '검색 색인 생성',
+    'wait_previous_job': '이전 작업 중단 대기',
+    'profile_compare': '규칙 프로필별 분류 비교'
+}
+MEMORY_COLUMN_CAPTION = (
+    "최대 할당 증가: 단계 중 tracemalloc 최고 할당량 − 시작 시 할당량 (Python/NumPy 할당, Arrow 버퍼 제외, "
+    f"`{TRACE_MEMORY_ENV}=1`로 앱을 실행한 경우에만 측정). RSS 변화: 단계 전후 프로세스 상주 메모리 차이."
+)
+PROFILE_SCOPE_LABELS = {'pipeline': '병합/분류', 'ui': '화면', 'export': '내보내기'}
+STAGE_CACHE_LABELS = {'hit': '✅ 재사용', 'miss': '🔄 계산'}
 
-# --- 논문 분류 함수 (연구 목표에 맞게 재설계) ---
-def classify_article(row):
+# 스트리밍 병합 결과 파일 위치 (지정하지 않으면 임시 디렉터리)와 전체 크기 상한 (넘으면 오래 사용하지 않은 작업 폴더부터 삭제)
+STREAMING_OUTPUT_DIR_ENV = 'WOS_PREP_OUTPUT_DIR'
+STREAMING_OUTPUT_MAX_MB_ENV = 'WOS_PREP_OUTPUT_MAX_MB'
+STREAMING_OUTPUT_DEFAULT_MAX_MB = 2048
+
+@st.cache_resource
+def get_export_profiles():
+    """내보내기 단계 계측 저장소 (pipeline_key → PipelineProfile, 캐시 재사용 시에도 최초 생성 비용 표시)"""
+    return {}
+
+def get_export_profile(pipeline_key):
+    """pipeline_key의 내보내기 계측 기록 (오래된 키부터 제거하여 개수 제한)"""
+    profiles = get_export_profiles()
+    if pipeline_key not in profiles:
+        while len(profiles) >= PIPELINE_CACHE_MAX_ENTRIES:
+            profiles.pop(next(iter(profiles)))
+        profiles[pipeline_key] = PipelineProfile()
+    return profiles[pipeline_key]
+
+@st.cache_resource
+def get_disk_cache():
+    """파싱/분류 결과 디스크 캐시 (모든 세션 공유, 위치/상한은 WOS_PREP_CACHE_DIR / WOS_PREP_CACHE_MAX_MB)"""
+    return CorpusDiskCache()
+
+def get_staged_pipeline():
+    """세션별 단계 파이프라인 (파일별 파싱 결과 + 단계별 결과를 보관하여 바뀐 단계부터만 다시 계산)
+
+    CR/C1/FU 등 분류·중복 제거·진단에 쓰지 않는 긴 필드는 원본 구간으로만 보관 (내보낼 때 원본 줄 그대로 기록)
     """
-    연구 목표(생태계 분석)에 맞춰, 광범위한 관련 연구를 수집하되 명백한 비관련 연구를 배제하는 함수
+    if 'wos_pipeline' not in st.session_state:
+        st.session_state['wos_pipeline'] = StagedWosPipeline(lazy_tags=LAZY_FIELD_TAGS, disk_cache=get_disk_cache())
+    return st.session_state['wos_pipeline']
+
+def run_diagnose_stage(profile, df, file_count, duplicates_removed):
+    """품질 진단 단계 (분류 단계 키 기준으로 메모이즈되며 계산할 때만 계측 기록)"""
+    with profile.stage('diagnose', records=len(df)):
+        return diagnose_merged_quality(df, file_count, duplicates_removed)
+
+@st.cache_data(max_entries=PIPELINE_CACHE_MAX_ENTRIES * 2, show_spinner=False)
+def build_excel_export(pipeline_key, sheet_name, _df):
+    """엑셀 다운로드 데이터 생성 (pipeline_key, sheet_name 기준 캐시, 다운로드 클릭 시에만 호출)"""
+    excel_buffer = io.BytesIO()
+    with get_export_profile(pipeline_key).stage('excel_build', records=len(_df), sheet=sheet_name):
+        write_excel_workbook(_df, excel_buffer, sheet_name)
+    return excel_buffer.getvalue()
+
+@st.cache_data(max_entries=PIPELINE_CACHE_MAX_ENTRIES * 2, show_spinner=False)
+def count_excel_overflow(pipeline_key, sheet_name, _df):
+    """엑셀 한도 초과 셀 수 (pipeline_key, sheet_name 기준 캐시, 지연 필드는 한도를 넘는 원본 구간만 디코딩)"""
+    return count_excel_overflow_cells(_df)
+
+def build_scimat_export(pipeline_key, df):
+    """SCIMAT 다운로드 데이터 생성 (다운로드 클릭 시에만 청크를 이어 붙여 생성, 결과 바이트는 캐시하지 않음)"""
+    with get_export_profile(pipeline_key).stage('scimat_build', records=len(df)):
+        return b"".join(iter_scimat_wos_chunks(df))
+
+def build_scimat_zip_export(pipeline_key, records_per_part, df):
+    """분할 SCIMAT ZIP 다운로드 데이터 생성 (다운로드 클릭 시에만 생성, 결과 바이트는 캐시하지 않음)"""
+    zip_buffer = io.BytesIO()
+    with get_export_profile(pipeline_key).stage('scimat_zip_build', records=len(df), records_per_part=records_per_part):
+        write_scimat_wos_zip(df, zip_buffer, records_per_part)
+    return zip_buffer.getvalue()
+
+def get_streaming_output_base():
+    """스트리밍 병합 결과 상위 폴더 (WOS_PREP_OUTPUT_DIR 또는 임시 디렉터리)"""
+    return os.environ.get(STREAMING_OUTPUT_DIR_ENV) or os.path.join(tempfile.gettempdir(), 'wos_prep_streaming')
+
+def get_streaming_output_dir(job_key):
+    """스트리밍 병합 결과 폴더 (상위 폴더 아래 작업 키별 하위 폴더, 작업 키 = 입력 + 분류 기준)"""
+    return os.path.join(get_streaming_output_base(), job_key)
+
+@st.cache_resource
+def get_streaming_output_holds():
+    """실행 중인 스트리밍 작업이 사용하는 결과 폴더 (모든 세션 공유, 폴더 → 작업 수, 정리에서 제외)"""
+    return {'lock': threading.Lock(), 'folders': {}}
+
+def hold_streaming_output(output_dir, held):
+    """결과 폴더 사용 시작(held=True) / 종료(held=False) 기록"""
+    holds = get_streaming_output_holds()
+    output_dir = os.path.abspath(output_dir)
+    with holds['lock']:
+        count = holds['folders'].get(output_dir, 0) + (1 if held else -1)
+        if count > 0:
+            holds['folders'][output_dir] = count
+        else:
+            holds['folders'].pop(output_dir, None)
+
+def evict_streaming_outputs():
+    """결과 폴더 전체 크기가 WOS_PREP_OUTPUT_MAX_MB 이하가 될 때까지 오래 사용하지 않은 폴더부터 삭제 (삭제 수 반환)
+
+    사용 시각은 폴더 수정 시각 (결과를 화면에 표시할 때마다 갱신), 실행 중인 작업이 사용하는 폴더는 삭제하지 않음
     """
-    
-    # --- 텍스트 필드 추출 및 결합 (소문자 변환) ---
-    def extract_text(value):
-        return str(value).lower().strip() if pd.notna(value) else ""
-    
-    title = extract_text(row.get('TI', ''))
-    abstract = extract_text(row.get('AB', ''))
-    author_keywords = extract_text(row.get('DE', ''))
-    wos_keywords = extract_text(row.get('ID', ''))
-    
-    full_text = ' '.join([title, abstract, author_keywords, wos_keywords])
-    document_type = extract_text(row.get('DT', ''))
-
-    # --- 키워드 셋 정의 ---
-    # 핵심 주제어: 이 중 하나는 반드시 포함되어야 함
-    core_keywords = [
-        'live stream', 'livestream', 'live-stream', 'live commerce', 
-        'game streaming', 'virtual influencer', 'live video', 'live shopping',
-        'twitch', 'youtube live', 'facebook live', 'tiktok live'
-    ]
-    
-    # 배제 기준 키워드
-    irrelevant_domain_keywords = ['remote surgery', 'military', 'medical signal', 'telemedicine', 'seismic', 'geological', 'satellite image', 'astronomy']
-    non_academic_types = ['editorial', 'news', 'correction', 'letter', 'book review', 'meeting abstract']
-    non_interactive_keywords = ['vod', 'asynchronous', 'pre-recorded', 'video on demand']
-    methodology_keywords = ['survey', 'experiment', 'interview', 'case study', 'model', 'ethnography', 'empirical', 'framework', 'analysis', 'mechanism', 'sem', 'review', 'meta-analysis', 'algorithm']
-
-    # --- 1단계: 기초 필터링 (명백한 비관련 논문 배제) ---
-    
-    # 핵심 주제어조차 없는 경우
-    if not any(kw in full_text for kw in core_keywords):
-        return 'Exclude - Core keyword missing'
-
-    # EC1 (도메인 관련성)
-    if any(kw in full_text for kw in irrelevant_domain_keywords):
-        return 'Exclude - EC1 (Irrelevant domain)'
-        
-    # EC3 (학술적 형태)
-    if any(doc_type in document_type for doc_type in non_academic_types):
-        return 'Exclude - EC3 (Non-academic)'
-        
-    # EC4 (실시간 상호작용성)
-    if any(kw in full_text for kw in non_interactive_keywords):
-        return 'Exclude - EC4 (Non-interactive)'
-        
-    # EC6 (연구 방법론)
-    if not any(kw in full_text for kw in methodology_keywords):
-        return 'Exclude - EC6 (No methodology)'
-
-    # --- 2단계: 최종 분류 (포함된 논문들의 성격 규명) ---
-    # 1단계를 통과한 모든 논문은 일단 연구 대상에 포함
-    dimension_keywords = {
-        'Technical': ['latency', 'qos', 'qoe', 'protocol', 'bandwidth', 'codec', 'network', 'infrastructure', 'algorithm', 'architecture'],
-        'Platform': ['ecosystem', 'governance', 'business model', 'platform', 'monetization', 'creator economy'],
-        'User': ['behavior', 'motivation', 'engagement', 'psychology', 'user', 'viewer', 'audience', 'parasocial', 'trust', 'intention'],
-        'Commercial': ['commerce', 'marketing', 'sales', 'roi', 'purchase', 'influencer', 'advertising', 'e-commerce', 'brand'],
-        'Social': ['culture', 'identity', 'social impact', 'fandom', 'community', 'social presence', 'cultural'],
-        'Educational': ['learning', 'teaching', 'virtual classroom', 'education', 'student']
-    }
-    
-    matched_dimensions = [dim for dim, kws in dimension_keywords.items() if any(kw in full_text for kw in kws)]
-    
-    # 한/영 병기 레이블 맵
-    classification_map = {
-        'Technical': 'Technical (기술)',
-        'Platform': 'Platform (플랫폼)',
-        'User': 'User (사용자)',
-        'Commercial': 'Commercial (커머스)',
-        'Social': 'Social (사회)',
-        'Educational': 'Educational (교육)',
-        'Multidisciplinary': 'Multidisciplinary (다학제)',
-        'etc': 'etc (기타)'
+    max_bytes = float(os.environ.get(STREAMING_OUTPUT_MAX_MB_ENV, STREAMING_OUTPUT_DEFAULT_MAX_MB)) * 1024 * 1024
+    base_dir = get_streaming_output_base()
+    try:
+        names = os.listdir(base_dir)
+    except OSError:
+        return 0
+    folders = []
+    for name in names:
+        path = os.path.join(base_dir, name)
+        try:
+            if not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            folders.append((os.stat(path).st_mtime, size, os.path.abspath(path)))
+        except OSError:
+            continue
+    total = sum(size for _, size, _ in folders)
+    removed = 0
+    holds = get_streaming_output_holds()
+    with holds['lock']:  # 정리 도중 새 작업이 같은 폴더를 사용하기 시작하지 않도록 잠금 안에서 삭제
+        for _, size, path in sorted(folders):
+            if total <= max_bytes:
+                break
+            if path in holds['folders']:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+    return removed
+
+def touch_streaming_output(output_dir):
+    """결과 폴더 사용 시각 갱신 (LRU 순서, 폴더가 이미 삭제되었으면 False)"""
+    try:
+        os.utime(output_dir)
+    except OSError:
+        return False
+    return True
+
+def run_streaming_merge(uploaded_files, job_key, progress, classifier):
+    """서버 파일을 스트리밍 병합하여 결과 파일에 기록 (백그라운드 작업 스레드에서 실행)
+
+    병합 DataFrame 없이 SCIMAT 파일 / 분석 대상·배제 CSV와 화면용 집계만 남김
+    작업별 임시 파일에 기록한 뒤 끝나면 결과 파일로 교체 (같은 작업 키의 다른 세션이 읽는 파일을 덮어쓰는 도중에 보이지 않고,
+    취소/오류 시 임시 파일은 삭제)
+    """
+    output_dir = get_streaming_output_dir(job_key)
+    paths = {
+        'scimat': os.path.join(output_dir, 'live_streaming_refined_for_scimat.txt'),
+        'included': os.path.join(output_dir, 'live_streaming_refined_included.csv'),
+        'excluded': os.path.join(output_dir, 'live_streaming_refined_excluded.csv'),
     }
+    partial_suffix = f".{os.getpid()}-{threading.get_ident()}.partial"
+    partial_paths = {kind: path + partial_suffix for kind, path in paths.items()}
 
-    if len(matched_dimensions) == 0:
-         return classification_map['etc']
-    elif len(matched_dimensions) == 1:
-        return classification_map[matched_dimensions[0]]
-    else:
-        return classification_map['Multidisciplinary']
+    hold_streaming_output(output_dir, True)
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        profile = PipelineProfile()
+        file_status, summary = stream_merge_wos_files(
+            uploaded_files, partial_paths['scimat'],
+            [('included', partial_paths['included'], None), ('excluded', partial_paths['excluded'], None)],
+            lazy_tags=LAZY_FIELD_TAGS, profile=profile, classifier=classifier, progress=progress
+        )
+        for kind, path in paths.items():
+            os.replace(partial_paths[kind], path)
+        touch_streaming_output(output_dir)
+        evict_streaming_outputs()  # 방금 기록한 폴더는 아직 사용 중으로 기록되어 있어 삭제되지 않음
+    finally:
+        for path in partial_paths.values():
+            if os.path.exists(path):
+                os.remove(path)
+        hold_streaming_output(output_dir, False)
+    return {'paths': paths, 'file_status': file_status, 'summary': summary, 'profile': profile}
+
+def get_rule_profiles():
+    """분류 규칙 프로필 {이름: 프로필} (설정 파일 오류 시 오류 메시지를 표시하고 기본 프로필만 사용)"""
+    try:
+        return load_rule_profiles()
+    except (OSError, ValueError, ImportError) as e:
+        st.error(f"⚠️ 분류 규칙 설정 파일({RULES_FILE_ENV})을 읽을 수 없어 기본 규칙을 사용합니다: {str(e)[:200]}")
+        return load_rule_profiles('')
+
+def compare_rule_profiles(profile, df, rule_profiles):
+    """모든 규칙 프로필을 공유 매처로 한 번에 분류하여 프로필별 포함/배제/라벨별 편수 비교표 생성"""
+    with profile.stage('profile_compare', records=len(df), profiles=len(rule_profiles)):
+        summary = summarize_profile_labels(compile_rule_profiles(rule_profiles).classify(df))
+    overview = pd.DataFrame([
+        {'프로필': rule_profiles[name]['title'] or name, '분석 대상': counts['included'], '배제': counts['excluded'],
+         '포함 비율 (%)': round(counts['included'] / len(df) * 100, 1) if len(df) > 0 else 0.0}
+        for name, counts in summary.items()
+    ])
+    label_counts = pd.DataFrame({
+        rule_profiles[name]['title'] or name: pd.Series(counts['counts'], dtype='Int64') for name, counts in summary.items()
+    }).fillna(0)
+    label_counts.index.name = '분류 (Classification)'
+    return overview, label_counts.reset_index()
+
+def read_output_file(path):
+    """결과 파일 내용 (다운로드 버튼을 누를 때만 읽음)"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+# --- 결과 화면 구성 (일괄 병합 / 스트리밍 병합 공용) ---
+def render_file_status(file_status):
+    """파일별 처리 상태 섹션 (파일별 상태 + 성공/실패 파일 수)"""
+    st.markdown("""
+    <div class="section-header">
+        <div class="section-title">📄 파일별 처리 상태</div>
+        <div class="section-subtitle">업로드된 각 파일의 처리 결과</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class="chart-container">
+        <div class="chart-title">📋 파일별 상세 상태</div>
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns([0.6, 0.4])
 
+    with col1:        
+        for status in file_status:
+            color = "#10b981" if status['status'] == 'SUCCESS' else "#ef4444"
+            icon = "✅" if status['status'] == 'SUCCESS' else "❌"
+        
+            st.markdown(f"""
+            <div style="margin: 12px 0; padding: 16px; background: white; border-left: 4px solid {color}; border-radius: 12px; box-shadow: 0 1px 3px rgba(0,0,0,0.04);">
+                <strong>{icon} {status['filename']}</strong><br>
+                <small style="color: #8b95a1;">{status['message']}</small>
+                {f" | 인코딩: {status['encoding']} (판별 {status.get('encoding_detect_ms', 0):.1f}ms)" if status['encoding'] != 'N/A' else ""}
+                {" | ♻️ 이전 업로드 결과 재사용" if status.get('reused') else ""}
+                {" | 💾 디스크 캐시에서 로딩" if status.get('disk_cached') else ""}
+            </div>
+            """, unsafe_allow_html=True)
 
-# --- 데이터 품질 진단 함수 ---
-def diagnose_merged_quality(df, file_count, duplicates_removed):
-    """병합된 WOS 데이터의 품질 진단 - 수정된 버전"""
-    issues = []
-    recommendations = []
+    with col2:
+        # 파일 처리 통계
+        success_count = len([s for s in file_status if s['status'] == 'SUCCESS'])
+        error_count = len([s for s in file_status if s['status'] == 'ERROR'])
     
-    # 필수 필드 확인
-    required_fields = ['TI', 'AU', 'SO', 'PY']
-    keyword_fields = ['DE', 'ID']
+        st.markdown(f"""
+        <div class="metric-card" style="min-height: auto;">
+            <div class="metric-icon">✅</div>
+            <div class="metric-value">{success_count}</div>
+            <div class="metric-label">성공한 파일</div>
+        </div>
+        """, unsafe_allow_html=True)
     
-    for field in required_fields:
-        if field not in df.columns:
-            issues.append(f"❌ 필수 필드 누락: {field}")
-        else:
-            valid_count = df[field].notna().sum()
-            total_count = len(df)
-            missing_rate = (total_count - valid_count) / total_count * 100
-            
-            if missing_rate > 10:
-                issues.append(f"⚠️ {field} 필드의 {missing_rate:.1f}%가 누락됨")
-    
-    # 키워드 필드 품질 확인
-    has_keywords = False
-    for field in keyword_fields:
-        if field in df.columns:
-            has_keywords = True
-            valid_keywords = df[field].notna() & (df[field] != '') & (df[field] != 'nan')
-            valid_count = valid_keywords.sum()
-            total_count = len(df)
-            
-            if valid_count < total_count * 0.7:
-                missing_rate = ((total_count - valid_count) / total_count * 100)
-                issues.append(f"⚠️ {field} 필드의 {missing_rate:.1f}%가 비어있음")
+        st.markdown(f"""
+        <div class="metric-card" style="min-height: auto;">
+            <div class="metric-icon">❌</div>
+            <div class="metric-value">{error_count}</div>
+            <div class="metric-label">실패한 파일</div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_quality_diagnosis(issues, recommendations):
+    """품질 진단 결과 패널 (발견된 문제점 / 병합 결과)"""
+    st.markdown("""
+    <div class="chart-container">
+        <div class="chart-title">🔍 병합 데이터 품질 진단 결과</div>
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown('<h5 style="color: #ef4444; margin-bottom: 16px;">🚨 발견된 문제점</h5>', unsafe_allow_html=True)
     
-    if not has_keywords:
-        issues.append("❌ 키워드 필드 없음: DE 또는 ID 필드 필요")
+        if issues:
+            for issue in issues:
+                st.markdown(f"- {issue}")
+        else:
+            st.markdown("✅ **문제점 없음** - 병합 데이터 품질 우수")
+
+    with col2:
+        st.markdown('<h5 style="color: #10b981; margin-bottom: 16px;">💡 병합 결과</h5>', unsafe_allow_html=True)
     
-    # 병합 관련 정보 - 실제 결과만 반영 (완전 수정)
-    recommendations.append(f"✅ {file_count}개 파일 성공적으로 병합됨")
+        if recommendations:
+            for rec in recommendations:
+                st.markdown(f"- {rec}")
+        else:
+            st.markdown("🎯 **최적 상태** - SCIMAT 완벽 호환")
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_classification_chart(classification_counts_df, refined_total):
+    """분류별 논문 수 표 + 도넛 차트 (classification_counts_df: 분류 / 논문 수 컬럼)"""
+    # 차트 라이브러리는 결과를 그릴 때만 로딩 (업로드 전 첫 화면 기동 시간 단축)
+    import altair as alt
+
+    col1, col2 = st.columns([0.4, 0.6])
+    with col1:
+        st.dataframe(classification_counts_df, use_container_width=True, hide_index=True)
+
+    with col2:
+        # 도넛 차트 (신규 분류 및 색상 적용)
+        color_map = {
+            'Technical (기술)': '#1f77b4',
+            'Platform (플랫폼)': '#ff7f0e',
+            'User (사용자)': '#2ca02c',
+            'Commercial (커머스)': '#d62728',
+            'Social (사회)': '#9467bd',
+            'Educational (교육)': '#8c564b',
+            'Multidisciplinary (다학제)': '#7f7f7f',
+            'etc (기타)': '#c7c7c7'
+        }
     
-    # 중복 제거 결과만 실제 데이터에 따라 표시
-    if duplicates_removed > 0:
-        recommendations.append(f"🔄 중복 논문 {duplicates_removed}편 자동 제거됨")
+        # 데이터프레임 순서에 맞게 도메인/범위 정렬
+        ordered_df = classification_counts_df.set_index('분류 (Classification)')
+        domain = ordered_df.index.tolist()
+        range_ = [color_map.get(cat, '#333') for cat in domain]
+
+        selection = alt.selection_point(fields=['분류 (Classification)'], on='mouseover', nearest=True)
+
+        base = alt.Chart(classification_counts_df).encode(
+            theta=alt.Theta(field="논문 수 (Count)", type="quantitative", stack=True),
+            color=alt.Color(field="분류 (Classification)", type="nominal", title="분류 (Classification)",
+                           scale=alt.Scale(domain=domain, range=range_),
+                           legend=alt.Legend(orient="right", titleColor="#191f28", labelColor="#8b95a1")),
+            opacity=alt.condition(selection, alt.value(1), alt.value(0.8)),
+            tooltip=['분류 (Classification)', '논문 수 (Count)']
+        ).add_params(selection)
+
+        pie = base.mark_arc(outerRadius=150, innerRadius=90)
+        text_total = alt.Chart(pd.DataFrame([{'value': f'{refined_total}'}])).mark_text(
+            align='center', baseline='middle', fontSize=45, fontWeight='bold', color='#3182f6'
+        ).encode(text='value:N')
+        text_label = alt.Chart(pd.DataFrame([{'value': 'Refined Papers'}])).mark_text(
+            align='center', baseline='middle', fontSize=16, dy=30, color='#8b95a1'
+        ).encode(text='value:N')
+
+        chart = (pie + text_total + text_label).properties(
+            width=350, height=350
+        ).configure_view(strokeWidth=0)
+        st.altair_chart(chart, use_container_width=True)
+
+def render_yearly_trend(year_counts):
+    """발행 연도별 논문 수 선 그래프 (year_counts: 연도 → 편수 Series)"""
+    import altair as alt
+
+    yearly_counts = year_counts.rename_axis('Year').reset_index(name='Count')
+    yearly_counts = yearly_counts[yearly_counts['Year'] <= 2025].sort_values('Year')
+
+    if len(yearly_counts) > 0:
+        line_chart = alt.Chart(yearly_counts).mark_line(
+            point={'size': 80, 'filled': True}, strokeWidth=3, color='#0064ff'
+        ).encode(
+            x=alt.X('Year:O', title='발행 연도'),
+            y=alt.Y('Count:Q', title='논문 수'),
+            tooltip=['Year', 'Count']
+        ).properties(height=300)
+    
+        st.altair_chart(line_chart, use_container_width=True)
+
+
+# --- 백그라운드 처리 작업 ---
+# 병합/분류는 작업 스레드에서 실행하고, 화면은 JOB_POLL_SECONDS마다 진행 상황(끝난 파일별 상태, 누적 논문 수, 현재 단계)만 다시 그림
+def get_background_job(job_key, target):
+    """세션의 백그라운드 작업 (같은 키면 기존 작업 재사용, 키가 바뀌면 이전 작업을 취소하고 새로 시작)"""
+    job = st.session_state.get('wos_job')
+    if job is not None and job.key == job_key and job.state != 'cancelled':
+        return job
+    previous = None
+    if job is not None and not job.finished:
+        # 세션 단계 파이프라인을 함께 쓰므로 새 작업은 이전 작업이 멈춘 뒤 실행 (기다리는 것은 새 작업 스레드, 화면은 바로 진행 표시)
+        job.cancel()
+        previous = job
+    job = BackgroundJob(job_key, target, after=previous).start()
+    st.session_state['wos_job'] = job
+    return job
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def render_job_progress(job, message):
+    """백그라운드 작업 진행 상황 (이 부분만 주기적으로 다시 그리며, 작업이 끝나면 전체 화면 재실행)"""
+    progress = job.snapshot()
+    if progress['state'] != 'running':
+        st.rerun()
+
+    files_done = len(progress['files'])
+    files_total = progress['files_total']
+    stage_label = PROFILE_STAGE_LABELS.get(progress['stage'], progress['stage'] or '준비')
+    progress_text = f"{message} | 현재 단계: {stage_label} | 경과 {progress['elapsed']:.0f}초"
+    if files_total:
+        st.progress(min(files_done / files_total, 1.0), text=f"{progress_text} | 파일 {files_done}/{files_total}")
     else:
-        recommendations.append("✅ 중복 논문 없음 - 모든 논문이 고유 데이터")
-    
-    recommendations.append("✅ WOS Plain Text 형식 - SCIMAT 최적 호환성 확보")
-    
-    return issues, recommendations
+        st.progress(0.0, text=progress_text)
 
-# --- WOS Plain Text 형식 변환 함수 ---
-def convert_to_scimat_wos_format(df_to_convert):
-    """SCIMAT 완전 호환 WOS Plain Text 형식으로 변환"""
-    wos_field_order = [
-        'PT', 'AU', 'AF', 'TI', 'SO', 'LA', 'DT', 'DE', 'ID', 'AB', 'C1', 'C3', 'RP',
-        'EM', 'RI', 'OI', 'FU', 'FX', 'CR', 'NR', 'TC', 'Z9', 'U1', 'U2', 'PU', 'PI', 'PA',
-        'SN', 'EI', 'J9', 'JI', 'PD', 'PY', 'VL', 'IS', 'BP', 'EP', 'DI', 'EA', 'PG',
-        'WC', 'WE', 'SC', 'GA', 'UT', 'PM', 'OA', 'DA'
-    ]
-    
-    file_content = ["FN Clarivate Analytics Web of Science", "VR 1.0"]
-    multi_line_fields = ['AU', 'AF', 'DE', 'ID', 'C1', 'C3', 'CR']
+    col1, col2, col3 = st.columns(3)
+    for column, icon, value, label in (
+        (col1, "📂", f"{files_done:,}" + (f" / {files_total:,}" if files_total else ""), "읽은 파일"),
+        (col2, "📄", f"{progress['records']:,}", "지금까지 읽은 논문"),
+        (col3, "❌", f"{progress['errors']:,}", "실패한 파일"),
+    ):
+        with column:
+            st.markdown(f"""
+            <div class="metric-card" style="min-height: auto;">
+                <div class="metric-icon">{icon}</div>
+                <div class="metric-value">{value}</div>
+                <div class="metric-label">{label}</div>
+            </div>
+            """, unsafe_allow_html=True)
+    if progress['stages']:
+        st.caption("진행한 단계: " + " → ".join(PROFILE_STAGE_LABELS.get(stage, stage) for stage in progress['stages']))
 
-    for _, row in df_to_convert.iterrows():
-        if len(file_content) > 2:
-            file_content.append("")
-        
-        for tag in wos_field_order:
-            if tag in row.index and pd.notna(row[tag]) and str(row[tag]).strip() and str(row[tag]).strip().lower() != 'nan':
-                value = str(row[tag]).strip()
-                
-                if tag in multi_line_fields:
-                    items = [item.strip() for item in value.split(';') if item.strip()]
-                    if items:
-                        file_content.append(f"{tag} {items[0]}")
-                        for item in items[1:]:
-                            file_content.append(f"   {item}")
-                else:
-                    file_content.append(f"{tag} {value}")
-        
-        file_content.append("ER")
-    
-    return "\n".join(file_content).encode('utf-8-sig')
+    # 먼저 끝난 파일의 처리 결과 (나머지 파일을 읽는 동안 확인 가능)
+    if progress['files']:
+        render_file_status(progress['files'])
+
+def wait_for_background_job(job, message):
+    """작업이 끝나지 않았으면 진행 상황만 그리고 페이지 나머지 실행을 멈춤 (오류로 끝났으면 오류 표시)"""
+    if not job.finished:
+        render_job_progress(job, message)
+        st.stop()
+    if job.state == 'error':
+        st.error(f"⚠️ 처리 중 오류가 발생했습니다: {str(job.error)[:200]}")
+        with st.expander("오류 상세", expanded=False):
+            st.code(job.error_detail)
+        st.stop()
+
+SEARCH_PREVIEW_ROWS = 200  # 검색 결과 표에 보여 줄 최대 행 수 (전체는 CSV로)
+
+@st.cache_data(max_entries=PIPELINE_CACHE_MAX_ENTRIES * 2, show_spinner=False)
+def build_search_export(pipeline_key, query, _results):
+    """검색 결과 CSV (pipeline_key, 검색식 기준 캐시, 다운로드 클릭 시에만 호출)"""
+    csv_buffer = io.StringIO()
+    for number, frame in enumerate(_results.iter_frames()):
+        frame.to_csv(csv_buffer, header=number == 0, index=False)
+    if len(_results) == 0:
+        _results.to_frame().to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue().encode('utf-8-sig')
 
 # --- 메인 헤더 ---
 st.markdown("""
@@ -714,7 +852,7 @@ st.markdown("""
     <div class="feature-card">
         <div class="feature-icon">🚫</div>
         <div class="feature-title">스마트 중복 제거</div>
-        <div class="feature-desc">UT 기준 자동 중복 논문 감지 및 제거</div>
+        <div class="feature-desc">UT·DOI·제목 기준 자동 중복 논문 감지 및 제거</div>
     </div>
     <div class="feature-card">
         <div class="feature-icon">🎯</div>
@@ -732,112 +870,348 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-uploaded_files = st.file_uploader(
-    "WOS Plain Text 파일 선택 (다중 선택 가능)",
-    type=['txt'],
-    accept_multiple_files=True,
-    label_visibility="collapsed",
-    help="WOS Plain Text 파일들을 드래그하여 놓거나 클릭하여 선택하세요"
-)
+# 서버 디렉터리(WOS_PREP_SERVER_DIR)가 설정된 경우: 업로드 없이 서버의 파일/압축 파일을 스트림으로 읽음
+server_directory = get_server_directory()
+input_mode = 'upload'
+streaming_merge = False
+if server_directory is not None:
+    input_mode = st.radio(
+        "입력 방식",
+        options=['upload', 'server'],
+        format_func={'upload': "📤 파일 업로드", 'server': "🗄️ 서버 디렉터리 (대용량 .txt / .zip / .gz)"}.get,
+        horizontal=True,
+        key="input_mode",
+        label_visibility="collapsed"
+    )
+
+if input_mode == 'server':
+    server_paths = find_wos_inputs(server_directory, recursive=True)
+    selected_paths = st.multiselect(
+        f"서버 디렉터리 `{server_directory}`의 WOS 파일 / 압축 파일",
+        options=server_paths,
+        default=server_paths,
+        format_func=lambda path: os.path.relpath(path, server_directory),
+        key="server_paths",
+        help=".zip은 안의 .txt 파일별로, .gz는 압축을 풀며 읽습니다 (업로드 용량 제한 없음)"
+    )
+    try:
+        uploaded_files = open_wos_sources(selected_paths)
+    except (OSError, zipfile.BadZipFile) as e:
+        st.error(f"⚠️ 서버 파일을 열 수 없습니다: {str(e)[:100]}")
+        uploaded_files = []
+    streaming_merge = st.checkbox(
+        "🌊 스트리밍 병합 (대용량: 병합 결과를 메모리에 두지 않고 파일로 바로 기록)",
+        key="streaming_merge",
+        help="파일을 하나씩 파싱·중복 제거·분류하여 SCIMAT 파일과 CSV에 바로 기록합니다 (유사 중복 탐지 미지원)"
+    )
+else:
+    uploaded_files = st.file_uploader(
+        "WOS Plain Text 파일 선택 (다중 선택 가능)",
+        type=['txt'],
+        accept_multiple_files=True,
+        label_visibility="collapsed",
+        help="WOS Plain Text 파일들을 드래그하여 놓거나 클릭하여 선택하세요"
+    )
 
 if 'show_exclude_details' not in st.session_state:
     st.session_state['show_exclude_details'] = False
 
-if uploaded_files:
-    st.markdown(f"📋 **선택된 파일 개수:** {len(uploaded_files)}개")
-    
-    # 프로그레스 인디케이터
-    st.markdown('<div class="progress-indicator"></div>', unsafe_allow_html=True)
-    
-    with st.spinner(f"🔄 {len(uploaded_files)}개 WOS 파일 병합 및 데이터 정제 적용 중..."):
-        # 파일 병합
-        merged_df, file_status, duplicates_removed = load_and_merge_wos_files(uploaded_files)
-        
-        if merged_df is None:
-            st.error("⚠️ 처리 가능한 WOS Plain Text 파일이 없습니다. 파일들이 Web of Science에서 다운로드한 정품 Plain Text 파일인지 확인해주세요.")
-            
-            # 파일별 상태 표시
-            st.markdown("### 📄 파일별 처리 상태")
-            for status in file_status:
-                st.markdown(f"""
-                <div class="file-status">
-                    <strong>{status['filename']}</strong><br>
-                    {status['message']}
-                </div>
-                """, unsafe_allow_html=True)
-            st.stop()
-        
-        # 논문 분류 수행
-        merged_df['Classification'] = merged_df.apply(classify_article, axis=1)
+# 유사 중복 탐지 설정 (제목/초록 변형, 조기 공개본과 최종본 등)
+with st.expander("⚙️ 유사 중복 탐지 설정 (MinHash)", expanded=False):
+    near_duplicate_mode = st.selectbox(
+        "유사 중복 처리 방식",
+        options=list(NEAR_DUP_MODES),
+        format_func=NEAR_DUP_MODES.get,
+        key="near_duplicate_mode",
+        help="UT/DOI/제목이 정확히 일치하지 않는 동일 논문 후보를 제목·초록 유사도로 탐지합니다"
+    )
+    near_duplicate_threshold = st.slider(
+        "자동 병합 유사도 임계값 (Jaccard)",
+        min_value=0.7, max_value=1.0, value=NEAR_DUP_DEFAULT_THRESHOLD, step=0.01,
+        key="near_duplicate_threshold",
+        disabled=near_duplicate_mode == 'off'
+    )
+
+# 분류 규칙 프로필 (기본: 라이브 스트리밍, WOS_PREP_RULES_FILE 설정 파일로 추가)
+rule_profiles = get_rule_profiles()
+with st.expander("🏷️ 분류 규칙 프로필", expanded=False):
+    rule_profile_name = st.selectbox(
+        "분류에 사용할 규칙 프로필",
+        options=list(rule_profiles),
+        format_func=lambda name: rule_profiles[name]['title'] or name,
+        key="rule_profile",
+        disabled=len(rule_profiles) == 1,
+        help="분석 대상/배제 판정과 분류 라벨에 사용할 키워드 규칙"
+    )
+    token_matching = st.checkbox(
+        "🔤 토큰 정규화 매칭 (단어 경계 + 어간 추출)",
+        key="token_matching",
+        help="TI/AB/DE/ID를 토큰화·악센트 제거·어간 추출(nltk)한 뒤 단어 단위로 키워드를 찾습니다. "
+             "'sem'이 'semantic'에, 'user'가 'username'에 일치하지 않고, 'models'는 'model'에 일치합니다."
+    )
+    rules_file = get_rules_file()
+    if rules_file:
+        st.caption(f"규칙 설정 파일: `{rules_file}` | 프로필 {len(rule_profiles)}개")
+    else:
+        st.caption(f"기본 규칙만 사용 중입니다. 규칙 프로필을 추가하려면 `{RULES_FILE_ENV}`에 TOML 설정 파일 경로를 지정하세요.")
+if rule_profile_name not in rule_profiles:
+    rule_profile_name = DEFAULT_PROFILE_NAME
+rule_profile = rule_profiles[rule_profile_name]
+if token_matching:
+    rule_profile = with_matching(rule_profile, 'token')
+rule_classifier, rule_classifier_key = profile_classifier(rule_profile, rule_profile_name)
+
+# 디스크 캐시 (같은 파일을 다시 올리면 파싱/분류 생략)
+with st.expander("💾 디스크 캐시", expanded=False):
+    disk_cache = get_disk_cache()
+    if not disk_cache.enabled:
+        st.caption("디스크 캐시를 사용하지 않습니다 (pyarrow 미설치 또는 WOS_PREP_CACHE_MAX_MB=0).")
+    else:
+        cache_entries = disk_cache.entries()
+        cache_bytes = sum(entry['bytes'] for entry in cache_entries)
+        st.caption(f"위치: `{disk_cache.directory}` | 항목 {len(cache_entries):,}개 | "
+                   f"{cache_bytes / 1024 / 1024:,.1f} MB / {disk_cache.max_bytes / 1024 / 1024:,.0f} MB")
+        if st.button("🗑️ 캐시 비우기", key="purge_disk_cache", disabled=not cache_entries):
+            freed = disk_cache.purge()
+            st.success(f"디스크 캐시 {freed / 1024 / 1024:,.1f} MB를 비웠습니다.")
+
+if uploaded_files and streaming_merge:
+    st.markdown(f"📋 **선택된 파일 개수:** {len(uploaded_files)}개 (스트리밍 병합)")
+    if near_duplicate_mode != 'off':
+        st.caption("ℹ️ 스트리밍 병합에서는 유사 중복 탐지를 적용하지 않습니다 (UT·DOI·제목 기준 중복 제거만 적용).")
+
+    streaming_job_key = stage_key('streaming_job', compute_upload_key(uploaded_files), rule_classifier_key)
+    streaming_job = get_background_job(
+        streaming_job_key,
+        lambda job: run_streaming_merge(uploaded_files, streaming_job_key, job.file_done, rule_classifier)
+    )
+    wait_for_background_job(streaming_job, f"🌊 {len(uploaded_files)}개 WOS 파일 스트리밍 병합 중...")
+    streaming_result = streaming_job.result
+    file_status = streaming_result['file_status']
+    streaming_summary = streaming_result['summary']
+    streaming_paths = streaming_result['paths']
+    if not touch_streaming_output(os.path.dirname(streaming_paths['scimat'])) or not all(
+        os.path.exists(path) for path in streaming_paths.values()
+    ):
+        # 다른 세션의 병합으로 크기 상한을 넘어 결과 폴더가 삭제된 경우 다시 병합
+        st.session_state.pop('wos_job', None)
+        st.rerun()
+
+    if streaming_summary['papers_merged'] == 0:
+        st.error("⚠️ 처리 가능한 WOS Plain Text 파일이 없습니다. 파일들이 Web of Science에서 다운로드한 정품 Plain Text 파일인지 확인해주세요.")
+        render_file_status(file_status)
+        st.stop()
 
-    # 성공적인 파일 개수 계산
     successful_files = len([s for s in file_status if s['status'] == 'SUCCESS'])
-    total_papers_before_filter = len(merged_df)
-    
-    # 최종 데이터셋 준비
-    df_excluded = merged_df[merged_df['Classification'].str.startswith('Exclude', na=False)]
-    df_for_analysis = merged_df[~merged_df['Classification'].str.startswith('Exclude', na=False)].copy()
-    
-    total_papers = len(df_for_analysis)
-    
-    st.success(f"✅ 병합 및 데이터 정제 완료! {successful_files}개 파일에서 최종 {total_papers:,}편의 논문을 성공적으로 처리했습니다.")
-    
-    # 중복 제거 결과 표시
+    total_papers_before_filter = streaming_summary['papers_merged']
+    included_papers = streaming_summary['included']
+    excluded_papers = streaming_summary['excluded']
+    duplicates_removed = streaming_summary['duplicates_removed']
+
+    st.success(f"✅ 스트리밍 병합 및 데이터 정제 완료! {successful_files}개 파일에서 최종 {included_papers:,}편의 논문을 처리하여 파일로 기록했습니다.")
     if duplicates_removed > 0:
-        st.info(f"🔄 중복 논문 {duplicates_removed}편이 자동으로 제거되었습니다. (원본 총 {total_papers_before_filter + duplicates_removed:,}편 → 정제 후 {total_papers_before_filter:,}편)")
+        st.info(f"🔄 중복 논문 {duplicates_removed}편이 자동으로 제거되었습니다. (원본 총 {total_papers_before_filter + duplicates_removed:,}편 → 정제 후 {total_papers_before_filter:,}편 | 판별 기준: {format_dedup_counts(streaming_summary['dedup_counts'])})")
     else:
         st.info("✅ 중복 논문 없음 - 모든 논문이 고유한 데이터입니다.")
 
-    # --- 파일별 처리 상태 ---
+    render_file_status(file_status)
+
+    # 품질 진단: 파일별로 모은 필드 건수로 계산 (일괄 병합의 진단과 같은 결과)
     st.markdown("""
     <div class="section-header">
-        <div class="section-title">📄 파일별 처리 상태</div>
-        <div class="section-subtitle">업로드된 각 파일의 처리 결과</div>
+        <div class="section-title">🔍 병합 데이터 품질 진단</div>
+        <div class="section-subtitle">병합된 WOS 데이터의 품질과 SCIMAT 호환성 검증</div>
     </div>
     """, unsafe_allow_html=True)
+    issues, recommendations = diagnose_quality_counts(
+        streaming_summary['quality_counts']['included'], successful_files, duplicates_removed
+    )
+    render_quality_diagnosis(issues, recommendations)
+
+    # --- 분석 결과 요약 (집계 기준) ---
+    st.markdown("""
+    <div class="section-header">
+        <div class="section-title">📈 데이터 정제 결과</div>
+        <div class="section-subtitle">연구 목표에 맞춰 정제된 최종 데이터셋 요약</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+    processing_rate = (included_papers / total_papers_before_filter * 100) if total_papers_before_filter > 0 else 0
+    for column, icon, value, label in (
+        (col1, "📋", f"{included_papers:,}", "최종 분석 대상<br><small style=\"color: #8b95a1;\">(데이터 정제 후)</small>"),
+        (col2, "📊", f"{processing_rate:.1f}%", "최종 포함 비율"),
+        (col3, "⛔", f"{excluded_papers:,}", "데이터 정제 후 배제"),
+    ):
+        with column:
+            st.markdown(f"""
+            <div class="metric-card">
+                <div class="metric-icon">{icon}</div>
+                <div class="metric-value">{value}</div>
+                <div class="metric-label">{label}</div>
+            </div>
+            """, unsafe_allow_html=True)
 
     st.markdown("""
     <div class="chart-container">
-        <div class="chart-title">📋 파일별 상세 상태</div>
+        <div class="chart-title">포함된 논문의 분류 분포 (Classification Distribution)</div>
+    """, unsafe_allow_html=True)
+    included_counts = {label: count for label, count in streaming_summary['classification_counts'].items()
+                       if not str(label).startswith('Exclude')}
+    render_classification_chart(
+        pd.DataFrame(list(included_counts.items()), columns=['분류 (Classification)', '논문 수 (Count)']), included_papers
+    )
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if streaming_summary['year_counts']:
+        st.markdown("""
+        <div class="chart-container">
+            <div class="chart-title">정제된 라이브 스트리밍 연구 동향 (데이터 정제 기준 적용 후)</div>
+        """, unsafe_allow_html=True)
+        render_yearly_trend(pd.Series(streaming_summary['year_counts']))
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    # --- 결과 파일 다운로드 (버튼을 누를 때만 파일을 읽음) ---
+    st.markdown("""
+    <div class="section-header">
+        <div class="section-title">🔥 데이터 정제 완료 - SCIMAT 분석용 파일 다운로드</div>
+        <div class="section-subtitle">연구 목표에 맞춰 정제된 최종 데이터셋</div>
+    </div>
     """, unsafe_allow_html=True)
+    st.download_button(
+        label="🔥 다운로드",
+        data=lambda: read_output_file(streaming_paths['scimat']),
+        file_name=f"live_streaming_refined_for_scimat_{included_papers}papers.txt",
+        mime="text/plain",
+        type="primary",
+        use_container_width=True,
+        key="download_streaming_scimat",
+        help="데이터 정제 기준 적용 후 SCIMAT에서 바로 사용 가능한 WOS Plain Text 파일"
+    )
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            label="📄 (CSV 다운로드) - 최종 분석 대상 전체 필드",
+            data=lambda: read_output_file(streaming_paths['included']),
+            file_name=f"included_papers_full_rawdata_{included_papers}편.csv",
+            mime="text/csv",
+            use_container_width=True,
+            key="download_streaming_included"
+        )
+    with col2:
+        st.download_button(
+            label="📄 (CSV 다운로드) - 배제된 논문 전체 목록",
+            data=lambda: read_output_file(streaming_paths['excluded']),
+            file_name=f"excluded_papers_{excluded_papers}편.csv",
+            mime="text/csv",
+            use_container_width=True,
+            key="download_streaming_excluded"
+        )
+    st.caption(f"💾 결과 파일 위치: `{os.path.dirname(streaming_paths['scimat'])}` (서버에서 직접 사용할 수도 있습니다, 전체 결과 폴더가 `{STREAMING_OUTPUT_MAX_MB_ENV}` 상한을 넘으면 오래 사용하지 않은 폴더부터 삭제)")
+
+    with st.expander("⏱️ 단계별 처리 시간 · 메모리 진단", expanded=False):
+        stage_records = streaming_result['profile'].to_records()
+        stage_table = pd.DataFrame(stage_records)
+        stage_table['stage'] = stage_table['stage'].map(lambda stage: PROFILE_STAGE_LABELS.get(stage, stage))
+        stage_table['records'] = stage_table['records'].astype('Int64')
+        st.dataframe(
+            stage_table[['stage', 'records', 'seconds', 'peak_delta_mb', 'rss_delta_mb']].rename(columns={
+                'stage': '단계', 'records': '레코드/파일 수', 'seconds': '시간 (초)',
+                'peak_delta_mb': '최대 할당 증가 (MB)', 'rss_delta_mb': 'RSS 변화 (MB)'
+            }),
+            use_container_width=True, hide_index=True
+        )
+        st.caption("파싱·중복 제거·분류·기록 시간은 스트리밍 병합 단계에 포함된 파일별 합계입니다.")
+        st.caption(MEMORY_COLUMN_CAPTION)
+
+elif uploaded_files:
+    st.markdown(f"📋 **선택된 파일 개수:** {len(uploaded_files)}개")
     
-    col1, col2 = st.columns([0.6, 0.4])
+    # 프로그레스 인디케이터
+    st.markdown('<div class="progress-indicator"></div>', unsafe_allow_html=True)
     
-    with col1:        
+    # 파일 병합 및 논문 분류 (세션 내 단계별 캐시: 바뀐 파일만 파싱, 바뀐 단계부터만 다시 계산)
+    # 백그라운드 작업으로 실행하며, 입력/설정이 같으면 화면 재실행 시 끝난 작업 결과를 그대로 사용
+    staged_pipeline = get_staged_pipeline()
+    merger = staged_pipeline.merger
+
+    def run_staged_pipeline(job):
+        result = staged_pipeline.run(uploaded_files, near_duplicate_mode, near_duplicate_threshold,
+                                     rule_classifier_key, rule_classifier, progress=job.file_done)
+        return result, list(staged_pipeline.cache.events)
+
+    merge_job = get_background_job(
+        stage_key('pipeline_job', compute_upload_key(uploaded_files), near_duplicate_mode,
+                  near_duplicate_threshold, rule_classifier_key),
+        run_staged_pipeline
+    )
+    wait_for_background_job(merge_job, f"🔄 {len(uploaded_files)}개 WOS 파일 병합 및 데이터 정제 적용 중...")
+    (merged_df, file_status, duplicates_removed, dedup_report), run_events = merge_job.result
+    staged_pipeline.cache.events = list(run_events)  # 이번 화면의 내보내기 단계 기록은 작업 실행 기록 뒤에 추가
+    pipeline_profile = staged_pipeline.profile()
+    
+    # 분류 단계 키 (업로드 내용 + 유사 중복 설정 + 분류 기준 반영, 내보내기 결과 재사용)
+    pipeline_key = staged_pipeline.pipeline_key
+    
+    if merged_df is None:
+        st.error("⚠️ 처리 가능한 WOS Plain Text 파일이 없습니다. 파일들이 Web of Science에서 다운로드한 정품 Plain Text 파일인지 확인해주세요.")
+        
+        # 파일별 상태 표시
+        st.markdown("### 📄 파일별 처리 상태")
         for status in file_status:
-            color = "#10b981" if status['status'] == 'SUCCESS' else "#ef4444"
-            icon = "✅" if status['status'] == 'SUCCESS' else "❌"
-            
             st.markdown(f"""
-            <div style="margin: 12px 0; padding: 16px; background: white; border-left: 4px solid {color}; border-radius: 12px; box-shadow: 0 1px 3px rgba(0,0,0,0.04);">
-                <strong>{icon} {status['filename']}</strong><br>
-                <small style="color: #8b95a1;">{status['message']}</small>
-                {f" | 인코딩: {status['encoding']}" if status['encoding'] != 'N/A' else ""}
+            <div class="file-status">
+                <strong>{status['filename']}</strong><br>
+                {status['message']}
             </div>
             """, unsafe_allow_html=True)
+        st.stop()
+
+    # 성공적인 파일 개수 계산
+    successful_files = len([s for s in file_status if s['status'] == 'SUCCESS'])
+    total_papers_before_filter = len(merged_df)
     
-    with col2:
-        # 파일 처리 통계
-        success_count = len([s for s in file_status if s['status'] == 'SUCCESS'])
-        error_count = len([s for s in file_status if s['status'] == 'ERROR'])
-        
-        st.markdown(f"""
-        <div class="metric-card" style="min-height: auto;">
-            <div class="metric-icon">✅</div>
-            <div class="metric-value">{success_count}</div>
-            <div class="metric-label">성공한 파일</div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown(f"""
-        <div class="metric-card" style="min-height: auto;">
-            <div class="metric-icon">❌</div>
-            <div class="metric-value">{error_count}</div>
-            <div class="metric-label">실패한 파일</div>
-        </div>
-        """, unsafe_allow_html=True)
+    # 최종 데이터셋 준비
+    df_for_analysis, df_excluded = split_classified(merged_df)
     
-    st.markdown("</div>", unsafe_allow_html=True)
+    total_papers = len(df_for_analysis)
+    
+    st.success(f"✅ 병합 및 데이터 정제 완료! {successful_files}개 파일에서 최종 {total_papers:,}편의 논문을 성공적으로 처리했습니다.")
+    if merger.last_update['reused'] > 0 and merger.last_update['parsed'] > 0:
+        st.caption(f"♻️ 마지막 파일 변경 시 새 파일 {merger.last_update['parsed']}개만 파싱하고 {merger.last_update['reused']}개 파일은 이전 결과를 재사용했습니다.")
+    elif merger.last_update['reused'] > 0:
+        st.caption(f"♻️ 마지막 파일 변경 시 다시 파싱하지 않고 {merger.last_update['reused']}개 파일의 이전 결과로 병합/중복 제거만 다시 수행했습니다.")
+    if merger.last_update['disk_cached'] > 0:
+        st.caption(f"💾 {merger.last_update['disk_cached']}개 파일은 텍스트를 다시 파싱하지 않고 디스크 캐시에서 불러왔습니다.")
+    reused_stages = [PROFILE_STAGE_LABELS.get(event['stage'], event['stage'])
+                     for event in staged_pipeline.cache.events if event['cache'] == 'hit']
+    if reused_stages:
+        st.caption(f"🗂️ 이번 실행에서 캐시를 재사용한 단계: {' · '.join(reused_stages)}")
+    
+    # 중복 제거 결과 표시
+    if duplicates_removed > 0:
+        st.info(f"🔄 중복 논문 {duplicates_removed}편이 자동으로 제거되었습니다. (원본 총 {total_papers_before_filter + duplicates_removed:,}편 → 정제 후 {total_papers_before_filter:,}편 | 판별 기준: {format_dedup_counts(dedup_report['counts'])})")
+    else:
+        st.info("✅ 중복 논문 없음 - 모든 논문이 고유한 데이터입니다.")
+    
+    # 유사 중복 후보 표시 (검토용)
+    near_duplicates = dedup_report['near_duplicates']
+    if near_duplicates is not None and len(near_duplicates) > 0:
+        with st.expander(f"🔁 유사 중복 후보 {len(near_duplicates):,}쌍 (자동 병합 {int(near_duplicates['auto_merge'].sum()):,}쌍)", expanded=False):
+            st.dataframe(
+                near_duplicates.drop(columns=['record_a', 'record_b']),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.download_button(
+                label="📄 (CSV 다운로드) - 유사 중복 후보 목록",
+                data=near_duplicates.to_csv(index=False).encode('utf-8-sig'),
+                file_name=f"near_duplicate_candidates_{len(near_duplicates)}pairs.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
+    render_file_status(file_status)
 
     # --- 데이터 품질 진단 결과 ---
     st.markdown("""
@@ -847,35 +1221,18 @@ if uploaded_files:
     </div>
     """, unsafe_allow_html=True)
 
+    # 화면 구성 단계 계측 (이번 실행 기준)
+    ui_profile = PipelineProfile()
     with st.spinner("🔍 병합 데이터 품질 분석 중..."):
-        issues, recommendations = diagnose_merged_quality(df_for_analysis, successful_files, duplicates_removed)
+        (issues, recommendations), diagnose_profile = staged_pipeline.run_stage(
+            'diagnose', lambda profile: run_diagnose_stage(profile, df_for_analysis, successful_files, duplicates_removed)
+        )
+        pipeline_profile.extend(diagnose_profile)
 
-    st.markdown("""
-    <div class="chart-container">
-        <div class="chart-title">🔍 병합 데이터 품질 진단 결과</div>
-    """, unsafe_allow_html=True)
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<h5 style="color: #ef4444; margin-bottom: 16px;">🚨 발견된 문제점</h5>', unsafe_allow_html=True)
-        
-        if issues:
-            for issue in issues:
-                st.markdown(f"- {issue}")
-        else:
-            st.markdown("✅ **문제점 없음** - 병합 데이터 품질 우수")
-    
-    with col2:
-        st.markdown('<h5 style="color: #10b981; margin-bottom: 16px;">💡 병합 결과</h5>', unsafe_allow_html=True)
-        
-        if recommendations:
-            for rec in recommendations:
-                st.markdown(f"- {rec}")
-        else:
-            st.markdown("🎯 **최적 상태** - SCIMAT 완벽 호환")
-    
-    st.markdown("</div>", unsafe_allow_html=True)
+    render_quality_diagnosis(issues, recommendations)
+
+    # 단계별 처리 시간/메모리 패널 (모든 단계가 끝난 뒤 페이지 하단에서 채움)
+    stage_profile_panel = st.container()
 
     # 병합 성공 알림
     st.markdown("""
@@ -916,14 +1273,12 @@ if uploaded_files:
     # 총 배제된 논문 수 계산
     total_excluded = len(df_excluded)
     
-    # Classification 컬럼만 제거 (원본 WOS 형식 유지)
-    df_final_output = df_for_analysis.drop(columns=['Classification'], errors='ignore')
+    # Classification 컬럼만 숨긴 뷰 (원본 WOS 형식 유지, 병합 결과 복사 없음)
+    df_final_output = df_for_analysis.drop_columns(['Classification'])
 
     # --- 최종 분석 대상 엑셀 다운로드용 데이터 준비 (모든 WOS 필드 포함) ---
-    excel_buffer_included = io.BytesIO()
-    with pd.ExcelWriter(excel_buffer_included, engine='openpyxl') as writer:
-        df_final_output.to_excel(writer, sheet_name='WOS_RawData_Included', index=False)
-    excel_data_included = excel_buffer_included.getvalue()
+    # 엑셀 파일은 다운로드 버튼을 누를 때만 생성 (데이터셋별 캐시)
+    excel_data_included = lambda: build_excel_export(pipeline_key, 'WOS_RawData_Included', df_final_output)
 
     # 메트릭 카드들
     col1, col2, col3, col4 = st.columns(4)
@@ -945,6 +1300,9 @@ if uploaded_files:
             help="최종 분석에 포함된 논문의 모든 WOS 원본 필드 보기 (엑셀)",
             use_container_width=True
         )
+        overflow_included = count_excel_overflow(pipeline_key, 'WOS_RawData_Included', df_final_output)
+        if overflow_included > 0:
+            st.caption(f"⚠️ 엑셀 셀 한도(32,767자)를 넘는 {overflow_included:,}개 셀은 잘려서 저장됩니다. 전체 내용은 SCIMAT 파일에 유지됩니다.")
     
     include_papers = len(df_for_analysis)
     
@@ -1001,10 +1359,7 @@ if uploaded_files:
         """, unsafe_allow_html=True)
         
         # 배제된 논문 전체 목록 다운로드
-        excel_buffer_excluded = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer_excluded, engine='openpyxl') as writer:
-            df_excluded.to_excel(writer, sheet_name='Excluded_Papers', index=False)
-        excel_data_excluded = excel_buffer_excluded.getvalue()
+        excel_data_excluded = lambda: build_excel_export(pipeline_key, 'Excluded_Papers', df_excluded)
         
         st.download_button(
             label="📊 (엑셀다운로드) - 배제된 논문 전체 목록",
@@ -1013,11 +1368,14 @@ if uploaded_files:
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True
         )
+        overflow_excluded = count_excel_overflow(pipeline_key, 'Excluded_Papers', df_excluded)
+        if overflow_excluded > 0:
+            st.caption(f"⚠️ 엑셀 셀 한도(32,767자)를 넘는 {overflow_excluded:,}개 셀은 잘려서 저장됩니다.")
 
         # 배제 이유별로 그룹화하여 표시
-        exclusion_reasons = df_excluded['Classification'].value_counts().index
-        for reason in exclusion_reasons:
-            reason_papers = df_excluded[df_excluded['Classification'] == reason]
+        excluded_reasons = df_excluded['Classification']
+        for reason in excluded_reasons.value_counts().index:
+            reason_papers = df_excluded.subset(excluded_reasons == reason)
             with st.expander(f"{reason} ({len(reason_papers)}편)", expanded=False):
                 for _, paper in reason_papers.head(5).iterrows(): # 샘플 5개 표시
                     title = str(paper.get('TI', 'N/A'))[:100]
@@ -1031,56 +1389,26 @@ if uploaded_files:
         <div class="chart-title">포함된 논문의 분류 분포 (Classification Distribution)</div>
     """, unsafe_allow_html=True)
     
+    chart_started = time.perf_counter()
     classification_counts_df = df_for_analysis['Classification'].value_counts().reset_index()
     classification_counts_df.columns = ['분류 (Classification)', '논문 수 (Count)']
 
-    col1, col2 = st.columns([0.4, 0.6])
-    with col1:
-        st.dataframe(classification_counts_df, use_container_width=True, hide_index=True)
-
-    with col2:
-        # 도넛 차트 (신규 분류 및 색상 적용)
-        color_map = {
-            'Technical (기술)': '#1f77b4',
-            'Platform (플랫폼)': '#ff7f0e',
-            'User (사용자)': '#2ca02c',
-            'Commercial (커머스)': '#d62728',
-            'Social (사회)': '#9467bd',
-            'Educational (교육)': '#8c564b',
-            'Multidisciplinary (다학제)': '#7f7f7f',
-            'etc (기타)': '#c7c7c7'
-        }
-        
-        # 데이터프레임 순서에 맞게 도메인/범위 정렬
-        ordered_df = classification_counts_df.set_index('분류 (Classification)')
-        domain = ordered_df.index.tolist()
-        range_ = [color_map.get(cat, '#333') for cat in domain]
-
-        selection = alt.selection_point(fields=['분류 (Classification)'], on='mouseover', nearest=True)
-
-        base = alt.Chart(classification_counts_df).encode(
-            theta=alt.Theta(field="논문 수 (Count)", type="quantitative", stack=True),
-            color=alt.Color(field="분류 (Classification)", type="nominal", title="분류 (Classification)",
-                           scale=alt.Scale(domain=domain, range=range_),
-                           legend=alt.Legend(orient="right", titleColor="#191f28", labelColor="#8b95a1")),
-            opacity=alt.condition(selection, alt.value(1), alt.value(0.8)),
-            tooltip=['분류 (Classification)', '논문 수 (Count)']
-        ).add_params(selection)
-
-        pie = base.mark_arc(outerRadius=150, innerRadius=90)
-        text_total = alt.Chart(pd.DataFrame([{'value': f'{len(df_final_output)}'}])).mark_text(
-            align='center', baseline='middle', fontSize=45, fontWeight='bold', color='#3182f6'
-        ).encode(text='value:N')
-        text_label = alt.Chart(pd.DataFrame([{'value': 'Refined Papers'}])).mark_text(
-            align='center', baseline='middle', fontSize=16, dy=30, color='#8b95a1'
-        ).encode(text='value:N')
-
-        chart = (pie + text_total + text_label).properties(
-            width=350, height=350
-        ).configure_view(strokeWidth=0)
-        st.altair_chart(chart, use_container_width=True)
+    render_classification_chart(classification_counts_df, len(df_final_output))
 
     st.markdown("</div>", unsafe_allow_html=True)
+
+    # --- 규칙 프로필별 분류 비교 (모든 프로필을 한 번의 공유 매칭으로 분류) ---
+    if len(rule_profiles) > 1:
+        with st.expander(f"🏷️ 규칙 프로필별 분류 비교 ({len(rule_profiles)}개 프로필)", expanded=False):
+            if st.toggle("모든 프로필로 분류하여 비교", key="compare_rule_profiles"):
+                (profile_overview, profile_label_counts), _ = staged_pipeline.run_stage(
+                    'profile_compare',
+                    lambda profile: compare_rule_profiles(profile, merged_df, rule_profiles),
+                    compile_rule_profiles(rule_profiles).key
+                )
+                st.dataframe(profile_overview, use_container_width=True, hide_index=True)
+                st.dataframe(profile_label_counts, use_container_width=True, hide_index=True)
+                st.caption(f"현재 결과는 '{rule_profiles[rule_profile_name]['title'] or rule_profile_name}' 프로필 기준입니다.")
     
     # --- 연도별 연구 동향 ---
     if 'PY' in df_final_output.columns:
@@ -1089,27 +1417,56 @@ if uploaded_files:
             <div class="chart-title">정제된 라이브 스트리밍 연구 동향 (데이터 정제 기준 적용 후)</div>
         """, unsafe_allow_html=True)
         
-        df_trend = df_final_output.copy()
-        df_trend['PY'] = pd.to_numeric(df_trend['PY'], errors='coerce')
-        df_trend.dropna(subset=['PY'], inplace=True)
-        df_trend['PY'] = df_trend['PY'].astype(int)
+        # 연도 컬럼만 꺼내 집계 (전체 데이터 복사 없음)
+        publication_years = pd.to_numeric(df_final_output['PY'], errors='coerce').dropna().astype(int)
         
-        yearly_counts = df_trend['PY'].value_counts().reset_index()
-        yearly_counts.columns = ['Year', 'Count']
-        yearly_counts = yearly_counts[yearly_counts['Year'] <= 2025].sort_values('Year')
-
-        if len(yearly_counts) > 0:
-            line_chart = alt.Chart(yearly_counts).mark_line(
-                point={'size': 80, 'filled': True}, strokeWidth=3, color='#0064ff'
-            ).encode(
-                x=alt.X('Year:O', title='발행 연도'),
-                y=alt.Y('Count:Q', title='논문 수'),
-                tooltip=['Year', 'Count']
-            ).properties(height=300)
-            
-            st.altair_chart(line_chart, use_container_width=True)
+        render_yearly_trend(publication_years.value_counts())
         
         st.markdown("</div>", unsafe_allow_html=True)
+    ui_profile.add('chart_build', time.perf_counter() - chart_started, records=len(df_final_output))
+
+    # --- 전문 검색 (WOS 검색식으로 병합 결과 확인) ---
+    with st.expander("🔎 병합 데이터 검색 (WOS 검색식)", expanded=False):
+        search_query = st.text_input(
+            "검색식",
+            key="search_query",
+            placeholder='TS=("live stream*" OR livestream*) AND PY=2018-2024 NOT TI=game',
+            help="TS= TI= AB= AK= KP= SO= AU= PY=, AND / OR / NOT, 괄호, \"구문\", 와일드카드(* ? $)를 지원합니다. "
+                 "필드 없이 입력하면 TS(제목·초록·키워드)에서 찾습니다."
+        )
+        if search_query.strip():
+            with st.spinner("🔎 검색 색인 준비 중 (병합 결과마다 처음 한 번만 생성)..."):
+                search_index, search_index_profile = staged_pipeline.run_stage(
+                    'search_index', lambda profile: build_search_index(merged_df, profile)
+                )
+                pipeline_profile.extend(search_index_profile)
+            try:
+                search_started = time.perf_counter()
+                search_results = search_index.results(search_query)
+                search_seconds = time.perf_counter() - search_started
+            except WosQueryError as e:
+                st.error(f"⚠️ 검색식 오류: {e}")
+            else:
+                included_matches = int((~search_results['Classification'].astype(str).str.startswith('Exclude')).sum())
+                st.caption(f"🔎 {len(search_results):,}편 일치 (분석 대상 {included_matches:,}편 · 배제 {len(search_results) - included_matches:,}편) "
+                           f"| 전체 {len(search_index):,}편 중 | {search_seconds * 1000:,.0f}ms")
+                preview_columns = [column for column in SEARCH_RESULT_COLUMNS if column in search_results.columns]
+                st.dataframe(
+                    search_results.drop_columns([column for column in search_results.columns if column not in preview_columns])
+                    .head(SEARCH_PREVIEW_ROWS),
+                    use_container_width=True,
+                    hide_index=True
+                )
+                if len(search_results) > SEARCH_PREVIEW_ROWS:
+                    st.caption(f"처음 {SEARCH_PREVIEW_ROWS}편만 표시합니다. 전체 결과는 CSV로 받을 수 있습니다.")
+                st.download_button(
+                    label=f"📄 (CSV 다운로드) - 검색 결과 {len(search_results):,}편 (모든 WOS 필드 + 분류)",
+                    data=lambda: build_search_export(pipeline_key, search_query, search_results),
+                    file_name=f"search_results_{len(search_results)}papers.csv",
+                    mime="text/csv",
+                    use_container_width=True,
+                    key="download_search_results"
+                )
 
     # --- 최종 파일 다운로드 섹션 ---
     st.markdown("""
@@ -1119,12 +1476,10 @@ if uploaded_files:
     </div>
     """, unsafe_allow_html=True)
     
-    # SCIMAT 호환 파일 다운로드
-    text_data = convert_to_scimat_wos_format(df_final_output)
-    
+    # SCIMAT 호환 파일 다운로드 (버튼을 누를 때만 생성, 화면을 다시 그릴 때마다 전체 파일을 메모리에 두지 않음)
     download_clicked = st.download_button(
         label="🔥 다운로드",
-        data=text_data,
+        data=lambda: build_scimat_export(pipeline_key, df_final_output),
         file_name=f"live_streaming_refined_for_scimat_{len(df_final_output)}papers.txt",
         mime="text/plain",
         type="primary",
@@ -1132,6 +1487,83 @@ if uploaded_files:
         key="download_final_file",
         help="데이터 정제 기준 적용 후 SCIMAT에서 바로 사용 가능한 WOS Plain Text 파일"
     )
+    
+    # 대용량 데이터셋용 분할 ZIP (SciMAT 로더에 파일 단위로 나눠 추가)
+    with st.expander("📦 SciMAT 분할 파일 (ZIP) 다운로드", expanded=False):
+        records_per_part = st.number_input(
+            "파일당 논문 수",
+            min_value=100, max_value=100000, value=SCIMAT_DEFAULT_PART_RECORDS, step=500,
+            key="scimat_records_per_part"
+        )
+        part_count = max(1, -(-len(df_final_output) // int(records_per_part)))
+        if st.checkbox(f"{part_count}개 파일로 분할한 ZIP 생성", key="build_scimat_zip"):
+            st.download_button(
+                label=f"📦 분할 ZIP 다운로드 ({part_count}개 파일)",
+                data=lambda: build_scimat_zip_export(pipeline_key, int(records_per_part), df_final_output),
+                file_name=f"live_streaming_refined_for_scimat_{len(df_final_output)}papers_{part_count}parts.zip",
+                mime="application/zip",
+                use_container_width=True,
+                key="download_scimat_zip"
+            )
+
+    # --- 단계별 처리 시간 / 메모리 진단 ---
+    with stage_profile_panel:
+        with st.expander("⏱️ 단계별 처리 시간 · 메모리 진단", expanded=False):
+            run_profile = PipelineProfile()
+            run_profile.extend([{**entry, 'scope': 'pipeline'} for entry in pipeline_profile.stages])
+            run_profile.extend([{**entry, 'scope': 'ui'} for entry in ui_profile.stages])
+            run_profile.extend([{**entry, 'scope': 'export'} for entry in get_export_profile(pipeline_key).stages])
+            
+            stage_records = run_profile.to_records()
+            stage_table = pd.DataFrame(stage_records)
+            stage_table['stage'] = [
+                PROFILE_STAGE_LABELS.get(entry['stage'], entry['stage']) + (f" ({entry['sheet']})" if entry.get('sheet') else '')
+                for entry in stage_records
+            ]
+            stage_table['scope'] = stage_table['scope'].map(PROFILE_SCOPE_LABELS)
+            stage_table['records'] = stage_table['records'].astype('Int64')
+            stage_table = stage_table[['scope', 'stage', 'records', 'seconds', 'peak_delta_mb', 'rss_delta_mb']].rename(columns={
+                'scope': '구분', 'stage': '단계', 'records': '레코드/파일 수', 'seconds': '시간 (초)',
+                'peak_delta_mb': '최대 할당 증가 (MB)', 'rss_delta_mb': 'RSS 변화 (MB)'
+            })
+            st.dataframe(stage_table, use_container_width=True, hide_index=True)
+            st.caption(
+                f"병합·분류 단계는 해당 단계 결과를 처음 계산한 시점 기준이며(파일 변경 {pipeline_profile.created_at} UTC), 캐시를 재사용한 단계는 그때의 값입니다. "
+                "인코딩 판별 시간은 파일별 합계로 파싱 시간에 포함됩니다. 엑셀 생성은 다운로드 버튼을 누른 뒤 표시됩니다."
+            )
+            st.caption(MEMORY_COLUMN_CAPTION)
+            compact_entries = [entry for entry in pipeline_profile.stages if entry['stage'] == 'compact']
+            if compact_entries:
+                st.caption(
+                    f"💾 저장 형식 압축 (반복 태그 범주형, 건수·연도 정수): 병합 데이터 "
+                    f"{compact_entries[-1]['bytes_before'] / 1e6:,.1f} MB → {compact_entries[-1]['bytes_after'] / 1e6:,.1f} MB"
+                )
+            
+            # 이번 실행의 단계별 캐시 적중 여부 (상위 단계 키 + 단계 파라미터로 만든 키 기준)
+            st.markdown("**🗂️ 단계별 캐시 (이번 실행)**")
+            cache_table = pd.DataFrame(staged_pipeline.cache.events)
+            cache_table['stage'] = cache_table['stage'].map(lambda stage: PROFILE_STAGE_LABELS.get(stage, stage))
+            cache_table['cache'] = cache_table['cache'].map(STAGE_CACHE_LABELS)
+            st.dataframe(
+                cache_table[['stage', 'cache', 'key']].rename(columns={'stage': '단계', 'cache': '상태', 'key': '캐시 키'}),
+                use_container_width=True, hide_index=True
+            )
+            st.caption("분류 기준만 바뀌면 파싱·중복 제거 결과를, 분할 단위 등 내보내기 옵션만 바뀌면 분류 결과를 재사용합니다.")
+            st.download_button(
+                label="🧾 (JSON 다운로드) - 단계별 계측 결과",
+                data=run_profile.to_json(
+                    pipeline_key=pipeline_key,
+                    files=len(uploaded_files),
+                    papers_merged=total_papers_before_filter,
+                    papers_included=len(df_final_output),
+                    pipeline_measured_at=pipeline_profile.created_at,
+                    stage_cache=staged_pipeline.cache.events
+                ),
+                file_name="wos_prep_stage_profile.json",
+                mime="application/json",
+                use_container_width=True,
+                key="download_stage_profile"
+            )
 
 # --- 하단 여백 및 추가 정보 ---
 st.markdown("<br>", unsafe_allow_html=True)
@@ -1143,7 +1575,7 @@ with st.expander("❓ 자주 묻는 질문 (FAQ)", expanded=False):
     A: WOS에서 여러 번 Plain Text 다운로드한 후, 모든 .txt 파일을 한 번에 업로드하면 자동으로 병합됩니다.
     
     **Q: 중복된 논문이 있을까봐 걱정됩니다.**
-    A: UT(Unique Article Identifier) 기준으로 자동 중복 제거되며, UT가 없으면 제목+저자 조합으로 중복을 감지합니다.
+    A: UT(Unique Article Identifier) 기준으로 자동 중복 제거되며, UT가 없으면 DOI, DOI도 없으면 제목+첫 저자+발행 연도 조합으로 중복을 감지합니다.
     
     **Q: WOS에서 어떤 설정으로 다운로드해야 하나요?**
     A: Export → Record Content: "Full Record and Cited References", File Format: "Plain Text"로 설정하세요. 인용 관계 분석을 위해 참고문헌 정보가 필수입니다.
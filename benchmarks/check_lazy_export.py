@@ -0,0 +1,83 @@
+"""지연 필드 파싱 SCIMAT 내보내기 회귀 확인 (즉시 파싱 결과와 바이트 단위 비교)
+
+불규칙 필드(여러 줄 RP/EM/RI/OI/FU, 'FU nan', 'CR ;;', 앞뒤 공백이 있는 값, 빈 연속 라인)를 넣은 합성 코퍼스를
+즉시 파싱(CLI 기본값) / 지연 필드 파싱(앱 기본값, parser.LAZY_FIELD_TAGS)으로 각각 병합하여 SCIMAT 파일을 비교
+(일괄 병합, 스트리밍 병합 각각, 다르면 처음 다른 레코드를 출력하고 종료 코드 1)
+
+사용 예:
+    python benchmarks/check_lazy_export.py --records 5000
+    python benchmarks/check_lazy_export.py --records 20000 --encoding utf-8 --irregular-rate 1.0
+"""
+import io
+import os
+import sys
+import argparse
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from wos_corpus import write_corpus  # noqa: E402
+from wos_prep.parser import LAZY_FIELD_TAGS  # noqa: E402
+from wos_prep.merge import load_and_merge_wos_files  # noqa: E402
+from wos_prep.sources import open_wos_sources  # noqa: E402
+from wos_prep.streaming import stream_merge_wos_files  # noqa: E402
+from wos_prep.export import write_scimat_wos_file  # noqa: E402
+
+def export_merged(paths, lazy_tags):
+    """파일 병합 + 중복 제거 결과의 SCIMAT 바이트"""
+    merged_df = load_and_merge_wos_files(open_wos_sources(paths), lazy_tags=lazy_tags)[0]
+    output = io.BytesIO()
+    write_scimat_wos_file(merged_df, output)
+    return output.getvalue()
+
+def export_streaming(paths, lazy_tags, work_dir):
+    """스트리밍 병합으로 기록한 SCIMAT 바이트 (분석 대상 논문만)"""
+    scimat_path = os.path.join(work_dir, f"streaming_scimat_{bool(lazy_tags)}.txt")
+    stream_merge_wos_files(open_wos_sources(paths), scimat_path, lazy_tags=lazy_tags)
+    with open(scimat_path, 'rb') as f:
+        return f.read()
+
+def first_difference(expected, actual):
+    """처음 다른 레코드 (번호, 기대 레코드, 실제 레코드)"""
+    expected_records = expected.decode('utf-8-sig').split('\nER\n')
+    actual_records = actual.decode('utf-8-sig').split('\nER\n')
+    for number, (left, right) in enumerate(zip(expected_records, actual_records)):
+        if left != right:
+            return number, left, right
+    return min(len(expected_records), len(actual_records)), '(레코드 수 다름)', ''
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='지연 필드 SCIMAT 내보내기 즉시 파싱 일치 확인')
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--irregular-rate', type=float, default=0.5, help='불규칙 필드를 넣을 레코드 비율 (기본: 0.5)')
+    parser.add_argument('--encoding', default='mixed', help='코퍼스 파일 인코딩 (기본: mixed)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='wos_lazy_check_') as work_dir:
+        corpus_dir = os.path.join(work_dir, 'corpus')
+        written = write_corpus(corpus_dir, args.records, encoding=args.encoding, seed=args.seed,
+                               irregular_rate=args.irregular_rate)
+        paths = [path for path, _ in written]
+        comparisons = {
+            'merge': (export_merged(paths, None), export_merged(paths, LAZY_FIELD_TAGS)),
+            'streaming': (export_streaming(paths, None, work_dir), export_streaming(paths, LAZY_FIELD_TAGS, work_dir)),
+        }
+
+    failures = 0
+    for name, (eager, output) in comparisons.items():
+        if output == eager:
+            print(f"✅ {name}: 즉시 파싱과 동일 ({len(eager):,} bytes)")
+            continue
+        failures += 1
+        number, expected, actual = first_difference(eager, output)
+        print(f"❌ {name}: 즉시 파싱과 다름 ({len(eager):,} → {len(output):,} bytes), 레코드 {number}")
+        print(f"--- 즉시 파싱\n{expected}\n--- {name}\n{actual}")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
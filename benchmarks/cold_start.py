@@ -0,0 +1,83 @@
+"""UI / 헤드리스 경로 콜드 스타트 시간 측정 (각 항목을 새 인터프리터에서 반복 실행)
+
+사용 예:
+    python benchmarks/cold_start.py --repeat 5 --json benchmarks/results/cold_start.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['streamlit', 'altair', 'openpyxl', 'pandas', 'pyarrow', 'nltk']
+
+# 측정 대상: 이름 → 새 인터프리터에서 실행할 코드 (측정 구간은 코드 전체)
+SCENARIOS = {
+    'headless: import wos_prep': 'import wos_prep',
+    'headless: import wos_prep.parser': 'import wos_prep.parser',
+    'headless: import wos_prep.pipeline': 'import wos_prep.pipeline',
+    'headless: CLI --help': (
+        'import wos_prep.cli\n'
+        'try:\n'
+        '    wos_prep.cli.main(["--help"])\n'
+        'except SystemExit:\n'
+        '    pass'
+    ),
+    'ui: import streamlit': 'import streamlit',
+    'ui: first render (no upload)': (
+        'from streamlit.testing.v1 import AppTest\n'
+        f'AppTest.from_file({os.path.join(REPO_ROOT, "app.py")!r}, default_timeout=120).run()'
+    ),
+}
+
+_RUNNER = '''
+import sys, time, json, io, contextlib
+started = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    exec(compile(sys.argv[1], "<scenario>", "exec"))
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": [m for m in sys.argv[2].split(",") if m in sys.modules]}))
+'''
+
+def measure(code, repeat):
+    """새 인터프리터에서 code를 repeat회 실행한 시간(초) 목록과 로딩된 무거운 모듈 목록"""
+    timings, modules = [], []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-c', _RUNNER, code, ','.join(HEAVY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        modules = result['modules']
+    return timings, modules
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WOS PREP 콜드 스타트 시간 측정')
+    parser.add_argument('--repeat', type=int, default=5, help='항목별 반복 횟수 (기본: 5)')
+    parser.add_argument('--json', help='결과를 저장할 JSON 경로')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, code in SCENARIOS.items():
+        timings, modules = measure(code, args.repeat)
+        results.append({
+            'scenario': name,
+            'median_seconds': round(statistics.median(timings), 4),
+            'min_seconds': round(min(timings), 4),
+            'repeat': args.repeat,
+            'heavy_modules_loaded': modules,
+        })
+        print(f"{name:<40} median {statistics.median(timings):7.3f}s  min {min(timings):7.3f}s  "
+              f"[{', '.join(modules) or '-'}]")
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""병합 레코드 저장 형식 압축 전/후 메모리 비교 (wos_prep.store.compact_wos_frame)
+
+합성 코퍼스를 파싱 → 병합 → 중복 제거한 DataFrame과 압축한 DataFrame의 컬럼별 실제 메모리
+(문자열 내용 포함)를 비교하여 benchmarks/results/memory_<레코드 수>.json으로 저장
+--object-strings: pandas 2.x 기본값처럼 문자열을 Python object로 보관하는 경우를 측정
+--lazy-fields: CR/C1/FU 등 긴 필드를 원본 구간으로만 보관하는 지연 필드 파싱(wos_prep.parser.LAZY_FIELD_TAGS)을 측정
+
+사용 예:
+    python benchmarks/memory_report.py --records 100000
+    python benchmarks/memory_report.py --records 100000 --object-strings
+    python benchmarks/memory_report.py --records 100000 --lazy-fields
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import pandas as pd  # noqa: E402
+
+from wos_corpus import write_corpus  # noqa: E402
+from wos_prep.parser import LAZY_FIELD_TAGS, parse_wos_files, columns_to_frame  # noqa: E402
+from wos_prep.merge import deduplicate_records  # noqa: E402
+from wos_prep.store import compact_wos_frame, frame_memory_bytes, frame_memory_report  # noqa: E402
+
+def build_merged_frame(corpus_dir, lazy_tags=None):
+    """코퍼스 디렉터리의 파일을 파싱 + 병합 + 중복 제거 (압축 전)"""
+    payloads = []
+    for filename in sorted(os.listdir(corpus_dir)):
+        with open(os.path.join(corpus_dir, filename), 'rb') as f:
+            payloads.append((filename, f.read()))
+    parsed = parse_wos_files(payloads, lazy_tags=lazy_tags)
+    merged_df = pd.concat([columns_to_frame(p['columns']) for p in parsed if p['columns'] is not None],
+                          ignore_index=True)
+    return deduplicate_records(merged_df)[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WOS PREP 저장 형식 압축 메모리 비교')
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--object-strings', action='store_true',
+                        help='문자열 컬럼을 Python object로 보관 (pandas 2.x 기본 동작)')
+    parser.add_argument('--lazy-fields', action='store_true',
+                        help='지연 필드 파싱 (긴 필드는 원본 구간만 보관)')
+    parser.add_argument('--output', help='결과 JSON 경로 (기본: benchmarks/results/memory_<records>[_object][_lazy].json)')
+    args = parser.parse_args(argv)
+    if args.object_strings:
+        pd.set_option('future.infer_string', False)
+
+    with tempfile.TemporaryDirectory(prefix='wos_memory_') as work_dir:
+        write_corpus(work_dir, args.records, seed=args.seed)
+        merged_df = build_merged_frame(work_dir, LAZY_FIELD_TAGS if args.lazy_fields else None)
+
+    started = time.perf_counter()
+    compact_df = compact_wos_frame(merged_df)
+    compact_seconds = time.perf_counter() - started
+    bytes_before, bytes_after = frame_memory_bytes(merged_df), frame_memory_bytes(compact_df)
+
+    columns = frame_memory_report(merged_df, compact_df)
+    print(f"{'컬럼':<6} {'변환 전':>12} {'변환 후':>12} {'전 (MB)':>9} {'후 (MB)':>9}")
+    for row in columns:
+        print(f"{row['column']:<6} {row['dtype_before']:>12} {row['dtype_after']:>12} "
+              f"{row['bytes_before'] / 1e6:9.1f} {row['bytes_after'] / 1e6:9.1f}")
+    print(f"\n{len(merged_df):,}편: {bytes_before / 1e6:.1f} MB → {bytes_after / 1e6:.1f} MB "
+          f"(-{(1 - bytes_after / bytes_before) * 100:.1f}%, 변환 {compact_seconds:.2f}초)")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    suffix = ('_object' if args.object_strings else '') + ('_lazy' if args.lazy_fields else '')
+    output = args.output or os.path.join(RESULTS_DIR, f"memory_{args.records}{suffix}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'string_storage': 'object' if args.object_strings else str(merged_df['TI'].dtype),
+            'lazy_fields': list(LAZY_FIELD_TAGS) if args.lazy_fields else [],
+            'records': len(merged_df),
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'compact_seconds': round(compact_seconds, 3),
+            'columns': columns,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
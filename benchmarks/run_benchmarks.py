@@ -0,0 +1,181 @@
+"""단계별 처리량 / 최대 메모리 벤치마크
+
+합성 코퍼스(benchmarks/wos_corpus.py)를 크기별로 생성하고 파싱 → 중복 제거 → 저장 형식 압축 → 분류 →
+품질 진단 → SCIMAT 내보내기 → 엑셀 내보내기 각 단계의 시간과 최대 상주 메모리(RSS)를 측정
+(Linux에서는 단계마다 /proc/self/clear_refs로 최고치를 초기화하여 단계별 최대값을 구함)
+결과는 benchmarks/results/<label>.json으로 저장하며 --compare로 이전 결과와 비교
+
+사용 예:
+    python benchmarks/run_benchmarks.py --sizes 1000,10000 --label baseline
+    python benchmarks/run_benchmarks.py --sizes 1000,10000 --compare benchmarks/results/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 100000 --lazy-fields --label lazy_fields
+"""
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARK_DIR)
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+REGRESSION_RATIO = 1.2  # 이전 결과 대비 이 배율 이상 느려지면 표시
+
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCHMARK_DIR)
+
+import pandas as pd  # noqa: E402
+
+from wos_corpus import write_corpus  # noqa: E402
+from wos_prep.parser import LAZY_FIELD_TAGS, parse_wos_files, columns_to_frame  # noqa: E402
+from wos_prep.merge import deduplicate_records  # noqa: E402
+from wos_prep.store import compact_wos_frame  # noqa: E402
+from wos_prep.classify import classify_articles  # noqa: E402
+from wos_prep.diagnostics import diagnose_merged_quality  # noqa: E402
+from wos_prep.export import write_scimat_wos_file, write_excel_workbook  # noqa: E402
+from wos_prep.profiling import read_process_memory_mb, reset_peak_memory  # noqa: E402
+
+def measure_stage(function):
+    """함수 실행 시간(초), 단계 중 최대 RSS(MB), 시작 대비 최대 증가량(MB) 측정"""
+    gc.collect()
+    peak_supported = reset_peak_memory()
+    rss_before = read_process_memory_mb('VmRSS')
+    started = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - started
+    peak_mb = read_process_memory_mb('VmHWM') if peak_supported else None
+    growth_mb = None if peak_mb is None or rss_before is None else max(peak_mb - rss_before, 0.0)
+    return result, elapsed, peak_mb, growth_mb
+
+def run_size(size, work_dir, args):
+    """코퍼스 하나에 대해 단계별 측정 결과 목록 반환"""
+    corpus_dir = os.path.join(work_dir, f"corpus_{size}")
+    written = write_corpus(corpus_dir, size, duplicate_rate=args.duplicate_rate,
+                           encoding=args.encoding, seed=args.seed)
+    payloads = []
+    for path, _ in written:
+        with open(path, 'rb') as f:
+            payloads.append((os.path.basename(path), f.read()))
+    input_mb = sum(len(file_bytes) for _, file_bytes in payloads) / 1e6
+
+    state = {}
+
+    def parse():
+        parsed = parse_wos_files(payloads, parallel=args.parallel, lazy_tags=LAZY_FIELD_TAGS if args.lazy_fields else None)
+        state['df'] = pd.concat([columns_to_frame(p['columns']) for p in parsed if p['columns'] is not None],
+                                ignore_index=True)
+
+    def dedup():
+        state['df'], state['dedup_counts'] = deduplicate_records(state['df'])
+
+    def compact():
+        state['df'] = compact_wos_frame(state['df'])
+
+    def classify():
+        state['df']['Classification'] = classify_articles(state['df'])
+
+    def diagnose():
+        diagnose_merged_quality(state['df'], len(payloads), sum(state['dedup_counts'].values()))
+
+    def export_scimat():
+        write_scimat_wos_file(state['df'], os.path.join(work_dir, 'scimat.txt'))
+
+    def export_excel():
+        write_excel_workbook(state['df'], os.path.join(work_dir, 'export.xlsx'), 'Bench')
+
+    stages = [('parse', parse), ('dedup', dedup), ('compact', compact), ('classify', classify),
+              ('diagnose', diagnose), ('export_scimat', export_scimat)]
+    if size <= args.excel_max_records:
+        stages.append(('export_excel', export_excel))
+
+    rows = []
+    for stage, function in stages:
+        _, elapsed, peak_mb, growth_mb = measure_stage(function)
+        rows.append({
+            'records': size,
+            'stage': stage,
+            'seconds': round(elapsed, 4),
+            'records_per_second': round(size / elapsed, 1) if elapsed > 0 else None,
+            'input_mb_per_second': round(input_mb / elapsed, 2) if stage == 'parse' and elapsed > 0 else None,
+            'peak_rss_mb': None if peak_mb is None else round(peak_mb, 1),
+            'peak_growth_mb': None if growth_mb is None else round(growth_mb, 1),
+        })
+        print(f"{size:>9,} {stage:<14} {elapsed:9.3f}s {size / max(elapsed, 1e-9):>12,.0f} rec/s"
+              + ('' if peak_mb is None else f" {peak_mb:9.1f} MB peak RSS (+{growth_mb:.1f})"))
+
+    shutil.rmtree(corpus_dir, ignore_errors=True)
+    return rows
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare_results(current_rows, baseline_path):
+    """이전 결과 대비 단계별 시간 비율 출력 (REGRESSION_RATIO 이상이면 회귀 표시)"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(row['records'], row['stage']): row for row in json.load(f)['results']}
+    print(f"\n--- 비교: {baseline_path} ---")
+    regressions = 0
+    for row in current_rows:
+        previous = baseline.get((row['records'], row['stage']))
+        if previous is None or not previous['seconds']:
+            continue
+        ratio = row['seconds'] / previous['seconds']
+        flag = '  ⚠️ 회귀' if ratio >= REGRESSION_RATIO else ''
+        regressions += bool(flag)
+        print(f"{row['records']:>9,} {row['stage']:<14} {previous['seconds']:9.3f}s → {row['seconds']:9.3f}s "
+              f"(x{ratio:.2f}){flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WOS PREP 단계별 벤치마크')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help=f"쉼표로 구분한 레코드 수 (전체: {','.join(map(str, DEFAULT_SIZES))})")
+    parser.add_argument('--duplicate-rate', type=float, default=0.05)
+    parser.add_argument('--encoding', default='mixed', help="코퍼스 파일 인코딩 (기본: mixed)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--parallel', choices=['auto', 'on', 'off'], default='auto', help='파싱 프로세스 풀 사용')
+    parser.add_argument('--lazy-fields', action='store_true', help='긴 필드를 원본 구간으로만 보관하는 지연 필드 파싱')
+    parser.add_argument('--excel-max-records', type=int, default=100000,
+                        help='이 레코드 수를 넘으면 엑셀 단계 생략 (엑셀 시트 한도 1,048,576행)')
+    parser.add_argument('--label', default=None, help='결과 파일 이름 (기본: git 리비전)')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 경로')
+    args = parser.parse_args(argv)
+    args.parallel = {'auto': None, 'on': True, 'off': False}[args.parallel]
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    revision = _git_revision()
+    rows = []
+    with tempfile.TemporaryDirectory(prefix='wos_bench_') as work_dir:
+        for size in sizes:
+            rows.extend(run_size(size, work_dir, args))
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"{args.label or revision}.json")
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'revision': revision,
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'lazy_fields': args.lazy_fields,
+            'results': rows,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {result_path}")
+
+    if args.compare:
+        return 1 if compare_results(rows, args.compare) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""벤치마크용 합성 WOS Plain Text 코퍼스 생성기
+
+실제 WOS 내보내기 형식(FN/VR 헤더, AU/AF/C1/CR 연속 라인, ER/EF 종료)을 따르며
+중복 비율(UT 없는 레코드의 중복본은 DOI/제목 대소문자만 다름)과 파일 인코딩을 조절할 수 있음
+--irregular-rate: 실제 내보내기에서 볼 수 있는 불규칙 필드(여러 줄 RP/EM/RI/OI/FU, 'FU nan', 'CR ;;',
+앞뒤 공백이 있는 값, 빈 연속 라인)를 넣을 레코드 비율 (기본 0: 기존 코퍼스와 동일)
+
+사용 예:
+    python benchmarks/wos_corpus.py 10000 /tmp/wos_10k --duplicate-rate 0.05 --encoding mixed
+"""
+import os
+import sys
+import random
+import argparse
+
+ENCODINGS = ['utf-8-sig', 'utf-8', 'utf-16', 'latin1']
+WOS_RECORDS_PER_FILE = 500  # WOS 웹 내보내기 1회 최대 레코드 수
+
+# --- 어휘 (분류 기준에 걸리는 비율이 실제 검색 결과와 비슷하도록 구성) ---
+_CORE_TERMS = ['live streaming', 'livestream', 'live commerce', 'game streaming', 'twitch',
+               'live shopping', 'virtual influencer', 'live video', 'tiktok live']
+_DIMENSION_TERMS = {
+    'Technical': ['latency', 'qoe', 'bandwidth', 'codec'],
+    'Platform': ['governance', 'monetization', 'ecosystem'],
+    'User': ['engagement', 'motivation', 'parasocial', 'viewer'],
+    'Commercial': ['purchase', 'brand', 'marketing'],
+    'Social': ['community', 'identity', 'fandom'],
+    'Educational': ['learning', 'student', 'teaching'],
+}
+_METHOD_TERMS = ['survey', 'experiment', 'interview', 'case study', 'empirical', 'framework']
+_EXCLUSION_TERMS = ['remote surgery', 'seismic', 'telemedicine', 'vod', 'pre-recorded', 'satellite image']
+_FILLER = ('the of and in to a for on with effect study role impact evidence perspective approach '
+           'data results participants online digital social media content patterns use among '
+           'understanding toward through between toward influence factors value experience').split()
+_SURNAMES = ['Kim', 'Lee', 'Park', 'Choi', 'Wang', 'Zhang', 'Li', 'Chen', 'Liu', 'Smith', 'Johnson',
+             'Garcia', 'Müller', 'Sørensen', 'Núñez', 'Dubois', 'Rossi', 'Nakamura', 'Silva', 'Öztürk']
+_GIVEN = ['Jin', 'Soo', 'Hyun', 'Wei', 'Min', 'Yan', 'John', 'Maria', 'José', 'Anaïs', 'Lukas', 'Aiko']
+_INSTITUTIONS = ['Hanyang Univ, Seoul, South Korea', 'Seoul Natl Univ, Seoul, South Korea',
+                 'Tsinghua Univ, Beijing, Peoples R China', 'Univ Michigan, Ann Arbor, MI USA',
+                 'Univ Zürich, Zürich, Switzerland', 'Univ São Paulo, São Paulo, Brazil',
+                 'Aarhus Univ, Aarhus, Denmark', 'Univ Tokyo, Tokyo, Japan']
+_JOURNALS = ['JOURNAL OF RETAILING AND CONSUMER SERVICES', 'COMPUTERS IN HUMAN BEHAVIOR',
+             'ELECTRONIC COMMERCE RESEARCH AND APPLICATIONS', 'NEW MEDIA & SOCIETY',
+             'IEEE TRANSACTIONS ON MULTIMEDIA', 'INFORMATION & MANAGEMENT', 'TELEMATICS AND INFORMATICS']
+_DOC_TYPES = ['Article'] * 14 + ['Review'] * 2 + ['Proceedings Paper'] * 2 + ['Editorial Material', 'Letter']
+
+def _phrase(rng, length, core_probability, exclusion_probability, focus_terms):
+    words = [rng.choice(_FILLER) for _ in range(length)]
+    if rng.random() < core_probability:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(_CORE_TERMS))
+    for _ in range(rng.randint(0, 2)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(focus_terms))
+    if rng.random() < 0.6:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(_METHOD_TERMS))
+    if rng.random() < exclusion_probability:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(_EXCLUSION_TERMS))
+    return ' '.join(words)
+
+def _wrap(tag, items):
+    """첫 항목은 태그 라인, 나머지는 3칸 들여쓴 연속 라인"""
+    return [f"{tag} {items[0]}"] + [f"   {item}" for item in items[1:]]
+
+def add_irregular_fields(rng, record):
+    """실제 WOS 내보내기처럼 여러 줄로 나뉘거나 비어 있거나 공백이 남은 필드를 레코드에 추가 (라인 값 그대로 기록됨)"""
+    surname, given = record['AF'][0].split(', ')
+    institution = rng.choice(_INSTITUTIONS)
+    record['RP'] = [f"{surname}, {given[0]} (corresponding author), {institution.rsplit(', ', 1)[0]},",
+                    f"{institution.rsplit(', ', 1)[1]}."]
+    # 여러 주소는 '; ' 경계에서 줄바꿈되어 앞 줄 끝에 ';'가 남음
+    emails = [f"{surname.lower()}@univ{number}.edu" for number in range(rng.randint(1, 3))]
+    record['EM'] = [email + ';' for email in emails[:-1]] + emails[-1:]
+    record['RI'] = [f"{name}/{chr(65 + rng.randrange(26))}-{rng.randint(1000, 9999)}-{rng.randint(2010, 2024)}"
+                    for name in record['AF'][:rng.randint(1, 3)]]
+    record['OI'] = [f"{name}/0000-000{rng.randint(1, 3)}-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+                    for name in record['AF'][:rng.randint(1, 2)]]
+    record['FU'] = rng.choice([['nan'], ['National Research Foundation of Korea', f"[NRF-{rng.randint(2015, 2024)}R1A2]"],
+                               [' NSF ', ''], ['NSF; ', 'grant 12']])
+    record['FX'] = [f" This work was supported by {rng.choice(['NRF', 'NSF', 'ERC'])}.  "]
+    if rng.random() < 0.2:
+        record['CR'] = [';;']
+    if rng.random() < 0.3:
+        record['C1'] = record['C1'] + ['']
+
+def make_record(rng, serial, cr_refs=(10, 60), missing_ut_rate=0.03, irregular_rate=0.0):
+    """레코드 하나를 필드 dict(태그 → 라인 값 리스트)로 생성"""
+    authors = [(rng.choice(_SURNAMES), rng.choice(_GIVEN)) for _ in range(rng.randint(1, 6))]
+    year = rng.randint(2005, 2025)
+    # 레코드마다 주 연구 차원 1개 (일부는 2개 -> 다학제)
+    focus_terms = list(_DIMENSION_TERMS[rng.choice(list(_DIMENSION_TERMS))])
+    if rng.random() < 0.2:
+        focus_terms += _DIMENSION_TERMS[rng.choice(list(_DIMENSION_TERMS))]
+    title = _phrase(rng, rng.randint(6, 14), 0.8, 0.03, focus_terms).capitalize()
+    title_break = title.rfind(' ', 0, 70)
+    record = {
+        'PT': ['J'],
+        'AU': [f"{surname}, {given[0]}" for surname, given in authors],
+        'AF': [f"{surname}, {given}" for surname, given in authors],
+        # 긴 제목은 WOS처럼 연속 라인으로 줄바꿈
+        'TI': [title[:title_break], title[title_break + 1:]] if len(title) > 70 and title_break > 0 else [title],
+        'SO': [rng.choice(_JOURNALS)],
+        'LA': ['English'],
+        'DT': [rng.choice(_DOC_TYPES)],
+        'DE': ['; '.join(rng.sample(focus_terms + _CORE_TERMS, 4))],
+        'ID': ['; '.join(rng.sample(focus_terms + _METHOD_TERMS, 3))],
+        'AB': [_phrase(rng, rng.randint(120, 250), 0.5, 0.05, focus_terms)],
+        'C1': [f"[{surname}, {given[0]}] {rng.choice(_INSTITUTIONS)}." for surname, given in authors],
+        'CR': [f"{rng.choice(_SURNAMES)} {rng.choice(_GIVEN)[0]}, {rng.randint(1990, year)}, "
+               f"{rng.choice(_JOURNALS)[:20]}, V{rng.randint(1, 80)}, P{rng.randint(1, 900)}, "
+               f"DOI 10.{rng.randint(1000, 9999)}/ref.{rng.randint(1, 10 ** 6)}"
+               for _ in range(rng.randint(*cr_refs))],
+        'TC': [str(rng.randint(0, 300))],
+        'PY': [str(year)],
+        'VL': [str(rng.randint(1, 80))],
+        'DI': [f"10.1016/j.bench.{serial:08d}"],
+        'UT': [f"WOS:{serial:015d}"],
+    }
+    record['NR'] = [str(len(record['CR']))]
+    if irregular_rate and rng.random() < irregular_rate:
+        add_irregular_fields(rng, record)
+    # 타 DB에서 옮겨온 레코드처럼 일부는 UT(또는 UT와 DOI 모두)가 없음
+    if rng.random() < missing_ut_rate:
+        del record['UT']
+        if rng.random() < 0.3:
+            del record['DI']
+    return record
+
+def make_duplicate(record):
+    """이전 레코드의 중복본 생성 (UT가 없으면 DOI 대소문자, DOI도 없으면 제목 대소문자만 다르게)"""
+    duplicate = {tag: list(values) for tag, values in record.items()}
+    if 'UT' not in duplicate:
+        if 'DI' in duplicate:
+            duplicate['DI'] = [duplicate['DI'][0].upper()]
+        else:
+            duplicate['TI'] = [line.upper() for line in duplicate['TI']]
+    return duplicate
+
+def iter_corpus_records(count, duplicate_rate=0.05, seed=0, cr_refs=(10, 60), irregular_rate=0.0):
+    """count개 레코드(중복본 포함)를 생성하는 제너레이터"""
+    rng = random.Random(seed)
+    recent = []
+    serial = 0
+    for _ in range(count):
+        if recent and rng.random() < duplicate_rate:
+            yield make_duplicate(rng.choice(recent))
+            continue
+        record = make_record(rng, serial, cr_refs, irregular_rate=irregular_rate)
+        serial += 1
+        # 최근 레코드만 중복 후보로 보관 (메모리 일정)
+        if len(recent) < 2000:
+            recent.append(record)
+        else:
+            recent[rng.randrange(len(recent))] = record
+        yield record
+
+def format_wos_file(records):
+    """레코드 dict 목록을 WOS Plain Text 문자열로 변환"""
+    lines = ['FN Clarivate Analytics Web of Science', 'VR 1.0']
+    for record in records:
+        for tag, values in record.items():
+            lines.extend(_wrap(tag, values))
+        lines.extend(['ER', ''])
+    lines.append('EF')
+    return '\n'.join(lines) + '\n'
+
+def write_corpus(output_dir, count, records_per_file=WOS_RECORDS_PER_FILE, duplicate_rate=0.05,
+                 encoding='utf-8-sig', seed=0, cr_refs=(10, 60), irregular_rate=0.0):
+    """코퍼스를 records_per_file 단위 파일로 기록하고 (경로, 인코딩) 목록 반환
+
+    encoding='mixed'이면 파일마다 ENCODINGS를 번갈아 사용
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    batch = []
+
+    def flush():
+        file_encoding = ENCODINGS[len(written) % len(ENCODINGS)] if encoding == 'mixed' else encoding
+        path = os.path.join(output_dir, f"savedrecs_{len(written) + 1:05d}.txt")
+        with open(path, 'wb') as f:
+            f.write(format_wos_file(batch).encode(file_encoding, errors='replace'))
+        written.append((path, file_encoding))
+        batch.clear()
+
+    for record in iter_corpus_records(count, duplicate_rate, seed, cr_refs, irregular_rate):
+        batch.append(record)
+        if len(batch) >= records_per_file:
+            flush()
+    if batch:
+        flush()
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='합성 WOS Plain Text 코퍼스 생성')
+    parser.add_argument('records', type=int, help='생성할 레코드 수 (중복본 포함)')
+    parser.add_argument('output_dir', help='출력 디렉터리')
+    parser.add_argument('--records-per-file', type=int, default=WOS_RECORDS_PER_FILE)
+    parser.add_argument('--duplicate-rate', type=float, default=0.05, help='중복본 비율 (기본: 0.05)')
+    parser.add_argument('--encoding', choices=ENCODINGS + ['mixed'], default='utf-8-sig')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--irregular-rate', type=float, default=0.0,
+                        help='여러 줄 RP/EM, FU nan 등 불규칙 필드를 넣을 레코드 비율 (기본: 0)')
+    args = parser.parse_args(argv)
+
+    written = write_corpus(args.output_dir, args.records, args.records_per_file,
+                           args.duplicate_rate, args.encoding, args.seed, irregular_rate=args.irregular_rate)
+    total_bytes = sum(os.path.getsize(path) for path, _ in written)
+    print(f"{len(written)}개 파일, {args.records:,}편, {total_bytes / 1e6:.1f} MB → {args.output_dir}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
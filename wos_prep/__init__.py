@@ -0,0 +1,71 @@
+"""WOS PREP 핵심 처리 모듈 (Streamlit UI 없이 import 가능)
+
+주요 함수는 패키지에서 바로 가져올 수 있으며, 실제 하위 모듈은 처음 접근할 때 로딩
+    from wos_prep import run_pipeline, convert_to_scimat_wos_format
+"""
+import importlib
+
+# 공개 이름 → 정의된 하위 모듈 (접근 시 지연 import)
+_LAZY_EXPORTS = {
+    'detect_wos_encoding': 'parser',
+    'parse_wos_format': 'parser',
+    'parse_wos_file': 'parser',
+    'parse_wos_files': 'parser',
+    'LAZY_FIELD_TAGS': 'parser',
+    'deduplicate_records': 'merge',
+    'find_near_duplicates': 'merge',
+    'merge_near_duplicates': 'merge',
+    'apply_near_duplicate_mode': 'merge',
+    'load_and_merge_wos_files': 'merge',
+    'IncrementalWosMerger': 'incremental',
+    'StageCache': 'stages',
+    'StagedWosPipeline': 'stages',
+    'stage_key': 'stages',
+    'CorpusDiskCache': 'diskcache',
+    'CLASSIFICATION_RULES': 'classify',
+    'CLASSIFIER_CONFIG_KEY': 'classify',
+    'classify_articles': 'classify',
+    'classify_article': 'classify',
+    'make_rule_profile': 'classify',
+    'compile_rule_profiles': 'classify',
+    'profile_classifier': 'classify',
+    'summarize_profile_labels': 'classify',
+    'with_matching': 'classify',
+    'normalize_texts': 'normalize',
+    'normalized_text_frame': 'normalize',
+    'load_rule_profiles': 'rules',
+    'diagnose_merged_quality': 'diagnostics',
+    'diagnose_quality_counts': 'diagnostics',
+    'convert_to_scimat_wos_format': 'export',
+    'write_scimat_wos_file': 'export',
+    'write_scimat_wos_zip': 'export',
+    'write_excel_workbook': 'export',
+    'ScimatWosWriter': 'export',
+    'LocalWosFile': 'sources',
+    'GzipWosFile': 'sources',
+    'ZipMemberWosFile': 'sources',
+    'open_wos_sources': 'sources',
+    'stream_merge_wos_files': 'streaming',
+    'BackgroundJob': 'jobs',
+    'WosSearchIndex': 'search',
+    'build_search_index': 'search',
+    'parse_wos_query': 'search',
+    'compute_upload_key': 'pipeline',
+    'run_pipeline': 'pipeline',
+    'split_classified': 'pipeline',
+    'RecordView': 'views',
+    'as_record_view': 'views',
+    'compact_wos_frame': 'store',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_LAZY_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
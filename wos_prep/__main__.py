@@ -0,0 +1,6 @@
+"""python -m wos_prep 진입점"""
+import sys
+
+from wos_prep.cli import main
+
+sys.exit(main())
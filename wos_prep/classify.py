@@ -0,0 +1,309 @@
+"""연구 목표 기준 논문 분류 (분류 규칙 프로필, 공유 키워드 매처, 컬럼 단위 분류)
+
+분류 규칙 프로필: 배제 단계별 키워드 + 차원별 키워드 + 포함/배제 라벨 (기본 프로필은 CLASSIFICATION_RULES,
+설정 파일의 추가 프로필은 rules.load_rule_profiles)
+여러 프로필은 compile_rule_profiles로 한 번 컴파일하여 공유: 프로필 간 같은 키워드 묶음은 정규식 하나로,
+텍스트 컬럼 소문자 변환도 한 번만 수행하고 모든 프로필의 라벨을 함께 계산
+"""
+import re
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.normalize import NORMALIZED_FIELDS, TOKEN_SEPARATOR, normalize_keywords, normalized_text_frame
+
+# --- 논문 분류 기준 (분류 함수 및 캐시 키에서 공용) ---
+CLASSIFICATION_RULES = {
+    # 핵심 주제어: 이 중 하나는 반드시 포함되어야 함
+    'core_keywords': [
+        'live stream', 'livestream', 'live-stream', 'live commerce', 
+        'game streaming', 'virtual influencer', 'live video', 'live shopping',
+        'twitch', 'youtube live', 'facebook live', 'tiktok live'
+    ],
+    # 배제 기준 키워드
+    'irrelevant_domain_keywords': ['remote surgery', 'military', 'medical signal', 'telemedicine', 'seismic', 'geological', 'satellite image', 'astronomy'],
+    'non_academic_types': ['editorial', 'news', 'correction', 'letter', 'book review', 'meeting abstract'],
+    'non_interactive_keywords': ['vod', 'asynchronous', 'pre-recorded', 'video on demand'],
+    'methodology_keywords': ['survey', 'experiment', 'interview', 'case study', 'model', 'ethnography', 'empirical', 'framework', 'analysis', 'mechanism', 'sem', 'review', 'meta-analysis', 'algorithm'],
+    # 최종 분류 차원 키워드
+    'dimension_keywords': {
+        'Technical': ['latency', 'qos', 'qoe', 'protocol', 'bandwidth', 'codec', 'network', 'infrastructure', 'algorithm', 'architecture'],
+        'Platform': ['ecosystem', 'governance', 'business model', 'platform', 'monetization', 'creator economy'],
+        'User': ['behavior', 'motivation', 'engagement', 'psychology', 'user', 'viewer', 'audience', 'parasocial', 'trust', 'intention'],
+        'Commercial': ['commerce', 'marketing', 'sales', 'roi', 'purchase', 'influencer', 'advertising', 'e-commerce', 'brand'],
+        'Social': ['culture', 'identity', 'social impact', 'fandom', 'community', 'social presence', 'cultural'],
+        'Educational': ['learning', 'teaching', 'virtual classroom', 'education', 'student']
+    }
+}
+
+# 한/영 병기 레이블 맵
+CLASSIFICATION_LABELS = {
+    'Technical': 'Technical (기술)',
+    'Platform': 'Platform (플랫폼)',
+    'User': 'User (사용자)',
+    'Commercial': 'Commercial (커머스)',
+    'Social': 'Social (사회)',
+    'Educational': 'Educational (교육)',
+    'Multidisciplinary': 'Multidisciplinary (다학제)',
+    'etc': 'etc (기타)'
+}
+
+# 배제 단계 (순서대로 적용, 앞 단계에서 배제된 논문은 다음 단계에서 다시 보지 않음)
+# (규칙 키, 검사 텍스트 'text'(TI/AB/DE/ID) | 'type'(DT), 배제 조건 'match'(일치) | 'missing'(불일치), 기본 배제 라벨)
+EXCLUSION_STEPS = (
+    ('core_keywords', 'text', 'missing', 'Exclude - Core keyword missing'),
+    ('irrelevant_domain_keywords', 'text', 'match', 'Exclude - EC1 (Irrelevant domain)'),
+    ('non_academic_types', 'type', 'match', 'Exclude - EC3 (Non-academic)'),
+    ('non_interactive_keywords', 'text', 'match', 'Exclude - EC4 (Non-interactive)'),
+    ('methodology_keywords', 'text', 'missing', 'Exclude - EC6 (No methodology)'),
+)
+EXCLUDE_LABEL_PREFIX = 'Exclude'  # pipeline.split_classified 배제 판별 기준
+DEFAULT_PROFILE_NAME = 'live_streaming'
+# 키워드 매칭 방식 (token: TI/AB/DE/ID를 normalize 모듈로 토큰화/어간 추출한 뒤 단어 경계로 매칭, DT는 항상 부분 문자열)
+MATCHING_MODES = {'substring': '부분 문자열', 'token': '토큰 정규화 (단어 경계 + 어간)'}
+RULE_SET_CACHE_ENTRIES = 8
+
+# --- 분류 규칙 프로필 ---
+def make_rule_profile(rules, labels=None, exclude_labels=None, title=None, matching='substring'):
+    """규칙 dict(CLASSIFICATION_RULES 형식) + 라벨로 정규화된 프로필 생성
+
+    빠진 규칙 키는 빈 목록(해당 단계 생략), 빠진 라벨은 차원 이름 / EXCLUSION_STEPS 기본 라벨 사용
+    matching: 키워드 매칭 방식 (MATCHING_MODES)
+    Raises:
+        ValueError: 키워드 목록 형식 오류, 알 수 없는 매칭 방식 / 규칙 키 / 배제 라벨 키, 배제 라벨이 'Exclude'로 시작하지 않거나
+                    포함 라벨이 'Exclude'로 시작하는 경우
+    """
+    if matching not in MATCHING_MODES:
+        raise ValueError(f"알 수 없는 매칭 방식입니다: {matching} (사용 가능: {', '.join(MATCHING_MODES)})")
+    # 철자가 틀린 규칙 키는 조용히 빠지면 해당 배제 단계가 생략되므로 거부
+    step_names = [step for step, _, _, _ in EXCLUSION_STEPS]
+    unknown_rules = sorted(set(rules) - set(step_names) - {'dimension_keywords'})
+    if unknown_rules:
+        raise ValueError(f"알 수 없는 규칙 키입니다: {', '.join(unknown_rules)} "
+                         f"(사용 가능: {', '.join(step_names + ['dimension_keywords'])})")
+    unknown_labels = sorted(set(exclude_labels or {}) - set(step_names))
+    if unknown_labels:
+        raise ValueError(f"알 수 없는 배제 라벨 키입니다: {', '.join(unknown_labels)} (사용 가능: {', '.join(step_names)})")
+
+    def keyword_tuple(key, keywords):
+        if isinstance(keywords, str) or not all(isinstance(keyword, str) for keyword in keywords):
+            raise ValueError(f"'{key}'는 문자열 목록이어야 합니다")
+        return tuple(keyword.lower() for keyword in keywords if keyword.strip())
+
+    dimensions = {
+        dimension: keyword_tuple(dimension, keywords)
+        for dimension, keywords in dict(rules.get('dimension_keywords') or {}).items()
+    }
+    labels = dict(labels or {})
+    include_labels = {name: str(labels.get(name, name)) for name in list(dimensions) + ['Multidisciplinary', 'etc']}
+    exclude_labels = dict(exclude_labels or {})
+    step_labels = {step: str(exclude_labels.get(step, default)) for step, _, _, default in EXCLUSION_STEPS}
+    for label in step_labels.values():
+        if not label.startswith(EXCLUDE_LABEL_PREFIX):
+            raise ValueError(f"배제 라벨은 '{EXCLUDE_LABEL_PREFIX}'로 시작해야 합니다: {label}")
+    for label in include_labels.values():
+        if label.startswith(EXCLUDE_LABEL_PREFIX):
+            raise ValueError(f"포함 라벨은 '{EXCLUDE_LABEL_PREFIX}'로 시작할 수 없습니다: {label}")
+    return {
+        'title': title,
+        'rules': {step: keyword_tuple(step, rules.get(step) or ()) for step, _, _, _ in EXCLUSION_STEPS},
+        'dimensions': dimensions,
+        'labels': include_labels,
+        'exclude_labels': step_labels,
+        'matching': matching,
+    }
+
+def with_matching(profile, matching):
+    """매칭 방식만 바꾼 프로필 (규칙 키도 달라져 분류 결과 캐시가 구분됨)"""
+    if matching not in MATCHING_MODES:
+        raise ValueError(f"알 수 없는 매칭 방식입니다: {matching} (사용 가능: {', '.join(MATCHING_MODES)})")
+    return dict(profile, matching=matching)
+
+def rule_profile_key(profile):
+    """프로필 규칙/라벨 기준 해시 (분류 기준이 바뀌면 캐시된 분류 결과도 무효화, 제목은 제외)"""
+    criteria = {key: value for key, value in profile.items() if key != 'title'}
+    return hashlib.sha256(repr(sorted(criteria.items())).encode('utf-8')).hexdigest()
+
+BUILTIN_RULE_PROFILE = make_rule_profile(CLASSIFICATION_RULES, CLASSIFICATION_LABELS, title='라이브 스트리밍 (기본)')
+
+# 분류 기준이 바뀌면 캐시된 결과도 무효화되도록 기준 자체를 해시
+CLASSIFIER_CONFIG_KEY = rule_profile_key(BUILTIN_RULE_PROFILE)
+
+# --- 키워드 패턴 컴파일 ---
+def compile_keyword_pattern(keywords):
+    """키워드 목록을 하나의 부분 문자열 매칭 정규식(alternation)으로 컴파일"""
+    return re.compile('|'.join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True)))
+
+def compile_token_pattern(keywords):
+    """키워드 목록을 정규화 텍스트용 정규식으로 컴파일 (' 어간 ' 단위 매칭, 정규화 후 남는 키워드가 없으면 일치 없음)"""
+    normalized = normalize_keywords(keywords)
+    return compile_keyword_pattern(normalized) if normalized else re.compile(re.escape('\n'))
+
+def _lowercase_text_column(df, field):
+    """필드 컬럼을 소문자/공백 제거 문자열로 변환 (결측은 빈 문자열)"""
+    if field not in df.columns:
+        return pd.Series('', index=df.index, dtype='string[pyarrow]')
+    # pyarrow 문자열 컬럼으로 변환하여 lower/strip/정규식 매칭을 Arrow(RE2) 커널에서 일괄 수행
+    column = df[field]
+    column = column.astype(str).where(column.notna(), '').astype('string[pyarrow]')
+    return column.str.lower().str.strip()
+
+class CompiledRuleSet:
+    """여러 분류 규칙 프로필을 함께 평가하는 공유 매처
+
+    - 키워드 묶음별 정규식: 프로필 간 같은 묶음은 하나만 컴파일 (self.patterns)
+    - 평가: 배제 단계마다 모든 프로필의 미분류 행을 모아 키워드 묶음별로 한 번만 매칭 (Arrow RE2 커널)
+    - 토큰 매칭 프로필: normalize 모듈의 정규화 컬럼(내용 기준 캐시)에 대해 매칭
+    """
+
+    def __init__(self, profiles):
+        self.profiles = dict(profiles)
+        self.key = rule_set_key(self.profiles)
+        self.patterns = {}  # (텍스트 종류, 키워드 묶음) → 정규식 문자열
+        for profile in self.profiles.values():
+            families = [(kind, profile['rules'][step]) for step, kind, _, _ in EXCLUSION_STEPS]
+            families += [('text', keywords) for keywords in profile['dimensions'].values()]
+            for kind, keywords in families:
+                kind = self.text_kind(profile, kind)
+                if keywords and (kind, keywords) not in self.patterns:
+                    compile_pattern = compile_token_pattern if kind == 'tokens' else compile_keyword_pattern
+                    self.patterns[(kind, keywords)] = compile_pattern(keywords).pattern
+
+    @staticmethod
+    def text_kind(profile, kind):
+        """프로필이 검사할 텍스트 종류 ('text' | 'type' | 'tokens': 정규화한 TI/AB/DE/ID)"""
+        return 'tokens' if kind == 'text' and profile.get('matching') == 'token' else kind
+
+    def classify(self, df, names=None):
+        """프로필별 분류 라벨 (컬럼 = 프로필 이름, 인덱스 = df.index)"""
+        names = list(self.profiles) if names is None else list(names)
+        record_count = len(df)
+        texts = {}
+        matches = {}  # (텍스트 종류, 키워드 묶음) → (평가한 행, 일치한 행)
+
+        def text(kind):
+            if kind not in texts:
+                if kind == 'type':
+                    texts[kind] = _lowercase_text_column(df, 'DT')
+                elif kind == 'tokens':
+                    # 필드 사이는 구분자 토큰으로 이어 키워드 구문이 필드 경계에 걸쳐 일치하지 않게 함
+                    normalized = normalized_text_frame(df, NORMALIZED_FIELDS)
+                    texts[kind] = (
+                        normalized['TI'] + TOKEN_SEPARATOR + normalized['AB'] + TOKEN_SEPARATOR +
+                        normalized['DE'] + TOKEN_SEPARATOR + normalized['ID']
+                    )
+                else:
+                    texts[kind] = (
+                        _lowercase_text_column(df, 'TI') + ' ' + _lowercase_text_column(df, 'AB') + ' ' +
+                        _lowercase_text_column(df, 'DE') + ' ' + _lowercase_text_column(df, 'ID')
+                    )
+            return texts[kind]
+
+        def contains(kind, keywords, rows):
+            # 아직 평가하지 않은 행만 매칭 (앞 단계에서 모든 프로필이 배제한 행은 다시 스캔하지 않음)
+            evaluated, matched = matches.setdefault(
+                (kind, keywords), (np.zeros(record_count, dtype=bool), np.zeros(record_count, dtype=bool))
+            )
+            pending = rows & ~evaluated
+            if pending.any():
+                subset = text(kind) if pending.all() else text(kind)[pending]
+                matched[pending] = subset.str.contains(self.patterns[(kind, keywords)], regex=True).to_numpy(dtype=bool, na_value=False)
+                evaluated |= pending
+            return matched
+
+        def prefetch(requests):
+            # 같은 키워드 묶음을 쓰는 프로필들의 미분류 행을 합쳐 한 번에 매칭
+            merged = {}
+            for kind, keywords, rows in requests:
+                if keywords:
+                    merged[(kind, keywords)] = merged.get((kind, keywords), False) | rows
+            for (kind, keywords), rows in merged.items():
+                contains(kind, keywords, rows)
+
+        labels = {name: np.full(record_count, None, dtype=object) for name in names}
+        undecided = {name: np.ones(record_count, dtype=bool) for name in names}
+
+        # --- 1단계: 기초 필터링 (명백한 비관련 논문 배제) ---
+        for step, kind, condition, _ in EXCLUSION_STEPS:
+            prefetch([
+                (self.text_kind(self.profiles[name], kind), self.profiles[name]['rules'][step], undecided[name])
+                for name in names
+            ])
+            for name in names:
+                keywords = self.profiles[name]['rules'][step]
+                if not keywords:
+                    continue
+                matched = contains(self.text_kind(self.profiles[name], kind), keywords, undecided[name])
+                mask = matched if condition == 'match' else ~matched
+                labels[name][mask & undecided[name]] = self.profiles[name]['exclude_labels'][step]
+                undecided[name][mask] = False
+
+        # --- 2단계: 최종 분류 (포함된 논문들의 성격 규명, 둘 이상의 차원에 해당하면 다학제) ---
+        prefetch([
+            (self.text_kind(self.profiles[name], 'text'), keywords, undecided[name])
+            for name in names for keywords in self.profiles[name]['dimensions'].values()
+        ])
+        for name in names:
+            profile = self.profiles[name]
+            dimensions = [dimension for dimension, keywords in profile['dimensions'].items() if keywords]
+            text_kind = self.text_kind(profile, 'text')
+            dimension_hits = [contains(text_kind, profile['dimensions'][dimension], undecided[name]) for dimension in dimensions]
+            matched_count = np.sum(dimension_hits, axis=0) if dimension_hits else np.zeros(record_count, dtype=int)
+            first_dimension = np.select(
+                dimension_hits,
+                [profile['labels'][dimension] for dimension in dimensions],
+                default=profile['labels']['etc']
+            ) if dimension_hits else np.full(record_count, profile['labels']['etc'], dtype=object)
+            labels[name][undecided[name]] = np.where(
+                matched_count > 1, profile['labels']['Multidisciplinary'], first_dimension
+            )[undecided[name]]
+
+        return pd.DataFrame({name: labels[name] for name in names}, index=df.index, dtype=object)
+
+def rule_set_key(profiles):
+    return hashlib.sha256(repr([(name, rule_profile_key(profile)) for name, profile in profiles.items()]).encode('utf-8')).hexdigest()
+
+_compiled_rule_sets = {}  # 프로필 묶음 키 → CompiledRuleSet (최근 RULE_SET_CACHE_ENTRIES개)
+
+def compile_rule_profiles(profiles):
+    """프로필 묶음 {이름: 프로필}을 공유 매처로 컴파일 (같은 규칙이면 이전 컴파일 결과 재사용)"""
+    key = rule_set_key(profiles)
+    rule_set = _compiled_rule_sets.pop(key, None)
+    if rule_set is None:
+        rule_set = CompiledRuleSet(profiles)
+    _compiled_rule_sets[key] = rule_set
+    while len(_compiled_rule_sets) > RULE_SET_CACHE_ENTRIES:
+        _compiled_rule_sets.pop(next(iter(_compiled_rule_sets)))
+    return rule_set
+
+def profile_classifier(profile, name=DEFAULT_PROFILE_NAME):
+    """프로필 하나로 분류하는 (분류 함수, 분류 기준 키) - StagedWosPipeline.run / stream_merge_wos_files용"""
+    def classify(df):
+        return compile_rule_profiles({name: profile}).classify(df)[name]
+    return classify, rule_profile_key(profile)
+
+def summarize_profile_labels(labels):
+    """프로필별 분류 결과 요약 {프로필: {'included', 'excluded', 'counts': {라벨: 편수 (많은 순)}}}"""
+    summary = {}
+    for name in labels.columns:
+        counts = labels[name].value_counts()
+        excluded = int(counts[counts.index.str.startswith(EXCLUDE_LABEL_PREFIX)].sum())
+        summary[name] = {
+            'included': int(counts.sum()) - excluded,
+            'excluded': excluded,
+            'counts': {label: int(count) for label, count in counts.items()},
+        }
+    return summary
+
+# --- 논문 분류 함수 (연구 목표에 맞게 재설계) ---
+def classify_articles(df):
+    """
+    연구 목표(생태계 분석)에 맞춰, 광범위한 관련 연구를 수집하되 명백한 비관련 연구를 배제하는 함수
+    - 기본 프로필(CLASSIFICATION_RULES)로 분류, 행 단위 apply 대신 컬럼 단위로 전체 Series를 한 번에 분류
+    """
+    return compile_rule_profiles({DEFAULT_PROFILE_NAME: BUILTIN_RULE_PROFILE}).classify(df)[DEFAULT_PROFILE_NAME]
+
+def classify_article(row):
+    """단일 레코드(Series/dict) 분류 - classify_articles와 동일 기준"""
+    return classify_articles(pd.DataFrame([dict(row)])).iloc[0]
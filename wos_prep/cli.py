@@ -0,0 +1,281 @@
+"""WOS PREP 배치 실행 CLI (Streamlit 없이 병합/정제/내보내기)
+
+사용 예:
+    python -m wos_prep exports/ -o out/
+    python -m wos_prep "exports/**/*.txt" -o out/ --tables csv --near-duplicates auto
+    python -m wos_prep exports.zip savedrecs_01.txt.gz -o out/
+    python -m wos_prep exports/ -o out/ --streaming --tables csv
+    python -m wos_prep exports/ -o out/ --rules rule_profiles.toml --profile virtual_influencer
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+
+from wos_prep.merge import NEAR_DUP_MODES, NEAR_DUP_DEFAULT_THRESHOLD
+from wos_prep.classify import DEFAULT_PROFILE_NAME, profile_classifier, with_matching
+from wos_prep.diagnostics import diagnose_merged_quality, diagnose_quality_counts
+from wos_prep.export import write_scimat_wos_file, write_scimat_wos_zip, write_excel_workbook
+from wos_prep.parser import LAZY_FIELD_TAGS
+from wos_prep.pipeline import run_pipeline, split_classified
+from wos_prep.rules import RULES_FILE_ENV, load_rule_profiles
+from wos_prep.sources import find_wos_inputs, open_wos_sources
+from wos_prep.streaming import stream_merge_wos_files
+from wos_prep.profiling import PipelineProfile, memory_tracing_requested, start_memory_tracing
+
+# --- 입력 파일 수집 ---
+def collect_input_paths(inputs, pattern='*.txt', recursive=False):
+    """디렉터리/글롭/파일 경로 목록을 중복 없이 정렬된 파일 경로 목록으로 변환 (디렉터리는 .zip/.gz 압축 파일 포함)"""
+    paths = []
+    for source in inputs:
+        if os.path.isdir(source):
+            found = find_wos_inputs(source, pattern, recursive)
+        elif glob.has_magic(source):
+            found = glob.glob(source, recursive=True)
+        else:
+            found = [source]
+        paths.extend(sorted(path for path in found if os.path.isfile(path)))
+
+    # 같은 파일이 여러 입력에 걸쳐 지정된 경우 처음 위치만 유지
+    seen = set()
+    unique_paths = []
+    for path in paths:
+        real_path = os.path.realpath(path)
+        if real_path not in seen:
+            seen.add(real_path)
+            unique_paths.append(path)
+    return unique_paths
+
+# --- 결과 파일 기록 ---
+def table_paths(output_dir, stem, table_format):
+    """테이블 형식(xlsx/csv/both/none)에 따른 결과 파일 경로 목록"""
+    formats = {'xlsx': ['xlsx'], 'csv': ['csv'], 'both': ['xlsx', 'csv']}.get(table_format, [])
+    return [os.path.join(output_dir, f"{stem}.{extension}") for extension in formats]
+
+def write_table(df, output_dir, stem, sheet_name, table_format):
+    """분석 대상/배제 테이블을 xlsx/csv로 기록하고 생성된 경로 목록 반환"""
+    written = table_paths(output_dir, stem, table_format)
+    for path in written:
+        if path.endswith('.xlsx'):
+            write_excel_workbook(df, path, sheet_name)
+        else:
+            df.to_csv(path, index=False, encoding='utf-8-sig')
+    return written
+
+def build_parser():
+    """CLI 인자 파서 생성"""
+    parser = argparse.ArgumentParser(
+        prog='python -m wos_prep',
+        description='WOS Plain Text 파일을 병합/정제하여 SCIMAT 파일, 엑셀/CSV, JSON 요약을 생성'
+    )
+    parser.add_argument('inputs', nargs='+', help='WOS .txt 파일, .zip/.gz 압축 파일, 디렉터리 또는 글롭 패턴')
+    parser.add_argument('-o', '--output-dir', required=True, help='결과 파일 저장 디렉터리')
+    parser.add_argument('--pattern', default='*.txt', help='디렉터리 입력 / .zip 멤버의 파일 패턴 (기본: *.txt)')
+    parser.add_argument('-r', '--recursive', action='store_true', help='디렉터리 입력 시 하위 디렉터리 포함')
+    parser.add_argument('--near-duplicates', choices=list(NEAR_DUP_MODES), default='off',
+                        help='유사 중복 탐지 모드 (기본: off)')
+    parser.add_argument('--near-duplicate-threshold', type=float, default=NEAR_DUP_DEFAULT_THRESHOLD,
+                        help=f'유사 중복 자동 병합 임계값 (기본: {NEAR_DUP_DEFAULT_THRESHOLD})')
+    parser.add_argument('--tables', choices=['xlsx', 'csv', 'both', 'none'], default='xlsx',
+                        help='분석 대상/배제 논문 테이블 형식 (기본: xlsx)')
+    parser.add_argument('--records-per-part', type=int, default=0,
+                        help='0보다 크면 SCIMAT 파일을 이 편수 단위로 분할한 ZIP도 생성')
+    parser.add_argument('--lazy-fields', action='store_true',
+                        help=f"{'/'.join(LAZY_FIELD_TAGS)} 필드를 디코딩하지 않고 원본 줄로 보관 (SCIMAT 파일에 원본 줄 그대로 기록)")
+    parser.add_argument('--streaming', action='store_true',
+                        help='병합 결과를 메모리에 두지 않고 파일별로 중복 제거/분류하여 바로 기록 (대용량 입력용, '
+                             '유사 중복 탐지/분할 ZIP 미지원)')
+    parser.add_argument('--rules', default=None,
+                        help=f'분류 규칙 프로필 TOML 설정 파일 (기본: 환경 변수 {RULES_FILE_ENV}, 없으면 기본 규칙만)')
+    parser.add_argument('--profile', default=DEFAULT_PROFILE_NAME,
+                        help=f'분류에 사용할 규칙 프로필 이름 (기본: {DEFAULT_PROFILE_NAME})')
+    parser.add_argument('--token-matching', action='store_true',
+                        help='키워드를 부분 문자열 대신 토큰 정규화(nltk 어간 추출, 악센트 제거) 후 단어 경계로 매칭')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='단계별 최대 할당량(tracemalloc)을 요약에 기록 (처리 시간이 몇 배 늘어남)')
+    parser.add_argument('--prefix', default='live_streaming_refined', help='결과 파일 이름 접두어')
+    parser.add_argument('-q', '--quiet', action='store_true', help='진행 메시지 출력 안 함')
+    return parser
+
+def main(argv=None):
+    """배치 실행 (종료 코드 반환: 0 성공, 1 처리 가능한 파일 없음)"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.streaming and (args.near_duplicates != 'off' or args.records_per_part > 0):
+        parser.error('--streaming은 --near-duplicates off, --records-per-part 0에서만 사용할 수 있습니다')
+    try:
+        rule_profiles = load_rule_profiles(args.rules)
+    except (OSError, ValueError, ImportError) as e:
+        parser.error(f'분류 규칙 설정 파일을 읽을 수 없습니다: {e}')
+    if args.profile not in rule_profiles:
+        parser.error(f"규칙 프로필 '{args.profile}'이 없습니다 (사용 가능: {', '.join(rule_profiles)})")
+    rule_profile = rule_profiles[args.profile]
+    if args.token_matching:
+        rule_profile = with_matching(rule_profile, 'token')
+    classifier, classifier_key = profile_classifier(rule_profile, args.profile)
+    if args.trace_memory or memory_tracing_requested():
+        start_memory_tracing()
+    log = (lambda message: None) if args.quiet else (lambda message: print(message, file=sys.stderr))
+    started = time.perf_counter()
+
+    # .zip은 멤버별로 펼치고, 모든 파일은 파싱할 때 파일별로 스트림으로 읽음
+    sources = open_wos_sources(collect_input_paths(args.inputs, args.pattern, args.recursive), args.pattern)
+    if not sources:
+        log("❌ 입력 파일이 없습니다.")
+        return 1
+    log(f"📋 {len(sources)}개 파일 처리 중...")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    if args.streaming:
+        return _main_streaming(args, sources, log, started, classifier, classifier_key, rule_profile['matching'])
+
+    matching = rule_profile['matching']
+    profile = PipelineProfile()
+    merged_df, file_status, duplicates_removed, dedup_report = run_pipeline(
+        sources, args.near_duplicates, args.near_duplicate_threshold, profile,
+        LAZY_FIELD_TAGS if args.lazy_fields else None, classifier
+    )
+
+    summary = {
+        'inputs': len(sources),
+        'rule_profile': args.profile,
+        'rule_matching': matching,
+        'classifier_config_key': classifier_key,
+        'near_duplicate_mode': args.near_duplicates,
+        'near_duplicate_threshold': args.near_duplicate_threshold,
+        'lazy_fields': args.lazy_fields,
+        'streaming': False,
+        'files': file_status,
+        'outputs': [],
+        'stages': profile.stages,
+    }
+
+    if merged_df is None:
+        log("❌ 처리 가능한 WOS Plain Text 파일이 없습니다.")
+        summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        _write_summary(summary, args.output_dir)
+        return 1
+
+    df_for_analysis, df_excluded = split_classified(merged_df)
+    df_final_output = df_for_analysis.drop_columns(['Classification'])
+    successful_files = len([s for s in file_status if s['status'] == 'SUCCESS'])
+    # 앱과 같이 분석 대상 논문 기준으로 진단
+    with profile.stage('diagnose', records=len(df_for_analysis)):
+        issues, recommendations = diagnose_merged_quality(df_for_analysis, successful_files, duplicates_removed)
+
+    # SCIMAT 파일 (+ 선택 시 분할 ZIP)
+    outputs = summary['outputs']
+    scimat_path = os.path.join(args.output_dir, f"{args.prefix}_for_scimat.txt")
+    with profile.stage('scimat_build', records=len(df_final_output)):
+        write_scimat_wos_file(df_final_output, scimat_path)
+    outputs.append(scimat_path)
+    if args.records_per_part > 0:
+        zip_path = os.path.join(args.output_dir, f"{args.prefix}_for_scimat_parts.zip")
+        with profile.stage('scimat_zip_build', records=len(df_final_output), records_per_part=args.records_per_part):
+            write_scimat_wos_zip(df_final_output, zip_path, args.records_per_part)
+        outputs.append(zip_path)
+
+    # 분석 대상 / 배제 논문 테이블
+    if args.tables != 'none':
+        with profile.stage('table_build', records=len(merged_df), format=args.tables):
+            outputs.extend(write_table(df_final_output, args.output_dir, f"{args.prefix}_included",
+                                       'WOS_RawData_Included', args.tables))
+            outputs.extend(write_table(df_excluded, args.output_dir, f"{args.prefix}_excluded",
+                                       'Excluded_Papers', args.tables))
+
+    near_duplicates = dedup_report['near_duplicates']
+    if near_duplicates is not None and len(near_duplicates) > 0:
+        near_path = os.path.join(args.output_dir, f"{args.prefix}_near_duplicate_candidates.csv")
+        near_duplicates.to_csv(near_path, index=False, encoding='utf-8-sig')
+        outputs.append(near_path)
+
+    summary.update({
+        'successful_files': successful_files,
+        'papers_merged': len(merged_df),
+        'duplicates_removed': duplicates_removed,
+        'dedup_counts': dedup_report['counts'],
+        'near_duplicate_candidates': 0 if near_duplicates is None else len(near_duplicates),
+        'papers_included': len(df_final_output),
+        'papers_excluded': len(df_excluded),
+        'classification_counts': merged_df['Classification'].value_counts().to_dict(),
+        'issues': issues,
+        'recommendations': recommendations,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'stages': profile.to_records(),
+    })
+    _write_summary(summary, args.output_dir)
+
+    log(f"✅ {successful_files}/{len(sources)}개 파일 → 분석 대상 {len(df_final_output):,}편, "
+        f"배제 {len(df_excluded):,}편, 중복 제거 {duplicates_removed:,}편 ({summary['elapsed_seconds']}초)")
+    return 0
+
+def _main_streaming(args, sources, log, started, classifier, classifier_key, matching):
+    """--streaming: 파일별로 중복 제거/분류하여 SCIMAT 파일과 테이블에 바로 기록 (병합 DataFrame 없음)"""
+    scimat_path = os.path.join(args.output_dir, f"{args.prefix}_for_scimat.txt")
+    table_targets = (
+        [('included', path, 'WOS_RawData_Included')
+         for path in table_paths(args.output_dir, f"{args.prefix}_included", args.tables)] +
+        [('excluded', path, 'Excluded_Papers')
+         for path in table_paths(args.output_dir, f"{args.prefix}_excluded", args.tables)]
+    )
+    progress = None if args.quiet else (
+        lambda done, total, status: log(f"  [{done}/{total}] {status['filename']}: {status['message']}")
+    )
+
+    profile = PipelineProfile()
+    file_status, totals = stream_merge_wos_files(
+        sources, scimat_path, table_targets, LAZY_FIELD_TAGS if args.lazy_fields else None, profile,
+        classifier=classifier, progress=progress
+    )
+    successful_files = len([s for s in file_status if s['status'] == 'SUCCESS'])
+    summary = {
+        'inputs': len(sources),
+        'rule_profile': args.profile,
+        'rule_matching': matching,
+        'classifier_config_key': classifier_key,
+        'near_duplicate_mode': 'off',
+        'near_duplicate_threshold': args.near_duplicate_threshold,
+        'lazy_fields': args.lazy_fields,
+        'streaming': True,
+        'files': file_status,
+        'outputs': [scimat_path] + [path for _, path, _ in table_targets],
+    }
+    if totals['papers_merged'] == 0:
+        log("❌ 처리 가능한 WOS Plain Text 파일이 없습니다.")
+        summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        summary['stages'] = profile.to_records()
+        _write_summary(summary, args.output_dir)
+        return 1
+
+    issues, recommendations = diagnose_quality_counts(
+        totals['quality_counts']['included'], successful_files, totals['duplicates_removed']
+    )
+    summary.update({
+        'successful_files': successful_files,
+        'papers_merged': totals['papers_merged'],
+        'duplicates_removed': totals['duplicates_removed'],
+        'dedup_counts': totals['dedup_counts'],
+        'near_duplicate_candidates': 0,
+        'papers_included': totals['included'],
+        'papers_excluded': totals['excluded'],
+        'classification_counts': totals['classification_counts'],
+        'issues': issues,
+        'recommendations': recommendations,
+        'elapsed_seconds': round(time.perf_counter() - started, 3),
+        'stages': profile.to_records(),
+    })
+    _write_summary(summary, args.output_dir)
+
+    log(f"✅ {successful_files}/{len(sources)}개 파일 → 분석 대상 {totals['included']:,}편, "
+        f"배제 {totals['excluded']:,}편, 중복 제거 {totals['duplicates_removed']:,}편 ({summary['elapsed_seconds']}초, 스트리밍)")
+    return 0
+
+def _write_summary(summary, output_dir):
+    """실행 요약을 run_summary.json으로 기록"""
+    with open(os.path.join(output_dir, 'run_summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, default=str)
+
+if __name__ == '__main__':
+    sys.exit(main())
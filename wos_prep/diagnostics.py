@@ -0,0 +1,80 @@
+"""병합 데이터 품질 진단"""
+
+# --- 데이터 품질 진단 함수 ---
+QUALITY_REQUIRED_FIELDS = ['TI', 'AU', 'SO', 'PY']
+QUALITY_KEYWORD_FIELDS = ['DE', 'ID']
+
+def count_quality_fields(df):
+    """품질 진단에 쓰는 필드별 건수 (스트리밍 병합은 파일별로 계산해 merge_quality_counts로 합산)
+
+    Returns:
+        {'records': 레코드 수, 'present': {필수 필드: 값 있는 수}, 'keywords': {키워드 필드: 유효 값 수}}
+        - 컬럼이 없는 필드는 dict에 없음
+    """
+    counts = {'records': len(df), 'present': {}, 'keywords': {}}
+    for field in QUALITY_REQUIRED_FIELDS:
+        if field in df.columns:
+            counts['present'][field] = int(df[field].notna().sum())
+    for field in QUALITY_KEYWORD_FIELDS:
+        if field in df.columns:
+            values = df[field]
+            counts['keywords'][field] = int((values.notna() & (values != '') & (values != 'nan')).sum())
+    return counts
+
+def merge_quality_counts(total, counts):
+    """count_quality_fields 결과 두 개를 합산 (total이 None이면 counts 복사)"""
+    if total is None:
+        return {'records': counts['records'], 'present': dict(counts['present']), 'keywords': dict(counts['keywords'])}
+    total['records'] += counts['records']
+    for group in ('present', 'keywords'):
+        for field, count in counts[group].items():
+            total[group][field] = total[group].get(field, 0) + count
+    return total
+
+def diagnose_quality_counts(counts, file_count, duplicates_removed):
+    """필드별 건수(count_quality_fields 형식)로 품질 진단"""
+    issues = []
+    recommendations = []
+    total_count = counts['records']
+    
+    # 필수 필드 확인
+    for field in QUALITY_REQUIRED_FIELDS:
+        if field not in counts['present']:
+            issues.append(f"❌ 필수 필드 누락: {field}")
+        elif total_count > 0:
+            valid_count = counts['present'][field]
+            missing_rate = (total_count - valid_count) / total_count * 100
+            
+            if missing_rate > 10:
+                issues.append(f"⚠️ {field} 필드의 {missing_rate:.1f}%가 누락됨")
+    
+    # 키워드 필드 품질 확인
+    has_keywords = False
+    for field in QUALITY_KEYWORD_FIELDS:
+        if field in counts['keywords']:
+            has_keywords = True
+            valid_count = counts['keywords'][field]
+            
+            if total_count > 0 and valid_count < total_count * 0.7:
+                missing_rate = ((total_count - valid_count) / total_count * 100)
+                issues.append(f"⚠️ {field} 필드의 {missing_rate:.1f}%가 비어있음")
+    
+    if not has_keywords:
+        issues.append("❌ 키워드 필드 없음: DE 또는 ID 필드 필요")
+    
+    # 병합 관련 정보 - 실제 결과만 반영 (완전 수정)
+    recommendations.append(f"✅ {file_count}개 파일 성공적으로 병합됨")
+    
+    # 중복 제거 결과만 실제 데이터에 따라 표시
+    if duplicates_removed > 0:
+        recommendations.append(f"🔄 중복 논문 {duplicates_removed}편 자동 제거됨")
+    else:
+        recommendations.append("✅ 중복 논문 없음 - 모든 논문이 고유 데이터")
+    
+    recommendations.append("✅ WOS Plain Text 형식 - SCIMAT 최적 호환성 확보")
+    
+    return issues, recommendations
+
+def diagnose_merged_quality(df, file_count, duplicates_removed):
+    """병합된 WOS 데이터의 품질 진단 - 수정된 버전"""
+    return diagnose_quality_counts(count_quality_fields(df), file_count, duplicates_removed)
@@ -0,0 +1,184 @@
+"""파싱/분류 결과 디스크 캐시 (Arrow IPC 파일을 메모리 맵으로 로딩, 전체 크기 상한 + LRU 제거)
+
+앱을 다시 열어 같은 파일을 올리면 텍스트 파싱/분류 없이 캐시 파일을 메모리 맵으로 읽어 바로 사용
+    parsed      파일 내용 해시 + 지연 필드 태그 → 파일별 파싱 결과 + 중복 키
+    classified  분류 단계 키 → 분류 라벨 컬럼 (병합 결과는 parsed 항목에서 다시 만들므로 라벨만 보관)
+키에는 파서 버전(parser.WOS_PARSER_VERSION)과 캐시 형식 버전이 포함되어, 버전이 바뀌면 이전 항목은 쓰이지 않고 LRU로 제거됨
+설정: 환경 변수 WOS_PREP_CACHE_DIR (저장 위치), WOS_PREP_CACHE_MAX_MB (상한, 0이면 사용 안 함)
+"""
+import os
+import json
+import time
+import hashlib
+import importlib.util
+
+from wos_prep.parser import WOS_PARSER_VERSION
+
+DISK_CACHE_DIR_ENV = 'WOS_PREP_CACHE_DIR'
+DISK_CACHE_MAX_MB_ENV = 'WOS_PREP_CACHE_MAX_MB'
+DISK_CACHE_DEFAULT_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'wos_prep')
+DISK_CACHE_DEFAULT_MAX_MB = 2048
+DISK_CACHE_FORMAT_VERSION = 1  # 저장 컬럼/메타데이터 형식 또는 중복 키 규칙이 바뀌면 올림
+DISK_CACHE_SUFFIX = '.arrow'
+DISK_CACHE_KEYS_COLUMN = '__dedup_key'  # parsed 항목에 함께 저장하는 중복 키 컬럼
+_METADATA_KEY = b'wos_prep'
+
+def _zero_copy_types_mapper(data_type):
+    """to_pandas types_mapper: 문자열/바이너리 컬럼은 Arrow 배열을 그대로 쓰는 dtype (나머지는 기본 변환)
+
+    문자열은 pandas 기본 문자열 dtype이 Arrow 기반이면(pandas 3) 그 dtype, 아니면 'string[pyarrow]'
+    (pandas 2 기본 변환은 object 배열로 전체를 복사)
+    """
+    import pyarrow as pa
+    import pandas as pd
+
+    if pa.types.is_string(data_type) or pa.types.is_large_string(data_type):
+        string_dtype = pd.Series(dtype=str).dtype
+        return string_dtype if isinstance(string_dtype, pd.StringDtype) else pd.StringDtype('pyarrow')
+    if pa.types.is_binary(data_type) or pa.types.is_large_binary(data_type):
+        return pd.ArrowDtype(data_type)
+    return None
+
+class CorpusDiskCache:
+    """키 → (DataFrame, 메타데이터 dict)를 Arrow IPC 파일 하나씩으로 보관하는 디스크 캐시
+
+    - 읽기: 메모리 맵 (문자열/바이너리 컬럼은 Arrow 기반 dtype으로 파일 내용을 복사하지 않고 참조,
+      숫자/범주형 컬럼만 pandas 배열로 복사 - 보통 전체 크기의 1~2%)
+    - 쓰기: 임시 파일에 기록한 뒤 교체 (동시에 읽는 세션이 깨진 파일을 보지 않음)
+    - LRU: 읽을 때마다 파일 수정 시각을 갱신하고, 상한을 넘으면 오래된 파일부터 삭제
+    pyarrow가 없거나 상한이 0이면 enabled=False (모든 조회가 미적중)
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get(DISK_CACHE_DIR_ENV) or DISK_CACHE_DEFAULT_DIR
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get(DISK_CACHE_MAX_MB_ENV, DISK_CACHE_DEFAULT_MAX_MB)) * 1024 * 1024)
+        if importlib.util.find_spec('pyarrow') is None:
+            max_bytes = 0
+        self.max_bytes = max_bytes
+        self.enabled = self.max_bytes > 0
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    # --- 키 ---
+    @staticmethod
+    def entry_key(kind, *parts):
+        """항목 종류 + 키 구성 요소 + 파서/캐시 형식 버전으로 파일 이름용 키 생성"""
+        payload = repr((kind, WOS_PARSER_VERSION, DISK_CACHE_FORMAT_VERSION) + parts)
+        return f"{kind}-{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + DISK_CACHE_SUFFIX)
+
+    # --- 읽기 / 쓰기 ---
+    def load(self, key):
+        """보관된 (DataFrame, 메타데이터)를 메모리 맵으로 읽어 반환 (없거나 읽을 수 없으면 None)"""
+        if not self.enabled:
+            return None
+        import pyarrow as pa
+
+        path = self._path(key)
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+            metadata = json.loads(table.schema.metadata[_METADATA_KEY])
+            df = table.to_pandas(types_mapper=_zero_copy_types_mapper, split_blocks=True)
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            self.stats['misses'] += 1
+            return None
+        try:
+            os.utime(path)  # LRU 순서 갱신
+        except OSError:
+            pass
+        self.stats['hits'] += 1
+        return df, metadata
+
+    def store(self, key, df, metadata=None):
+        """DataFrame + 메타데이터(JSON 직렬화 가능 dict)를 기록하고 상한을 넘으면 오래된 항목 제거 (기록 바이트 수 반환)"""
+        if not self.enabled:
+            return 0
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Arrow로 변환할 수 없는 컬럼(여러 타입이 섞인 object 등)이 있으면 보관하지 않음
+            return 0
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            _METADATA_KEY: json.dumps(metadata or {}, ensure_ascii=False, default=str).encode('utf-8'),
+        })
+        path = self._path(key)
+        temporary_path = f"{path}.{os.getpid()}.{time.monotonic_ns()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with pa.OSFile(temporary_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(temporary_path, path)
+        except OSError:
+            # 디스크 공간 부족/권한 문제 등은 캐시 미사용으로 처리
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            return 0
+        self.stats['writes'] += 1
+        self.evict()
+        return os.path.getsize(path)
+
+    # --- 파일별 파싱 결과 ---
+    def load_parsed_file(self, file_hash, lazy_tags=None):
+        """파일별 파싱 결과 조회 → (처리 상태 dict, DataFrame, 중복 키 Series) 또는 None"""
+        loaded = self.load(self.entry_key('parsed', file_hash, tuple(lazy_tags or ())))
+        if loaded is None:
+            return None
+        frame, status = loaded
+        return status, frame.drop(columns=[DISK_CACHE_KEYS_COLUMN]), frame[DISK_CACHE_KEYS_COLUMN]
+
+    def store_parsed_file(self, file_hash, lazy_tags, status, frame, keys):
+        """파일별 파싱 결과 + 중복 키 보관 (처리 상태는 메타데이터로)"""
+        return self.store(self.entry_key('parsed', file_hash, tuple(lazy_tags or ())),
+                          frame.assign(**{DISK_CACHE_KEYS_COLUMN: keys.to_numpy()}), status)
+
+    # --- 크기 관리 ---
+    def entries(self):
+        """보관된 항목 목록 (최근 사용 순) [{'key', 'bytes', 'last_used'}]"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(DISK_CACHE_SUFFIX)]
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append({'key': name[:-len(DISK_CACHE_SUFFIX)], 'bytes': stat.st_size, 'last_used': stat.st_mtime})
+        return sorted(entries, key=lambda entry: entry['last_used'], reverse=True)
+
+    def total_bytes(self):
+        return sum(entry['bytes'] for entry in self.entries())
+
+    def evict(self):
+        """전체 크기가 상한 이하가 될 때까지 오래 사용하지 않은 항목부터 삭제 (삭제 수 반환)"""
+        entries = self.entries()
+        total = sum(entry['bytes'] for entry in entries)
+        removed = 0
+        while entries and total > self.max_bytes:
+            entry = entries.pop()
+            try:
+                os.remove(self._path(entry['key']))
+            except OSError:
+                continue
+            total -= entry['bytes']
+            removed += 1
+        self.stats['evictions'] += removed
+        return removed
+
+    def purge(self):
+        """모든 항목 삭제 (삭제한 바이트 수 반환)"""
+        freed = 0
+        for entry in self.entries():
+            try:
+                os.remove(self._path(entry['key']))
+            except OSError:
+                continue
+            freed += entry['bytes']
+        return freed
@@ -0,0 +1,191 @@
+"""SCIMAT용 WOS Plain Text 및 엑셀 내보내기 (청크 단위 스트리밍)"""
+import os
+import codecs
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.views import as_record_view
+
+# --- WOS Plain Text 형식 변환 함수 ---
+SCIMAT_FIELD_ORDER = [
+    'PT', 'AU', 'AF', 'TI', 'SO', 'LA', 'DT', 'DE', 'ID', 'AB', 'C1', 'C3', 'RP',
+    'EM', 'RI', 'OI', 'FU', 'FX', 'CR', 'NR', 'TC', 'Z9', 'U1', 'U2', 'PU', 'PI', 'PA',
+    'SN', 'EI', 'J9', 'JI', 'PD', 'PY', 'VL', 'IS', 'BP', 'EP', 'DI', 'EA', 'PG',
+    'WC', 'WE', 'SC', 'GA', 'UT', 'PM', 'OA', 'DA'
+]
+SCIMAT_MULTI_LINE_FIELDS = {'AU', 'AF', 'DE', 'ID', 'C1', 'C3', 'CR'}
+SCIMAT_HEADER = "FN Clarivate Analytics Web of Science\nVR 1.0"
+SCIMAT_CHUNK_RECORDS = 1000
+SCIMAT_DEFAULT_PART_RECORDS = 5000
+
+def _scimat_field_lines(column, tag):
+    """청크 컬럼 하나를 레코드별 WOS 필드 라인 문자열로 변환 (비어 있는 셀은 None)"""
+    text = column.astype(str).where(column.notna(), '').str.strip()
+    # 비어 있지 않은 셀만 미리 걸러냄 (빈 문자열, 'nan' 제외)
+    valid = ((text != '') & (text.str.lower() != 'nan')).to_numpy(dtype=bool)
+    lines = [None] * len(text)
+    
+    # 셀 단위 규칙은 parser.format_wos_field_lines와 같음 (지연 필드 정리에 사용, 값은 위에서 이미 정리/검사됨)
+    for position, value in zip(np.flatnonzero(valid), text.to_numpy()[valid]):
+        if tag in SCIMAT_MULTI_LINE_FIELDS:
+            items = [item.strip() for item in value.split(';') if item.strip()]
+            if items:
+                lines[position] = f"{tag} " + "\n   ".join(items)
+        else:
+            lines[position] = f"{tag} {value}"
+    return lines
+
+def _chunk_field_lines(chunk, tag):
+    """청크의 태그 하나를 레코드별 WOS 필드 라인으로 변환 (지연 필드는 원본 줄이 이미 같은 형식이면 그대로 사용)"""
+    is_lazy_field = getattr(chunk, 'is_lazy_field', None)
+    if is_lazy_field is not None and is_lazy_field(tag):
+        return chunk.verbatim_field_lines(tag, tag in SCIMAT_MULTI_LINE_FIELDS)
+    return _scimat_field_lines(chunk[tag], tag)
+
+def _scimat_records(chunk, tags):
+    """청크의 레코드별 WOS 레코드 문자열 ('ER'로 끝남)"""
+    field_lines = [_chunk_field_lines(chunk, tag) for tag in tags]
+    return [
+        "\n".join([line for line in record_lines if line is not None] + ["ER"])
+        for record_lines in zip(*field_lines)
+    ] if field_lines else ["ER"] * len(chunk)
+
+def iter_scimat_wos_chunks(df_to_convert, chunk_records=SCIMAT_CHUNK_RECORDS, encoding='utf-8-sig'):
+    """SCIMAT 호환 WOS Plain Text를 chunk_records 레코드 단위의 인코딩된 바이트 조각으로 생성
+
+    지연 필드(파서가 원본 구간만 보관한 CR/C1/FU 등)는 원본 줄이 이미 내보내기 형식이면 디코딩/분리 없이 그대로 기록
+    (나머지는 즉시 필드와 같은 규칙으로 정리하므로 지연 필드 사용 여부와 관계없이 같은 파일)
+    """
+    encoder = codecs.getincrementalencoder(encoding)()
+    yield encoder.encode(SCIMAT_HEADER)
+    
+    df_to_convert = as_record_view(df_to_convert)
+    tags = [tag for tag in SCIMAT_FIELD_ORDER if tag in df_to_convert.columns]
+    for start in range(0, len(df_to_convert), chunk_records):
+        records = _scimat_records(df_to_convert.iloc[start:start + chunk_records], tags)
+        
+        # 레코드 사이는 빈 줄 하나로 구분
+        separator = "\n" if start == 0 else "\n\n"
+        yield encoder.encode(separator + "\n\n".join(records))
+
+class ScimatWosWriter:
+    """SCIMAT 파일 하나에 여러 DataFrame 조각을 차례로 이어 기록 (스트리밍 병합용, 결과는 조각을 합쳐 변환한 것과 동일)"""
+
+    def __init__(self, target, chunk_records=SCIMAT_CHUNK_RECORDS, encoding='utf-8-sig'):
+        self.target = target
+        self.chunk_records = chunk_records
+        self.records = 0
+        self._encoder = codecs.getincrementalencoder(encoding)()
+        self.bytes = target.write(self._encoder.encode(SCIMAT_HEADER))
+
+    def write(self, df_to_convert):
+        """조각의 레코드를 이어서 기록 (기록한 레코드 수 반환)"""
+        df_to_convert = as_record_view(df_to_convert)
+        tags = [tag for tag in SCIMAT_FIELD_ORDER if tag in df_to_convert.columns]
+        for start in range(0, len(df_to_convert), self.chunk_records):
+            records = _scimat_records(df_to_convert.iloc[start:start + self.chunk_records], tags)
+            separator = "\n" if self.records == 0 else "\n\n"
+            self.bytes += self.target.write(self._encoder.encode(separator + "\n\n".join(records)))
+            self.records += len(records)
+        return len(df_to_convert)
+
+def convert_to_scimat_wos_format(df_to_convert):
+    """SCIMAT 완전 호환 WOS Plain Text 형식으로 변환"""
+    return b"".join(iter_scimat_wos_chunks(df_to_convert))
+
+def write_scimat_wos_file(df_to_convert, target, chunk_records=SCIMAT_CHUNK_RECORDS):
+    """SCIMAT 파일을 청크 단위로 디스크(경로 또는 바이너리 파일 객체)에 바로 기록"""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'wb') as output:
+            return write_scimat_wos_file(df_to_convert, output, chunk_records)
+    
+    written = 0
+    for chunk in iter_scimat_wos_chunks(df_to_convert, chunk_records):
+        written += target.write(chunk)
+    return written
+
+def write_scimat_wos_zip(df_to_convert, target, records_per_part=SCIMAT_DEFAULT_PART_RECORDS, file_prefix='scimat_part'):
+    """SCIMAT 로더용으로 records_per_part 레코드씩 나눈 WOS 파일들을 ZIP으로 기록"""
+    part_count = max(1, -(-len(df_to_convert) // records_per_part))
+    with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for part in range(part_count):
+            part_df = df_to_convert.iloc[part * records_per_part:(part + 1) * records_per_part]
+            with archive.open(f"{file_prefix}_{part + 1:03d}_of_{part_count:03d}.txt", 'w') as member:
+                for chunk in iter_scimat_wos_chunks(part_df):
+                    member.write(chunk)
+    return part_count
+
+# --- 엑셀 내보내기 함수 (write-only 스트리밍) ---
+EXCEL_CELL_CHAR_LIMIT = 32767
+EXCEL_TRUNCATION_MARKER = ' …[truncated]'
+EXCEL_CHUNK_ROWS = 2000
+
+def count_excel_overflow_cells(df):
+    """엑셀 셀 글자 수 한도(32,767자)를 넘는 셀 개수
+
+    지연 필드는 원본 구간 길이(디코딩한 글자 수 이상)로 먼저 거르고 한도를 넘는 구간만 디코딩하여 확인
+    """
+    df = as_record_view(df)
+    is_lazy_field = getattr(df, 'is_lazy_field', None)
+    overflow_cells = 0
+    for column in df.columns:
+        if is_lazy_field is not None and is_lazy_field(column):
+            candidates = df.lazy_span_lengths(column) > EXCEL_CELL_CHAR_LIMIT
+            if candidates.any():
+                overflow_cells += int((df.subset(candidates)[column].str.len() > EXCEL_CELL_CHAR_LIMIT).sum())
+            continue
+        values = df[column]
+        if values.dtype == object or pd.api.types.is_string_dtype(values):
+            overflow_cells += int((values.astype(str).str.len() > EXCEL_CELL_CHAR_LIMIT).sum())
+    return overflow_cells
+
+def write_excel_workbook(df, target, sheet_name):
+    """openpyxl write-only 모드로 행 단위 스트리밍 기록 (메모리 사용량이 행 수와 무관)
+
+    - 32,767자를 넘는 셀은 한도에 맞춰 자르고 끝에 EXCEL_TRUNCATION_MARKER 표시
+    - 엑셀에서 허용하지 않는 제어 문자는 제거
+
+    Returns:
+        {'rows': 기록 행 수, 'truncated_cells': 잘린 셀 수, 'sanitized_cells': 제어 문자 제거 셀 수}
+    """
+    df = as_record_view(df)
+    return write_excel_frames([df], df.columns, target, sheet_name)
+
+def write_excel_frames(frames, columns, target, sheet_name):
+    """여러 DataFrame 조각을 columns 헤더 아래 한 시트로 이어 기록 (각 조각의 컬럼 순서는 columns와 같아야 함)
+
+    frames는 하나씩 읽는 이터러블이어도 됨 (스트리밍 병합의 임시 파일), 반환값은 write_excel_workbook과 같음
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    
+    stats = {'rows': 0, 'truncated_cells': 0, 'sanitized_cells': 0}
+    
+    def to_cell(value):
+        if value is None or value is pd.NA or (isinstance(value, float) and value != value):
+            return None
+        if isinstance(value, str):
+            if ILLEGAL_CHARACTERS_RE.search(value):
+                value = ILLEGAL_CHARACTERS_RE.sub('', value)
+                stats['sanitized_cells'] += 1
+            if len(value) > EXCEL_CELL_CHAR_LIMIT:
+                value = value[:EXCEL_CELL_CHAR_LIMIT - len(EXCEL_TRUNCATION_MARKER)] + EXCEL_TRUNCATION_MARKER
+                stats['truncated_cells'] += 1
+        elif isinstance(value, np.generic):
+            value = value.item()
+        return value
+    
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_name)
+    worksheet.append([str(column) for column in columns])
+    for df in frames:
+        df = as_record_view(df)
+        stats['rows'] += len(df)
+        for start in range(0, len(df), EXCEL_CHUNK_ROWS):
+            chunk = df.iloc[start:start + EXCEL_CHUNK_ROWS].to_numpy(dtype=object)
+            for row in chunk:
+                worksheet.append([to_cell(value) for value in row])
+    workbook.save(target)
+    return stats
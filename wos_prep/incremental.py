@@ -0,0 +1,261 @@
+"""업로드 파일 추가/제거 시 바뀐 파일만 다시 처리하는 증분 병합 (파일 내용 해시 기준)"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.parser import iter_parse_wos_files, columns_to_frame
+from wos_prep.merge import build_dedup_keys
+from wos_prep.store import compact_wos_frame, frame_memory_bytes
+from wos_prep.sources import compute_source_hash, is_stream_source
+from wos_prep.profiling import PipelineProfile
+
+DEDUP_KEY_TYPES = ('UT', 'DI', 'TA')
+
+def compute_file_hash(file_bytes):
+    """파일 내용 SHA-256 해시 (파일명과 무관)"""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+def build_record_ids(file_hash, keys):
+    """레코드 식별자 Series (파일 내용 해시 앞 16자 + 중복 키, 키가 없으면 파일 안 행 위치)
+
+    같은 내용의 파일에서 같은 키로 남는 레코드는 항상 그 파일에서 처음 나온 레코드이므로 식별자가 같으면 내용도 같음
+    """
+    positions = pd.Series(np.arange(len(keys)), index=keys.index).astype(str)
+    return (file_hash[:16] + '|' + keys.fillna('#' + positions)).astype('string[pyarrow]')
+
+def count_dedup_key_types(keys):
+    """중복 키 Series의 유형별(UT/DI/TA) 건수"""
+    key_types = keys.str[:2].value_counts()
+    return {key_type: int(key_types.get(key_type, 0)) for key_type in DEDUP_KEY_TYPES}
+
+class IncrementalWosMerger:
+    """파일별 파싱/중복 키 결과를 내용 해시로 보관하고 변경된 파일만 반영하는 병합기 (파싱 + 중복 제거 단계)
+
+    - 기존 목록 뒤에 파일 추가: 새 파일만 파싱하고, 기존 키 집합에 없는 레코드만 병합 결과에 이어 붙임
+    - 파일 제거/순서 변경: 다시 파싱하지 않고 보관된 파일별 결과로 중복 제거만 다시 수행
+    유사 중복 / 분류 단계는 stages.StagedWosPipeline이 병합 결과 키 기준으로 따로 메모이즈
+    (record_ids: 병합 결과 행별 식별자, 분류 단계가 남아 있는 레코드의 분류 결과를 다시 쓰는 데 사용)
+    lazy_tags: 원본 구간으로만 보관할 태그 (parser.parse_wos_file 참고)
+    disk_cache: diskcache.CorpusDiskCache (선택) - 메모리에 없는 파일은 파싱 전에 디스크 캐시에서 먼저 찾고, 새로 파싱한 결과는 보관
+    """
+
+    def __init__(self, lazy_tags=None, disk_cache=None):
+        self.lazy_tags = tuple(lazy_tags) if lazy_tags else None
+        self.disk_cache = disk_cache
+        self.parsed_files = {}  # 내용 해시 → {'status', 'frame', 'keys'}
+        self.file_order = []  # 병합 결과에 반영된 (파일명, 내용 해시) 목록
+        self.merged_df = None
+        self.record_ids = None  # merged_df 행별 build_record_ids 식별자
+        self.dedup_counts = dict.fromkeys(DEDUP_KEY_TYPES, 0)
+        self.seen_keys = set()
+        self.ingest_profile = PipelineProfile()
+        self.last_update = {'parsed': 0, 'disk_cached': 0, 'reused': 0, 'merge': 'none'}
+        self._last_parsed_hashes = set()
+        self._last_disk_hashes = set()
+
+    # --- 파일별 결과 준비 ---
+    def _prepare_files(self, file_hashes, parsed_files, profile):
+        """새로 파싱한 파일들((처리 상태, DataFrame) 목록)의 중복 키까지 계산해 내용 해시별로 보관"""
+        entries = []
+        for file_hash, (status, frame) in zip(file_hashes, parsed_files):
+            entries.append({'status': status, 'frame': frame, 'keys': None})
+            self.parsed_files[file_hash] = entries[-1]
+        frames = [entry for entry in entries if entry['frame'] is not None]
+        with profile.stage('dedup_keys', records=sum(len(entry['frame']) for entry in frames)):
+            for entry in frames:
+                entry['keys'] = build_dedup_keys(entry['frame'])
+
+    # --- 병합 / 중복 제거 ---
+    def _append_files(self, appended, profile):
+        """새로 추가된 파일의 레코드 중 기존 키 집합에 없는 것만 병합 결과에 이어 붙임"""
+        frames = []
+        record_ids = []
+        with profile.stage('dedup', records=0) as entry:
+            for _, file_hash in appended:
+                parsed = self.parsed_files[file_hash]
+                if parsed['frame'] is None:
+                    continue
+                keys = parsed['keys']
+                duplicate_mask = keys.notna() & (keys.isin(self.seen_keys) | keys.duplicated(keep='first'))
+                for key_type, count in count_dedup_key_types(keys[duplicate_mask]).items():
+                    self.dedup_counts[key_type] += count
+                self.seen_keys.update(keys[~duplicate_mask].dropna())
+                frames.append(parsed['frame'][~duplicate_mask.to_numpy()])
+                record_ids.append(build_record_ids(file_hash, keys)[~duplicate_mask])
+                entry['records'] += len(keys)
+        with profile.stage('concat') as entry:
+            if self.merged_df is not None:
+                frames.insert(0, self.merged_df)
+                record_ids.insert(0, self.record_ids)
+            if frames:
+                self.merged_df = pd.concat(frames, ignore_index=True)
+                self.record_ids = pd.concat(record_ids, ignore_index=True)
+            entry['records'] = 0 if self.merged_df is None else len(self.merged_df)
+        if frames:
+            self._compact(profile)
+
+    def _rebuild(self, file_order, profile):
+        """보관된 파일별 결과를 현재 순서로 이어 붙이고 전체 중복 제거 (파싱 생략)"""
+        parsed = [(file_hash, self.parsed_files[file_hash]) for _, file_hash in file_order]
+        parsed = [(file_hash, entry) for file_hash, entry in parsed if entry['frame'] is not None]
+        self.dedup_counts = dict.fromkeys(DEDUP_KEY_TYPES, 0)
+        self.seen_keys = set()
+        if not parsed:
+            self.merged_df = None
+            self.record_ids = None
+            return
+
+        with profile.stage('dedup') as entry:
+            keys = pd.concat([item['keys'] for _, item in parsed], ignore_index=True)
+            duplicate_mask = keys.notna() & keys.duplicated(keep='first')
+            self.dedup_counts = count_dedup_key_types(keys[duplicate_mask])
+            self.seen_keys = set(keys[~duplicate_mask].dropna())
+            entry['records'] = len(keys)
+        with profile.stage('concat') as entry:
+            self.merged_df = pd.concat([item['frame'] for _, item in parsed], ignore_index=True)
+            self.record_ids = pd.concat([build_record_ids(file_hash, item['keys']) for file_hash, item in parsed],
+                                        ignore_index=True)
+            if duplicate_mask.any():
+                self.merged_df = self.merged_df[~duplicate_mask.to_numpy()].reset_index(drop=True)
+                self.record_ids = self.record_ids[~duplicate_mask.to_numpy()].reset_index(drop=True)
+            entry['records'] = len(self.merged_df)
+        self._compact(profile)
+
+    def _compact(self, profile):
+        """병합 결과 저장 형식 압축 (concat 시 범주형 카테고리가 달라 일반 문자열로 돌아간 컬럼 포함)"""
+        with profile.stage('compact', records=len(self.merged_df)) as entry:
+            entry['bytes_before'] = frame_memory_bytes(self.merged_df)
+            self.merged_df = compact_wos_frame(self.merged_df)
+            entry['bytes_after'] = frame_memory_bytes(self.merged_df)
+
+    # --- 공개 API ---
+    def update(self, uploaded_files, progress=None):
+        """현재 업로드 목록 기준으로 병합 결과 갱신 (변경이 없으면 보관된 결과 그대로 반환)
+
+        progress: 새로 읽은 파일 하나마다 호출 (읽은 파일 수, 읽을 파일 수, 파일별 상태) - 파싱/디스크 캐시 로딩 포함
+
+        Returns:
+            (병합 DataFrame 또는 None, 파일별 상태, 유형별 중복 제거 건수 {'UT', 'DI', 'TA'})
+            - 분류 전 결과 (호출한 쪽에서 공유하므로 수정하지 말 것)
+        """
+        profile = PipelineProfile()
+        with profile.stage('read', records=len(uploaded_files)) as entry:
+            # 서버 측 원본(sources.py)은 청크 단위로 해시만 계산하고, 내용은 파싱할 때 스트림으로 다시 읽음
+            payloads = [
+                uploaded_file if is_stream_source(uploaded_file) else uploaded_file.getvalue()
+                for uploaded_file in uploaded_files
+            ]
+            file_order = [
+                (uploaded_file.name, compute_source_hash(payload) if is_stream_source(payload) else compute_file_hash(payload))
+                for uploaded_file, payload in zip(uploaded_files, payloads)
+            ]
+            entry['bytes'] = sum(payload.size if is_stream_source(payload) else len(payload) for payload in payloads)
+
+        if file_order != self.file_order:
+            self._ingest(file_order, payloads, profile, progress)
+        del payloads
+
+        file_status = []
+        for filename, file_hash in file_order:
+            status = dict(self.parsed_files[file_hash]['status'], filename=filename,
+                          reused=file_hash not in self._last_parsed_hashes | self._last_disk_hashes,
+                          disk_cached=file_hash in self._last_disk_hashes)
+            file_status.append(status)
+        return self.merged_df, file_status, dict(self.dedup_counts)
+
+    def _ingest(self, file_order, payloads, profile, progress=None):
+        """새 파일만 파싱하고 병합 결과를 추가 또는 재구성"""
+        # 처음 보는 내용 해시만 파싱 (같은 내용이 여러 번 올라온 경우 1회, 디스크 캐시에 있으면 파싱 없이 불러옴)
+        new_items = {}
+        for (filename, file_hash), file_bytes in zip(file_order, payloads):
+            if file_hash not in self.parsed_files and file_hash not in new_items:
+                new_items[file_hash] = (filename, file_bytes)
+        total = len(new_items)
+        disk_hashes = self._load_from_disk_cache(new_items, profile, progress, total)
+        if new_items:
+            with profile.stage('parse', records=0) as entry:
+                # 파일별 파싱 결과는 받는 즉시 DataFrame으로 바꿔 컬럼 리스트를 한 파일분만 유지
+                parsed_files = []
+                for parsed in iter_parse_wos_files(list(new_items.values()), lazy_tags=self.lazy_tags):
+                    columns = parsed.pop('columns')
+                    parsed_files.append((parsed, columns_to_frame(columns) if columns is not None else None))
+                    if progress is not None:
+                        progress(len(disk_hashes) + len(parsed_files), total, parsed)
+                entry['records'] = sum(status['papers'] for status, _ in parsed_files)
+                entry['files'] = len(parsed_files)
+            profile.add('encoding_sniff', sum(status['encoding_detect_ms'] for status, _ in parsed_files) / 1000,
+                        records=len(parsed_files), nested=True)
+            self._prepare_files(list(new_items), parsed_files, profile)
+            self._store_to_disk_cache(new_items, profile)
+
+        # 기존 목록 뒤에 파일만 추가된 경우 이어 붙이고, 그 외(제거/순서 변경)는 재구성
+        previous_count = len(self.file_order)
+        if file_order[:previous_count] == self.file_order and self.file_order:
+            self._append_files(file_order[previous_count:], profile)
+            merge_mode = 'append'
+        else:
+            self._rebuild(file_order, profile)
+            merge_mode = 'rebuild'
+
+        # 현재 목록에 없는 파일 결과는 메모리에서 제거
+        current_hashes = {file_hash for _, file_hash in file_order}
+        for file_hash in list(self.parsed_files):
+            if file_hash not in current_hashes:
+                del self.parsed_files[file_hash]
+
+        self.file_order = list(file_order)
+        self.ingest_profile = profile
+        self._last_parsed_hashes = set(new_items)
+        self._last_disk_hashes = disk_hashes
+        self.last_update = {
+            'parsed': len(new_items),
+            'disk_cached': len(disk_hashes),
+            'reused': len(current_hashes) - len(new_items) - len(disk_hashes),
+            'merge': merge_mode,
+        }
+
+    # --- 디스크 캐시 ---
+    def _load_from_disk_cache(self, new_items, profile, progress=None, total=0):
+        """파싱할 파일 중 디스크 캐시에 있는 것을 불러오고 new_items에서 제외 (불러온 내용 해시 집합 반환)"""
+        loaded_hashes = set()
+        if self.disk_cache is None or not self.disk_cache.enabled or not new_items:
+            return loaded_hashes
+        with profile.stage('disk_cache_load', records=0) as entry:
+            for file_hash in list(new_items):
+                loaded = self.disk_cache.load_parsed_file(file_hash, self.lazy_tags)
+                if loaded is None:
+                    continue
+                status, frame, keys = loaded
+                self.parsed_files[file_hash] = {'status': status, 'frame': frame, 'keys': keys}
+                loaded_hashes.add(file_hash)
+                if progress is not None:
+                    progress(len(loaded_hashes), total, dict(status, filename=new_items[file_hash][0], disk_cached=True))
+                del new_items[file_hash]
+                entry['records'] += len(frame)
+            entry['files'] = len(loaded_hashes)
+        return loaded_hashes
+
+    def _store_to_disk_cache(self, new_items, profile):
+        """새로 파싱에 성공한 파일 결과를 디스크 캐시에 보관"""
+        if self.disk_cache is None or not self.disk_cache.enabled:
+            return
+        stored = [(file_hash, self.parsed_files[file_hash]) for file_hash in new_items]
+        stored = [(file_hash, parsed) for file_hash, parsed in stored if parsed['frame'] is not None]
+        if not stored:
+            return
+        with profile.stage('disk_cache_store', records=sum(len(parsed['frame']) for _, parsed in stored)) as entry:
+            entry['bytes'] = sum(
+                self.disk_cache.store_parsed_file(file_hash, self.lazy_tags, parsed['status'], parsed['frame'], parsed['keys'])
+                for file_hash, parsed in stored
+            )
+
+    @property
+    def upload_key(self):
+        """현재 병합에 반영된 파일 이름/순서/내용 기반 키 (pipeline.compute_upload_key와 동일한 값)"""
+        hasher = hashlib.sha256()
+        for filename, file_hash in self.file_order:
+            hasher.update(filename.encode('utf-8'))
+            hasher.update(b'\0')
+            hasher.update(bytes.fromhex(file_hash))
+        return hasher.hexdigest()
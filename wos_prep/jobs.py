@@ -0,0 +1,129 @@
+"""백그라운드 처리 작업 (작업 스레드에서 병합/분류를 실행하고, 화면은 진행 상황을 주기적으로 조회)
+
+작업 함수는 target(job)으로 호출되며 진행 상황을 job에 알림
+    - 파일별: job.file_done을 파이프라인의 progress 콜백으로 전달 (파싱/디스크 캐시 로딩이 끝날 때마다)
+    - 단계별: 작업 스레드에서 시작되는 계측 단계(profiling.PipelineProfile.stage) 이름을 자동으로 기록
+화면(앱)은 job.snapshot()으로 지금까지 끝난 파일의 상태/레코드 수와 현재 단계를 읽어 그림 (Streamlit 호출은 화면 스레드에서만)
+"""
+import time
+import threading
+import traceback
+
+from wos_prep.profiling import stage_listener
+
+JOB_POLL_SECONDS = 0.5  # 화면에서 진행 상황을 다시 그리는 간격
+WAIT_PREVIOUS_STAGE = 'wait_previous_job'  # 이전 작업이 멈추기를 기다리는 동안의 단계 이름
+
+class JobCancelled(Exception):
+    """취소된 작업이 다음 파일 진행 알림에서 중단될 때 발생"""
+
+class BackgroundJob:
+    """함수 하나를 데몬 스레드에서 실행하고 파일별/단계별 진행 상황을 공유하는 작업
+
+    key: 작업을 만든 입력/설정 키 (같은 키면 화면 재실행 시 작업을 다시 만들지 않고 재사용)
+    after: 먼저 멈춰야 하는 이전 작업 (같은 상태를 공유하는 경우, 작업 스레드에서 기다린 뒤 target 실행)
+    상태: 'pending' → 'running' → 'done' | 'error' | 'cancelled'
+    """
+
+    def __init__(self, key, target, after=None):
+        self.key = key
+        self._target = target
+        self._after = after
+        self._lock = threading.Lock()
+        self._cancel_requested = threading.Event()
+        self._thread = None
+        self.state = 'pending'
+        self.stage = None  # 현재 단계 이름
+        self.stages = []  # 시작한 단계 이름 순서 (같은 단계가 반복되면 한 번만)
+        self.files = []  # 읽기를 마친 파일별 상태 (끝난 순서)
+        self.files_total = None
+        self.records = 0
+        self.result = None
+        self.error = None
+        self.error_detail = None
+        self.started_at = None
+        self.finished_at = None
+
+    # --- 실행 ---
+    def start(self):
+        """작업 스레드 시작 (이미 시작했으면 아무것도 하지 않음)"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self.state = 'running'
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name=f"wos-prep-job-{self.key[:8]}", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            if self._after is not None:
+                # 이전 작업이 멈출 때까지 이 작업 스레드에서 대기 (화면 스레드는 막지 않음)
+                self.stage_started(WAIT_PREVIOUS_STAGE)
+                self._after.wait()
+                self._after = None
+            if self._cancel_requested.is_set():
+                raise JobCancelled()
+            with stage_listener(self.stage_started):
+                result = self._target(self)
+        except JobCancelled:
+            state, result, error, detail = 'cancelled', None, None, None
+        except Exception as e:
+            state, result, error, detail = 'error', None, e, traceback.format_exc()
+        else:
+            state, error, detail = 'done', None, None
+        with self._lock:
+            self.state = state
+            self.result = result
+            self.error = error
+            self.error_detail = detail
+            self.stage = None
+            self.finished_at = time.time()
+
+    def cancel(self):
+        """취소 요청 (파일 읽기 중이면 다음 파일에서 중단, 그 이후 단계는 끝까지 실행)"""
+        self._cancel_requested.set()
+
+    def wait(self, timeout=None):
+        """작업이 끝날 때까지 대기 (끝났으면 True)"""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.finished
+
+    # --- 진행 알림 (작업 스레드에서 호출) ---
+    def file_done(self, done, total, status):
+        """파일 하나 읽기 완료 (파이프라인 progress 콜백 형식: 읽은 파일 수, 읽을 파일 수, 파일별 상태)"""
+        status = {key: value for key, value in status.items() if key != 'columns'}
+        with self._lock:
+            self.files.append(status)
+            self.files_total = total
+            self.records += status.get('papers', 0)
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+
+    def stage_started(self, stage):
+        with self._lock:
+            self.stage = stage
+            if stage not in self.stages:
+                self.stages.append(stage)
+
+    # --- 조회 (화면 스레드) ---
+    @property
+    def finished(self):
+        return self.state in ('done', 'error', 'cancelled')
+
+    def snapshot(self):
+        """지금까지의 진행 상황 복사본 {'state', 'stage', 'stages', 'files', 'files_total', 'records', 'errors', 'elapsed'}"""
+        with self._lock:
+            files = list(self.files)
+            return {
+                'state': self.state,
+                'stage': self.stage,
+                'stages': list(self.stages),
+                'files': files,
+                'files_total': self.files_total,
+                'records': self.records,
+                'errors': sum(status['status'] == 'ERROR' for status in files),
+                'elapsed': ((self.finished_at or time.time()) - self.started_at) if self.started_at else 0.0,
+            }
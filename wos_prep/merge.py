@@ -0,0 +1,323 @@
+"""WOS 레코드 병합, 중복 제거(UT/DOI/제목+저자+연도), 유사 중복 탐지(MinHash + LSH)"""
+import re
+import string
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.parser import iter_parse_wos_files, columns_to_frame
+from wos_prep.sources import is_stream_source
+from wos_prep.store import compact_wos_frame, frame_memory_bytes
+from wos_prep.profiling import PipelineProfile
+
+# --- 중복 제거 키 생성 및 중복 제거 함수 ---
+DEDUP_KEY_LABELS = {
+    'UT': 'UT',
+    'DI': 'DOI',
+    'TA': '제목+첫 저자+연도',
+    'NEAR': '유사 중복(MinHash)'
+}
+
+def _clean_text_column(df, field):
+    """필드 컬럼을 공백 제거 문자열로 변환 (결측/'nan'/'none'/'null'은 빈 문자열)"""
+    if field not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    column = df[field]
+    column = column.astype(str).where(column.notna(), '').str.strip()
+    return column.where(~column.str.lower().isin(['nan', 'none', 'null']), '')
+
+def build_dedup_keys(df):
+    """레코드별 정규화된 중복 판별 키 생성 (UT 우선, 없으면 DOI, 없으면 제목+첫 저자+연도)"""
+    keys = pd.Series(None, index=df.index, dtype=object)
+    
+    # UT: 'WOS:'로 시작하거나 충분히 긴 영숫자 조합인 경우만 유효 (최소 10자)
+    ut = _clean_text_column(df, 'UT')
+    ut_length = ut.str.len()
+    ut_valid = (ut_length >= 10) & (
+        ut.str.startswith('WOS:') | ((ut_length >= 15) & ut.str.contains(r'[^\W_]', regex=True))
+    )
+    keys[ut_valid] = 'UT:' + ut[ut_valid].str.upper()
+    # UT가 유효하지 않은 레코드만 나머지 키 컬럼을 선택 (전체 컬럼 복사 방지)
+    remaining = df.loc[~ut_valid, [field for field in ('DI', 'TI', 'AU', 'PY') if field in df.columns]]
+    
+    # DOI: 대소문자/URL 접두어 차이를 무시하고 '10.'으로 시작하는 값만 유효
+    if len(remaining) > 0:
+        doi = _clean_text_column(remaining, 'DI').str.lower().str.replace(
+            r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', '', regex=True
+        )
+        doi_valid = doi.str.startswith('10.')
+        keys[doi_valid[doi_valid].index] = 'DI:' + doi[doi_valid]
+        remaining = remaining[~doi_valid]
+    
+    # 제목+첫 저자+연도: 대소문자/구두점/공백 차이를 무시
+    if len(remaining) > 0:
+        title = _clean_text_column(remaining, 'TI').str.lower().str.replace(r'[\W_]+', ' ', regex=True).str.strip()
+        first_author = _clean_text_column(remaining, 'AU').str.split(';').str[0].fillna('').str.lower().str.replace(r'[\W_]+', '', regex=True)
+        year = _clean_text_column(remaining, 'PY')
+        title_author_valid = (title != '') & (first_author != '')
+        keys[title_author_valid[title_author_valid].index] = (
+            'TA:' + title[title_author_valid] + '|' + first_author[title_author_valid] + '|' + year[title_author_valid]
+        )
+    
+    return keys
+
+def deduplicate_records(df):
+    """해시 기반 단일 패스 중복 제거 - 먼저 나온 레코드를 남기고 원래 순서 유지
+
+    Returns:
+        (중복 제거된 DataFrame, 키 유형별 제거 건수 dict)
+    """
+    keys = build_dedup_keys(df)
+    duplicate_mask = keys.notna() & keys.duplicated(keep='first')
+    
+    removed_key_types = keys[duplicate_mask].str[:2].value_counts()
+    dedup_counts = {key_type: int(removed_key_types.get(key_type, 0)) for key_type in ('UT', 'DI', 'TA')}
+    
+    if duplicate_mask.any():
+        df = df[~duplicate_mask.to_numpy()].reset_index(drop=True)
+    return df, dedup_counts
+
+def format_dedup_counts(dedup_counts):
+    """키 유형별 중복 제거 건수를 화면 표시용 문자열로 변환"""
+    return ', '.join(
+        f"{DEDUP_KEY_LABELS[key_type]} {count:,}편"
+        for key_type, count in dedup_counts.items() if count > 0
+    )
+
+# --- 유사 중복 탐지 (MinHash + LSH) ---
+# 구두점/대소문자/인코딩 차이, 조기 공개(Early Access)와 최종본 등 정확히 일치하지 않는 중복 후보 탐지
+NEAR_DUP_NUM_PERM = 64
+NEAR_DUP_BANDS = 16
+NEAR_DUP_MAX_BUCKET = 50
+NEAR_DUP_DEFAULT_THRESHOLD = 0.9
+NEAR_DUP_MODES = {
+    'off': '사용 안 함',
+    'review': '후보만 표시 (검토용)',
+    'auto': '임계값 이상 자동 병합'
+}
+NEAR_DUP_ABSTRACT_WORDS = 120
+# 순열 근사: multiply-shift 해시 ((a*x + b) mod 2^64 의 상위 32비트), a는 홀수
+_minhash_rng = np.random.default_rng(20240501)
+_MINHASH_A = _minhash_rng.integers(1, 2 ** 63, size=NEAR_DUP_NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_MINHASH_B = _minhash_rng.integers(0, 2 ** 63, size=NEAR_DUP_NUM_PERM, dtype=np.uint64)
+
+def _normalize_for_shingles(value, max_words=None):
+    """유사도 비교용 정규화 단어 목록 (악센트 제거, 소문자, 영숫자 외 문자는 구분자로 처리)"""
+    if value is None or pd.isna(value):
+        return []
+    text = str(value)
+    if max_words is not None:
+        text = ' '.join(text.split(None, max_words)[:max_words])
+    text = text.lower()
+    if text.isascii():
+        return text.translate(_ASCII_PUNCTUATION_TO_SPACE).split()
+    text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    return _NON_WORD_RE.sub(' ', text).split()
+
+_ASCII_PUNCTUATION_TO_SPACE = str.maketrans({ch: ' ' for ch in string.punctuation})
+_NON_WORD_RE = re.compile(r'[\W_]+')
+_SHINGLE_MASK = np.uint64(0xFFFFFFFF)
+
+def _rolling_hash(values, width, seed):
+    """정수 배열의 연속 width개 묶음(shingle)을 32비트 해시로 변환"""
+    if len(values) < width:
+        values = np.concatenate([values, np.zeros(width - len(values), dtype=np.uint64)])
+    hashes = np.full(len(values) - width + 1, seed, dtype=np.uint64)
+    for offset in range(width):
+        hashes = hashes * np.uint64(1000003) + values[offset:len(values) - width + 1 + offset]
+    return hashes & _SHINGLE_MASK
+
+def _record_shingles(title, abstract, vocabulary):
+    """제목 문자 5-gram + 초록 앞부분 단어 3-gram 해시 집합 (정렬된 고유값 배열)"""
+    parts = []
+    title = ' '.join(_normalize_for_shingles(title))
+    if title:
+        code_points = np.frombuffer(title.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        parts.append(_rolling_hash(code_points, 5, 1))
+    words = _normalize_for_shingles(abstract, NEAR_DUP_ABSTRACT_WORDS)
+    if words:
+        word_ids = np.fromiter((vocabulary.setdefault(word, len(vocabulary)) for word in words), dtype=np.uint64, count=len(words))
+        parts.append(_rolling_hash(word_ids, 3, 2))
+    if not parts:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.concatenate(parts))
+
+def compute_minhash_signatures(shingle_sets):
+    """레코드별 shingle 해시 집합 -> (레코드 수, NEAR_DUP_NUM_PERM) MinHash 서명 행렬"""
+    signatures = np.full((len(shingle_sets), NEAR_DUP_NUM_PERM), np.iinfo(np.uint64).max, dtype=np.uint64)
+    non_empty = [i for i, shingles in enumerate(shingle_sets) if len(shingles)]
+    if not non_empty:
+        return signatures
+    
+    # 전체 shingle 해시를 한 배열로 이어 붙이고 레코드 경계(offsets) 기준으로 최솟값 계산
+    hashes = np.concatenate([shingle_sets[i] for i in non_empty])
+    offsets = np.cumsum([0] + [len(shingle_sets[i]) for i in non_empty[:-1]])
+    for perm in range(NEAR_DUP_NUM_PERM):
+        permuted = (_MINHASH_A[perm] * hashes + _MINHASH_B[perm]) >> np.uint64(32)
+        signatures[non_empty, perm] = np.minimum.reduceat(permuted, offsets)
+    return signatures
+
+def find_near_duplicates(df, threshold=NEAR_DUP_DEFAULT_THRESHOLD, candidate_floor=0.5):
+    """MinHash 서명을 LSH 밴드로 버킷팅해 후보 쌍만 실제 Jaccard 유사도로 검증
+
+    Returns:
+        유사도 candidate_floor 이상인 후보 쌍 DataFrame (record_a < record_b, 행 위치 기준)
+    """
+    columns = ['record_a', 'record_b', 'similarity', 'auto_merge', 'TI_a', 'TI_b', 'PY_a', 'PY_b', 'UT_a', 'UT_b']
+    if len(df) < 2:
+        return pd.DataFrame(columns=columns)
+    
+    titles = df['TI'].tolist() if 'TI' in df.columns else [None] * len(df)
+    abstracts = df['AB'].tolist() if 'AB' in df.columns else [None] * len(df)
+    vocabulary = {}
+    shingle_sets = [_record_shingles(title, abstract, vocabulary) for title, abstract in zip(titles, abstracts)]
+    signatures = compute_minhash_signatures(shingle_sets)
+    has_shingles = np.array([len(shingles) > 0 for shingles in shingle_sets])
+    
+    # LSH: 밴드별 서명 조각이 같은 레코드끼리만 후보 쌍으로 묶음 (전체 쌍 비교 없음)
+    rows_per_band = NEAR_DUP_NUM_PERM // NEAR_DUP_BANDS
+    candidate_pairs = set()
+    record_ids = np.flatnonzero(has_shingles)
+    for band in range(NEAR_DUP_BANDS):
+        band_values = np.ascontiguousarray(signatures[record_ids, band * rows_per_band:(band + 1) * rows_per_band])
+        band_keys = band_values.view(np.dtype((np.void, band_values.dtype.itemsize * rows_per_band))).ravel()
+        _, bucket_ids, bucket_sizes = np.unique(band_keys, return_inverse=True, return_counts=True)
+        # 버킷 번호 순으로 정렬해 같은 버킷 레코드를 연속 구간으로 모음
+        sorted_members = record_ids[np.argsort(bucket_ids, kind='stable')]
+        bucket_starts = np.cumsum(bucket_sizes) - bucket_sizes
+        for bucket in np.flatnonzero((bucket_sizes > 1) & (bucket_sizes <= NEAR_DUP_MAX_BUCKET)):
+            members = sorted_members[bucket_starts[bucket]:bucket_starts[bucket] + bucket_sizes[bucket]].tolist()
+            candidate_pairs.update(
+                (a, b) for i, a in enumerate(members) for b in members[i + 1:]
+            )
+    
+    rows = []
+    for a, b in sorted(candidate_pairs):
+        shared = len(np.intersect1d(shingle_sets[a], shingle_sets[b], assume_unique=True))
+        union = len(shingle_sets[a]) + len(shingle_sets[b]) - shared
+        similarity = shared / union if union else 0.0
+        if similarity >= candidate_floor:
+            rows.append((a, b, round(similarity, 4), similarity >= threshold))
+    
+    candidates = pd.DataFrame(rows, columns=columns[:4])
+    for field in ('TI', 'PY', 'UT'):
+        values = df[field].to_numpy() if field in df.columns else np.full(len(df), None)
+        candidates[f'{field}_a'] = values[candidates['record_a'].to_numpy(dtype=int)]
+        candidates[f'{field}_b'] = values[candidates['record_b'].to_numpy(dtype=int)]
+    return candidates.sort_values('similarity', ascending=False, ignore_index=True)
+
+def near_duplicate_keep_mask(record_count, candidates):
+    """auto_merge 후보 쌍을 연결 요소로 묶었을 때 남는 레코드 마스크 (각 묶음에서 가장 먼저 나온 레코드만 True)"""
+    keep_mask = np.ones(record_count, dtype=bool)
+    merge_pairs = candidates[candidates['auto_merge']]
+    if merge_pairs.empty:
+        return keep_mask
+    
+    # Union-Find: 대표 레코드는 항상 행 위치가 가장 작은 레코드
+    parent = {}
+    def find(record):
+        parent.setdefault(record, record)
+        while parent[record] != record:
+            parent[record] = parent[parent[record]]
+            record = parent[record]
+        return record
+    for a, b in zip(merge_pairs['record_a'], merge_pairs['record_b']):
+        root_a, root_b = find(int(a)), find(int(b))
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+    
+    drop_positions = [record for record in parent if find(record) != record]
+    keep_mask[drop_positions] = False
+    return keep_mask
+
+def merge_near_duplicates(df, candidates):
+    """auto_merge 후보 쌍을 연결 요소로 묶어 각 묶음에서 가장 먼저 나온 레코드만 유지"""
+    keep_mask = near_duplicate_keep_mask(len(df), candidates)
+    if keep_mask.all():
+        return df, 0
+    return df[keep_mask].reset_index(drop=True), int((~keep_mask).sum())
+
+def apply_near_duplicate_mode(merged_df, dedup_counts, near_duplicate_mode, near_duplicate_threshold, profile=None):
+    """유사 중복 모드 적용 ('auto'면 병합 후 dedup_counts['NEAR']에 제거 건수 기록)
+
+    Returns:
+        (DataFrame, 유사 중복 후보 DataFrame 또는 None (모드 'off'))
+    """
+    if near_duplicate_mode not in ('review', 'auto'):
+        return merged_df, None
+    if profile is None:
+        profile = PipelineProfile()
+    with profile.stage('near_duplicates', records=len(merged_df)):
+        near_duplicates = find_near_duplicates(merged_df, threshold=near_duplicate_threshold)
+        if near_duplicate_mode == 'auto':
+            merged_df, dedup_counts['NEAR'] = merge_near_duplicates(merged_df, near_duplicates)
+        else:
+            near_duplicates['auto_merge'] = False
+    return merged_df, near_duplicates
+
+# --- 다중 WOS Plain Text 파일 로딩 및 병합 함수 ---
+def load_and_merge_wos_files(uploaded_files, near_duplicate_mode='off', near_duplicate_threshold=NEAR_DUP_DEFAULT_THRESHOLD,
+                             profile=None, lazy_tags=None):
+    """다중 WOS Plain Text 파일을 로딩하고 병합 (UT/DOI/제목+저자+연도 기준 중복 제거)
+
+    near_duplicate_mode: 'off' | 'review' (유사 중복 후보만 반환) | 'auto' (임계값 이상 자동 병합)
+    profile: 단계별 계측을 기록할 PipelineProfile (선택)
+    lazy_tags: 디코딩하지 않고 원본 구간으로 보관할 태그 (parser.LAZY_FIELD_TAGS 등, 결과는 views.RecordView로 조회)
+
+    Returns:
+        (병합 DataFrame, 파일별 상태, 제거된 중복 수, 중복 제거 리포트 {'counts', 'near_duplicates'})
+    """
+    if profile is None:
+        profile = PipelineProfile()
+    all_dataframes = []
+    file_status = []
+    
+    with profile.stage('read', records=len(uploaded_files)) as entry:
+        # 서버 측 원본(sources.py)은 여기서 읽지 않고 파싱할 때 파일별로 스트림으로 읽음
+        named_payloads = [
+            (uploaded_file.name, uploaded_file if is_stream_source(uploaded_file) else uploaded_file.getvalue())
+            for uploaded_file in uploaded_files
+        ]
+        entry['bytes'] = sum(payload.size if is_stream_source(payload) else len(payload) for _, payload in named_payloads)
+    
+    # 파일별 인코딩 판별 + 파싱 (대용량 업로드는 프로세스 풀로 분산), 파일별 결과는 받는 즉시 DataFrame으로 변환
+    with profile.stage('parse') as entry:
+        for parsed in iter_parse_wos_files(named_payloads, lazy_tags=lazy_tags):
+            columns = parsed.pop('columns')
+            if columns is not None:
+                all_dataframes.append(columns_to_frame(columns))
+            file_status.append(parsed)
+        entry['records'] = sum(parsed['papers'] for parsed in file_status)
+    # 인코딩 판별은 파일별(작업 프로세스 포함) 측정값의 합계, parse 시간에 포함됨
+    profile.add('encoding_sniff', sum(parsed['encoding_detect_ms'] for parsed in file_status) / 1000,
+                records=len(file_status), nested=True)
+    del named_payloads
+    
+    with profile.stage('concat') as entry:
+        # 모든 데이터프레임 병합
+        merged_df = pd.concat(all_dataframes, ignore_index=True) if all_dataframes else None
+        entry['records'] = 0 if merged_df is None else len(merged_df)
+    
+    if merged_df is not None:
+        # 중복 제거 (UT → DOI → 제목+첫 저자+연도 우선순위 키, 원래 순서 유지)
+        with profile.stage('dedup', records=len(merged_df)):
+            merged_df, dedup_counts = deduplicate_records(merged_df)
+        
+        # 반복 태그 범주형 / 건수·연도 정수로 저장 형식 압축
+        with profile.stage('compact', records=len(merged_df)) as entry:
+            entry['bytes_before'] = frame_memory_bytes(merged_df)
+            merged_df = compact_wos_frame(merged_df)
+            entry['bytes_after'] = frame_memory_bytes(merged_df)
+        
+        # 유사 중복 탐지 (선택)
+        merged_df, near_duplicates = apply_near_duplicate_mode(
+            merged_df, dedup_counts, near_duplicate_mode, near_duplicate_threshold, profile
+        )
+        
+        duplicates_removed = sum(dedup_counts.values())
+        dedup_report = {'counts': dedup_counts, 'near_duplicates': near_duplicates}
+        
+        return merged_df, file_status, duplicates_removed, dedup_report
+    else:
+        return None, file_status, 0, {'counts': {}, 'near_duplicates': None}
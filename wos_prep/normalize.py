@@ -0,0 +1,117 @@
+"""텍스트 토큰 정규화 (소문자 → 악센트 제거 → 단어 토큰화 → nltk Snowball 어간 추출)
+
+정규화 결과는 필드별 문자열 컬럼 하나로 보관: 레코드의 어간 토큰을 공백으로 이어 앞뒤에 공백을 붙인 형태
+    'Live-Streaming users; E-commerce' → ' live stream user ; e commerc '
+    - 토큰 배열은 .str.split()으로 꺼낼 수 있고, ' 어간 ' 부분 문자열 검색이 곧 단어 경계 매칭
+      ('sem'은 'semantic'과, 'user'는 'username'과 일치하지 않음)
+    - DE/ID의 ';' 구분자는 토큰으로 남겨 키워드 구문이 서로 다른 키워드에 걸쳐 일치하지 않게 함
+계산: 소문자 변환/공백 분리는 Arrow 커널에서 일괄 처리하고, 구두점 분리/악센트 제거/어간 추출은 서로 다른
+단어마다 한 번만 (단어 → 토큰 메모는 프로세스 전체에서 공유)
+캐시: 같은 내용의 필드 컬럼은 다시 정규화하지 않음 (필드 내용 해시 기준, 최근 NORMALIZED_CACHE_ENTRIES개)
+"""
+import re
+import hashlib
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+NORMALIZED_FIELDS = ('TI', 'AB', 'DE', 'ID')
+NORMALIZED_CACHE_ENTRIES = 16
+WORD_MEMO_ENTRIES = 1000000
+TOKEN_SEPARATOR = ';'  # 토큰으로 남기는 구분자 (필드 사이에도 사용)
+
+_WORD_PATTERN = re.compile(rf"[^\W_]+|{re.escape(TOKEN_SEPARATOR)}")
+
+_stemmer = None
+_pieces = {}  # 공백 단위 원본 단어 → 정규화 토큰 문자열 (최대 WORD_MEMO_ENTRIES개, 넘으면 비움)
+_normalized_columns = {}  # (필드, 내용 해시) → 정규화 컬럼 (최근 NORMALIZED_CACHE_ENTRIES개)
+
+def _get_stemmer():
+    global _stemmer
+    if _stemmer is None:
+        try:
+            from nltk.stem.snowball import SnowballStemmer
+        except ImportError:
+            raise ImportError("토큰 정규화 매칭에는 nltk 설치가 필요합니다: pip install nltk")
+        _stemmer = SnowballStemmer('english')
+    return _stemmer
+
+def normalize_word(word):
+    """공백으로 나눈 소문자 단어 하나 → 정규화 토큰 문자열 ('live-streaming,' → 'live stream', 토큰이 없으면 '')"""
+    piece = _pieces.get(word)
+    if piece is None:
+        folded = word
+        if not word.isascii():
+            # NFKD로 분해한 뒤 결합 문자(악센트)만 제거: 'café' → 'cafe'
+            folded = ''.join(char for char in unicodedata.normalize('NFKD', word) if not unicodedata.combining(char))
+        stemmer = _get_stemmer()
+        piece = ' '.join(stemmer.stem(token) for token in _WORD_PATTERN.findall(folded))
+        if len(_pieces) >= WORD_MEMO_ENTRIES:
+            _pieces.clear()
+        _pieces[word] = piece
+    return piece
+
+def normalize_texts(texts):
+    """문자열 목록/Series → 정규화 문자열 Series (' 어간 어간 ... ', 빈 텍스트는 공백만)"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(texts, pd.Series):
+        values = texts.astype(str).where(texts.notna(), '').to_numpy(dtype=object)
+    else:
+        values = ['' if text is None else str(text) for text in texts]
+    # 소문자 변환/공백 분리는 Arrow 커널로, 구두점 분리/악센트 제거/어간 추출은 서로 다른 단어마다 한 번만
+    words = pc.ascii_split_whitespace(pc.utf8_lower(pa.array(values, type=pa.large_string())))
+    encoded = pc.dictionary_encode(pc.list_flatten(words))
+    pieces = pa.array([normalize_word(word) for word in encoded.dictionary.to_pylist()], type=pa.large_string())
+    # 토큰이 없는 단어('-', '(' 등)는 빼고 레코드별로 다시 묶음
+    indices = encoded.indices.to_numpy(zero_copy_only=False)
+    keep = pc.binary_length(pieces).to_numpy(zero_copy_only=False)[indices] > 0
+    parents = pc.list_parent_indices(words).to_numpy(zero_copy_only=False)[keep]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(parents, minlength=len(values)))])
+    records = pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), pieces.take(pa.array(indices[keep])))
+    space = pa.scalar(' ', type=pa.large_string())
+    padded = pc.binary_join_element_wise(space, pc.binary_join(records, space), space, pa.scalar('', type=pa.large_string()))
+    return pd.Series(padded, dtype=pd.ArrowDtype(pa.large_string())).astype('string[pyarrow]')
+
+def normalize_keywords(keywords):
+    """키워드 목록 → 정규화 키워드 목록 (레코드 텍스트와 같은 방식, 중복/빈 키워드 제외, 순서 유지)"""
+    normalized = normalize_texts(list(keywords))
+    return tuple(dict.fromkeys(keyword for keyword in normalized if keyword.strip()))
+
+def _field_hash(column):
+    """컬럼 내용 해시 (Arrow 버퍼를 그대로 해시, 범주형은 사전 포함)"""
+    import pyarrow as pa
+
+    values = pa.array(column)
+    hasher = hashlib.sha256()
+    for chunk in (values.chunks if isinstance(values, pa.ChunkedArray) else [values]):
+        arrays = [chunk, chunk.dictionary] if pa.types.is_dictionary(chunk.type) else [chunk]
+        for array in arrays:
+            hasher.update(repr((str(array.type), array.offset, len(array))).encode('utf-8'))
+            for buffer in array.buffers():
+                if buffer is not None:
+                    hasher.update(buffer)
+    return hasher.hexdigest()
+
+def normalized_text(df, field):
+    """필드 하나의 정규화 컬럼 (인덱스 = df.index, 필드가 없으면 모두 ' ')
+
+    같은 내용의 컬럼을 이미 정규화했으면 다시 계산하지 않음 (분류 기준을 바꿔 다시 분류하거나 이후 분석에서 재사용)
+    """
+    if field not in df.columns:
+        return pd.Series(' ', index=df.index, dtype='string[pyarrow]')
+    column = df[field]
+    key = (field, _field_hash(column))
+    normalized = _normalized_columns.pop(key, None)
+    if normalized is None:
+        normalized = normalize_texts(column)
+    _normalized_columns[key] = normalized
+    while len(_normalized_columns) > NORMALIZED_CACHE_ENTRIES:
+        _normalized_columns.pop(next(iter(_normalized_columns)))
+    return normalized.set_axis(df.index)
+
+def normalized_text_frame(df, fields=NORMALIZED_FIELDS):
+    """여러 필드의 정규화 컬럼 DataFrame (컬럼 = 필드 이름)"""
+    return pd.DataFrame({field: normalized_text(df, field) for field in fields}, index=df.index)
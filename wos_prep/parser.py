@@ -0,0 +1,488 @@
+"""WOS Plain Text 파일 인코딩 판별, 스트리밍 파서, 다중 파일 병렬 파싱"""
+import io
+import os
+import re
+import sys
+import time
+import codecs
+import collections
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# --- WOS 파일 인코딩 판별 함수 ---
+ENCODING_SNIFF_BYTES = 64 * 1024
+
+def detect_wos_encoding(file_bytes, sample_size=ENCODING_SNIFF_BYTES):
+    """BOM, 'FN ' 헤더, 앞부분 샘플만으로 인코딩 판별 (WOS 형식이 아니면 None)"""
+    sample = bytes(file_bytes[:sample_size])
+    
+    if sample.startswith(codecs.BOM_UTF8):
+        candidates = ['utf-8-sig']
+    elif sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        candidates = ['utf-16']
+    else:
+        candidates = ['utf-8', 'latin1']
+    
+    for encoding in candidates:
+        # 샘플 끝에서 잘린 멀티바이트 문자는 오류로 보지 않음
+        decoder = codecs.getincrementaldecoder(encoding)()
+        try:
+            sample_text = decoder.decode(sample, final=len(sample) == len(file_bytes))
+        except UnicodeDecodeError:
+            continue
+        
+        # WOS 원본 형식 검증 (FN으로 시작해야 함)
+        if sample_text.lstrip().startswith('FN '):
+            return encoding
+        return None
+    
+    return None
+
+# --- WOS Plain Text 스트리밍 파서 ---
+WOS_PARSER_VERSION = 3  # 파싱 결과(값/컬럼 형식)가 바뀌면 올림 (디스크 캐시 키에 포함)
+
+def _iter_text_lines(source, encoding='utf-8'):
+    """문자열/바이트/파일 객체에서 '\n' 기준으로 한 줄씩 읽어오는 제너레이터"""
+    if isinstance(source, str):
+        return io.StringIO(source, newline='\n')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.TextIOWrapper(io.BytesIO(source), encoding=encoding, newline='\n')
+    if isinstance(source, io.TextIOBase):
+        return source
+    if hasattr(source, 'read'):
+        # 바이너리 스트림 (업로드 파일, open(..., 'rb') 등)
+        return io.TextIOWrapper(source, encoding=encoding, newline='\n')
+    return iter(source)
+
+def iter_wos_records(source, encoding='utf-8'):
+    """WOS Plain Text 레코드를 한 건씩 dict로 생성하는 단일 패스 스트리밍 파서
+
+    연속 라인(CR, AU 등)은 리스트에 모아두었다가 레코드 종료 시 한 번만 '; '로 결합
+    """
+    record_parts = {}
+    current_parts = None
+    
+    for line in _iter_text_lines(source, encoding):
+        line = line.rstrip()
+        
+        if not line:
+            continue
+            
+        # 레코드 종료
+        if line == 'ER':
+            if record_parts:
+                yield {tag: '; '.join(parts) for tag, parts in record_parts.items()}
+                record_parts = {}
+            current_parts = None
+            continue
+            
+        # 헤더 라인 건너뛰기
+        if line.startswith(('FN ', 'VR ')):
+            continue
+        
+        # 기존 필드 연속
+        if line.startswith('   '):
+            if current_parts is not None:
+                continuation_value = line[3:].strip()
+                if continuation_value:
+                    current_parts.append(continuation_value)
+        
+        # 새 필드 시작
+        elif ' ' in line:
+            field_tag, field_value = line.split(' ', 1)
+            parts = [field_value.strip()]
+            record_parts[field_tag] = parts
+            current_parts = parts if field_tag else None
+    
+    # 마지막 레코드 처리 (ER 없이 끝난 경우)
+    if record_parts:
+        yield {tag: '; '.join(parts) for tag, parts in record_parts.items()}
+
+def wos_records_to_columns(records):
+    """레코드(dict) 이터러블을 태그별 컬럼 리스트로 변환 (없는 필드는 None)"""
+    columns = {}
+    record_count = 0
+    
+    for record in records:
+        for tag, value in record.items():
+            column = columns.get(tag)
+            if column is None:
+                column = columns[tag] = [None] * record_count
+            column.append(value)
+        record_count += 1
+        for column in columns.values():
+            if len(column) < record_count:
+                column.append(None)
+    
+    return columns, record_count
+
+def parse_wos_format(content, encoding='utf-8'):
+    """WOS Plain Text 형식(문자열, 바이트 또는 스트림)을 DataFrame으로 변환"""
+    columns, record_count = wos_records_to_columns(iter_wos_records(content, encoding))
+    
+    if record_count == 0:
+        return None
+        
+    # pandas는 DataFrame이 필요할 때만 로딩 (파서/워커 import 비용 최소화)
+    import pandas as pd
+    return pd.DataFrame(columns)
+
+# --- 바이트 구간 기반 지연 필드 파서 ---
+# 분류/중복 제거/진단에 쓰지 않는 긴 필드는 디코딩하지 않고 레코드별 원본 줄(UTF-8 바이트)과 그 안의 구간만 보관
+LAZY_FIELD_TAGS = ('CR', 'C1', 'C3', 'FU', 'FX', 'RP', 'EM', 'RI', 'OI')
+LAZY_RAW_COLUMN = '__raw'  # 레코드별 지연 필드 원본 줄 (UTF-8)
+LAZY_SPAN_PREFIX = '__lazy_'  # '__lazy_CR': __raw 안의 CR 구간 (시작 << 32 | 길이, 없으면 -1)
+LAZY_BYTE_ENCODINGS = ('utf-8', 'utf-8-sig', 'latin1')  # 줄/태그를 바이트 단위로 찾아도 안전한 인코딩
+
+# 연속 라인(앞 공백 3칸)이 아닌 줄 하나 + 뒤따르는 연속 라인 묶음: (태그, 구분 공백, 첫 줄 값, 연속 라인들)
+# 긴 지연 필드의 연속 라인은 파이썬 루프 없이 정규식 한 번으로 건너뜀
+_FIELD_BLOCK_RE = re.compile(rb'\n(?!   )([^ \n]*)( ?)([^\n]*)((?:\n   [^\n]*)*)')
+_VALIDATE_CHUNK_BYTES = 1024 * 1024
+# 원본 줄을 정리 없이 그대로 써도 되는지 바이트 단위로 판별 (보수적: 애매한 UTF-8 바이트는 줄 단위 정리로 처리)
+#   줄 끝 문자: 공백/제어 문자나 유니코드 공백의 마지막 바이트가 아님
+#   값 시작 문자: 공백/제어 문자나 유니코드 공백의 첫 바이트가 아님, 연속 라인: 공백 3칸 + 값 시작 문자
+_TIDY_LINE_END = rb'!-~\x8b-\x9e\xa1-\xa7\xaa-\xae\xb0-\xbf'
+_TIDY_LINE_START = rb'!-~\xc3-\xe0\xe4-\xf4'
+_UNTIDY_BLOCK_RE = re.compile(rb'\n(?:(?!   [' + _TIDY_LINE_START + rb'])|(?<=[^' + _TIDY_LINE_END + rb']\n))')
+_TIDY_CHAR_RE = re.compile(rb'[' + _TIDY_LINE_END + rb']')
+_TIDY_START_RE = re.compile(rb'[' + _TIDY_LINE_START + rb']')
+
+def _continuation_values(continuation):
+    """'\n   값' 연속 라인 묶음에서 내용 있는 값 목록"""
+    values = [line[3:].strip() for line in continuation.split('\n')[1:]]
+    return [value for value in values if value]
+
+def _field_block_lines(block):
+    """필드 원본 구간(첫 줄 + 이후 줄)에서 iter_wos_records가 쓰는 줄만 정리 (첫 줄, 내용 있는 연속 라인)"""
+    lines = block.split('\n')
+    kept = [lines[0].rstrip()]
+    for line in lines[1:]:
+        line = line.rstrip()
+        if line.startswith('   ') and line[3:].strip():
+            kept.append(line)
+    return kept
+
+def _field_block_value(block):
+    """필드 원본 구간을 iter_wos_records와 같은 값으로 변환 (연속 라인은 '; '로 결합)"""
+    lines = _field_block_lines(block)
+    return '; '.join([lines[0].split(' ', 1)[1].strip()] + [line[3:].strip() for line in lines[1:]])
+
+def format_wos_field_lines(tag, value, multi_line=False):
+    """필드 값(연속 라인은 '; '로 결합된 문자열)을 내보내기용 WOS 필드 줄로 변환 (빈 값, 'nan'이면 None)
+
+    multi_line이면 ';'로 나눈 항목을 한 줄씩 연속 라인으로, 아니면 값 전체를 한 줄로 기록
+    (export._scimat_field_lines가 컬럼 단위로 적용하는 규칙과 같음, benchmarks/check_lazy_export.py로 확인)
+    """
+    value = value.strip()
+    if not value or value.lower() == 'nan':
+        return None
+    if not multi_line:
+        return f"{tag} {value}"
+    items = [item.strip() for item in value.split(';') if item.strip()]
+    return f"{tag} " + "\n   ".join(items) if items else None
+
+def iter_wos_record_spans(file_bytes, encoding='utf-8', lazy_tags=LAZY_FIELD_TAGS):
+    """iter_wos_records와 같은 레코드를 생성하되 lazy_tags 필드는 디코딩하지 않고 원본 구간으로 기록
+
+    각 레코드 dict: 즉시 필드는 문자열, 지연 필드는 '__lazy_<태그>' → __raw 안의 구간, '__raw' → 원본 구간 바이트
+    (encoding은 LAZY_BYTE_ENCODINGS 중 하나, latin1 원본은 UTF-8로 변환하여 보관)
+    """
+    file_bytes = bytes(file_bytes)
+    transcode = encoding == 'latin1'
+    if not transcode:
+        # 전체 디코딩 경로와 같이 잘못된 UTF-8 바이트가 있으면 UnicodeDecodeError (결과 문자열은 보관하지 않음)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for offset in range(0, len(file_bytes), _VALIDATE_CHUNK_BYTES):
+            decoder.decode(file_bytes[offset:offset + _VALIDATE_CHUNK_BYTES])
+        decoder.decode(b'', final=True)
+    lazy = {tag.encode('ascii') for tag in lazy_tags}
+    start_position = 3 if file_bytes[:3] == codecs.BOM_UTF8 else 0
+    
+    record_parts = {}  # 필드 순서 유지: 즉시 필드는 값, 지연 필드는 __raw 안의 구간
+    raw = bytearray()
+    current_key = None  # 연속 라인을 이어 붙일 필드 (태그 없는 줄 뒤에는 None)
+    
+    # 각 블록이 앞의 '\n'부터 시작하도록 줄바꿈 하나를 앞에 붙여 검색
+    for field_tag, separator, value, continuation in _FIELD_BLOCK_RE.findall(b'\n' + file_bytes[start_position:]):
+        # 레코드 종료
+        if field_tag.rstrip() == b'ER' and not value.strip():
+            if record_parts:
+                if raw:
+                    record_parts[LAZY_RAW_COLUMN] = bytes(raw)
+                yield record_parts
+                record_parts, raw = {}, bytearray()
+            current_key = None
+            continue
+        
+        # 빈 줄, 헤더, 공백 없는 줄: 건너뛰되 뒤따르는 연속 라인은 직전 필드에 이어 붙임 (iter_wos_records와 동일)
+        if not separator or not value.strip() or field_tag in (b'FN', b'VR'):
+            if current_key is None or not continuation:
+                continue
+            if current_key.startswith(LAZY_SPAN_PREFIX):
+                # 직전 지연 필드는 항상 __raw 끝에 있으므로 구간 길이만 늘림 (건너뛴 줄은 디코딩 시 제외됨)
+                block = b'\n' + field_tag + separator + value + continuation
+                if transcode:
+                    block = block.decode('latin1').encode('utf-8')
+                record_parts[current_key] += len(block)
+                raw += block
+            else:
+                extra = _continuation_values(continuation.decode(encoding))
+                if extra:
+                    record_parts[current_key] = '; '.join([record_parts[current_key]] + extra)
+            continue
+        
+        # 새 필드 시작
+        if not field_tag:
+            # 태그 없는 줄: 값만 기록하고 뒤따르는 연속 라인은 무시
+            record_parts[''] = value.decode(encoding).strip()
+            current_key = None
+        elif field_tag in lazy:
+            current_key = LAZY_SPAN_PREFIX + field_tag.decode('ascii')
+            block = field_tag + separator + value + continuation
+            if transcode:
+                block = block.decode('latin1').encode('utf-8')
+            record_parts[current_key] = (len(raw) << 32) | len(block)
+            raw += block
+        else:
+            current_key = field_tag.decode(encoding)
+            value = value.decode(encoding).strip()
+            if continuation:
+                value = '; '.join([value] + _continuation_values(continuation.decode(encoding)))
+            record_parts[current_key] = value
+    
+    # 마지막 레코드 처리 (ER 없이 끝난 경우)
+    if record_parts:
+        if raw:
+            record_parts[LAZY_RAW_COLUMN] = bytes(raw)
+        yield record_parts
+
+def _is_verbatim_block(block, multi_line):
+    """원본 구간이 즉시 파싱 값을 format_wos_field_lines로 변환한 줄과 바이트 단위로 같은지 여부
+
+    한 줄 필드는 연속 라인이 없어야 하고('; '로 결합되므로), 여러 줄 필드는 ';'가 없어야 함 (항목 분리 기준)
+    """
+    value_start = block.find(b' ') + 1
+    if not (0 < value_start < len(block)) or not _TIDY_START_RE.match(block, value_start):
+        return False
+    if not _TIDY_CHAR_RE.match(block, len(block) - 1) or _UNTIDY_BLOCK_RE.search(block):
+        return False
+    if (b';' if multi_line else b'\n') in block:
+        return False
+    return len(block) - value_start != 3 or block[value_start:].lower() != b'nan'
+
+def decode_lazy_field(raw, span, verbatim=False, multi_line=False):
+    """__raw 구간의 필드를 즉시 파싱한 값과 같은 문자열로 변환 (없으면 None)
+
+    verbatim이면 즉시 파싱 값에 format_wos_field_lines를 적용한 것과 같은 내보내기용 WOS 줄
+    (빈 값/'nan'이면 None, multi_line은 ';' 항목을 연속 라인으로 나누는 필드인지)
+    """
+    if span < 0:
+        return None
+    start = span >> 32
+    block = raw[start:start + (span & 0xFFFFFFFF)]
+    if verbatim:
+        if _is_verbatim_block(block, multi_line):
+            # 대부분의 필드는 원본 줄이 이미 내보내기 형식과 같으므로 그대로 사용
+            return block.decode('utf-8')
+        block = block.decode('utf-8')
+        return format_wos_field_lines(block.split(' ', 1)[0], _field_block_value(block), multi_line)
+    block = block.decode('utf-8')
+    return _field_block_value(block)
+
+def columns_to_frame(columns):
+    """파싱 결과 컬럼 dict를 DataFrame으로 변환 (지연 필드 구간은 정수, 원본 줄은 Arrow 바이너리 컬럼)"""
+    import pandas as pd
+    
+    if LAZY_RAW_COLUMN in columns:
+        columns = dict(columns)
+        for key in columns:
+            if key.startswith(LAZY_SPAN_PREFIX):
+                columns[key] = pd.array([-1 if span is None else span for span in columns[key]], dtype='int64')
+        try:
+            import pyarrow as pa
+            columns[LAZY_RAW_COLUMN] = pd.array(columns[LAZY_RAW_COLUMN], dtype=pd.ArrowDtype(pa.large_binary()))
+        except ImportError:
+            pass
+    return pd.DataFrame(columns)
+
+# --- 파일 단위 파싱 (프로세스 풀 작업 단위) ---
+def _is_stream_source(file_bytes):
+    """바이트 대신 open()으로 스트림을 여는 파일 원본(sources.py)인지"""
+    return callable(getattr(file_bytes, 'open', None))
+
+def _read_sniff_sample(file_bytes, sample_size=ENCODING_SNIFF_BYTES):
+    """인코딩 판별용 앞부분 (스트림 원본은 sample_size + 1바이트만 읽어 파일이 샘플보다 긴지 함께 전달)"""
+    if not _is_stream_source(file_bytes):
+        return file_bytes
+    with file_bytes.open() as stream:
+        return stream.read(sample_size + 1)
+
+def _parse_columns(file_bytes, encoding, lazy_tags):
+    """인코딩이 정해진 파일을 컬럼 형태로 파싱 (lazy_tags가 있으면 지연 필드 파서)
+
+    스트림 원본은 즉시 파싱이면 청크 단위로 읽으며 파싱하고, 지연 필드 파서는 파일 하나만 메모리에 읽음
+    """
+    if _is_stream_source(file_bytes):
+        with file_bytes.open() as stream:
+            if not lazy_tags:
+                return wos_records_to_columns(iter_wos_records(stream, encoding))
+            file_bytes = stream.read()
+    if not lazy_tags:
+        return wos_records_to_columns(iter_wos_records(file_bytes, encoding))
+    if encoding not in LAZY_BYTE_ENCODINGS:
+        # UTF-16 등은 UTF-8로 한 번 변환 (같은 병합 결과 안에서 지연 필드 컬럼 형식을 통일)
+        file_bytes, encoding = bytes(file_bytes).decode(encoding).encode('utf-8'), 'utf-8'
+    return wos_records_to_columns(iter_wos_record_spans(file_bytes, encoding, lazy_tags))
+
+def _fallback_source(file_bytes, encoding):
+    """판별한 인코딩으로 디코딩할 수 없는 바이트가 샘플 이후에 있을 때 다시 파싱할 (원본, 인코딩, 안내 문구)
+
+    - UTF-8 BOM 파일: BOM을 떼고 잘못된 바이트만 U+FFFD로 바꾼 UTF-8
+      (latin1로 읽으면 BOM이 'ï»¿FN' 태그가 되고 나머지 UTF-8 문자도 모두 깨짐)
+    - 그 외: latin1 (모든 바이트를 디코딩할 수 있음)
+    """
+    if encoding != 'utf-8-sig':
+        return file_bytes, 'latin1', f'{encoding}로 읽을 수 없는 바이트가 있어 latin1로 다시 읽음'
+    if _is_stream_source(file_bytes):
+        with file_bytes.open() as stream:
+            file_bytes = stream.read()
+    text = bytes(file_bytes).decode('utf-8-sig', errors='replace')
+    return text.encode('utf-8'), 'utf-8', '잘못된 UTF-8 바이트를 U+FFFD(�)로 바꿔 읽음'
+
+def parse_wos_file(filename, file_bytes, lazy_tags=None):
+    """파일 하나를 인코딩 판별 + 파싱하여 처리 상태와 컬럼 형태 결과를 반환
+
+    file_bytes: 파일 바이트 또는 open()으로 바이너리 스트림을 여는 파일 원본 (sources.LocalWosFile 등, 한꺼번에 읽지 않음)
+    lazy_tags: 디코딩을 미루고 원본 줄 구간만 보관할 태그 (None이면 모든 필드를 문자열로 파싱)
+    """
+    try:
+        # 인코딩 판별 (BOM + 'FN ' 헤더 + 앞부분 샘플, 전체 디코딩 없음)
+        detect_started = time.perf_counter()
+        encoding_used = detect_wos_encoding(_read_sniff_sample(file_bytes))
+        detect_ms = (time.perf_counter() - detect_started) * 1000
+        
+        columns, record_count, fallback = None, 0, None
+        if encoding_used is not None:
+            try:
+                # 판별된 인코딩으로 한 번만 디코딩하며 파싱
+                columns, record_count = _parse_columns(file_bytes, encoding_used, lazy_tags)
+            except UnicodeDecodeError:
+                # 샘플 이후 구간에 디코딩할 수 없는 바이트가 있는 경우에만 재시도
+                file_bytes, fallback_encoding, fallback = _fallback_source(file_bytes, encoding_used)
+                columns, record_count = _parse_columns(file_bytes, fallback_encoding, lazy_tags)
+                if fallback_encoding == 'latin1':
+                    encoding_used = 'latin1'
+        
+        if record_count > 0:
+            return {
+                'filename': filename,
+                'status': 'SUCCESS',
+                'papers': record_count,
+                'encoding': encoding_used,
+                'encoding_detect_ms': detect_ms,
+                'encoding_fallback': fallback,
+                'message': f'✅ {record_count}편 논문 로딩 성공' + (f' (⚠️ {fallback})' if fallback else ''),
+                'columns': columns
+            }
+        return {
+            'filename': filename,
+            'status': 'ERROR',
+            'papers': 0,
+            'encoding': 'N/A',
+            'encoding_detect_ms': detect_ms,
+            'message': '❌ WOS Plain Text 형식이 아님',
+            'columns': None
+        }
+        
+    except Exception as e:
+        return {
+            'filename': filename,
+            'status': 'ERROR',
+            'papers': 0,
+            'encoding': 'N/A',
+            'encoding_detect_ms': 0.0,
+            'message': f'❌ 파일 처리 오류: {str(e)[:50]}',
+            'columns': None
+        }
+
+# --- 다중 파일 병렬 파싱 ---
+# 파일 수/총 크기가 작으면 프로세스 풀 기동 비용이 더 크므로 순차 처리
+PARALLEL_MIN_FILES = 4
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+PARALLEL_PENDING_PER_WORKER = 2
+
+# Streamlit은 스크립트를 __main__으로 실행하므로 spawn/forkserver 방식에서는
+# 작업 프로세스가 app.py 전체를 다시 실행하게 됨 -> fork를 쓸 수 있는 환경에서만 병렬 처리
+POOL_START_METHOD = 'fork' if (
+    'fork' in multiprocessing.get_all_start_methods() and sys.platform != 'darwin'
+) else None
+
+_process_pool = None
+
+def _get_process_pool():
+    """파싱용 프로세스 풀 (스크립트 재실행 간 재사용)"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context(POOL_START_METHOD)
+        )
+    return _process_pool
+
+def _shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+def should_parse_in_parallel(file_sizes):
+    """파일 크기 목록 기준 병렬 파싱 여부 판단"""
+    return (
+        POOL_START_METHOD is not None
+        and (os.cpu_count() or 1) > 1
+        and len(file_sizes) >= PARALLEL_MIN_FILES
+        and sum(file_sizes) >= PARALLEL_MIN_BYTES
+    )
+
+def parse_wos_files(named_payloads, parallel=None, lazy_tags=None):
+    """(파일명, 바이트 또는 파일 원본) 목록을 파싱하여 입력 순서대로 파일별 결과 반환 (lazy_tags: parse_wos_file 참고)"""
+    return list(iter_parse_wos_files(named_payloads, parallel, lazy_tags))
+
+def iter_parse_wos_files(named_payloads, parallel=None, lazy_tags=None):
+    """parse_wos_files와 같은 결과를 파일 하나씩 입력 순서대로 생성 (받는 쪽이 파일별 결과를 바로 정리할 수 있음)
+
+    파일 원본(sources.py)은 작업 프로세스에 경로만 넘기므로 부모 프로세스가 파일 내용을 들고 있지 않음
+    """
+    filenames = [name for name, _ in named_payloads]
+    payloads = [file_bytes for _, file_bytes in named_payloads]
+    
+    if parallel is None:
+        parallel = should_parse_in_parallel([
+            file_bytes.size if _is_stream_source(file_bytes) else len(file_bytes) for file_bytes in payloads
+        ])
+    
+    done = 0
+    if parallel and POOL_START_METHOD is not None:
+        # 받는 쪽이 느려도 끝난 결과가 쌓이지 않도록 작업자 수의 PARALLEL_PENDING_PER_WORKER배까지만 미리 제출
+        window = PARALLEL_PENDING_PER_WORKER * (os.cpu_count() or 1)
+        pending = collections.deque()
+        try:
+            pool = _get_process_pool()
+            for filename, file_bytes in zip(filenames, payloads):
+                pending.append(pool.submit(parse_wos_file, filename, file_bytes, lazy_tags))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+                    done += 1
+            while pending:
+                yield pending.popleft().result()
+                done += 1
+            return
+        except (BrokenProcessPool, OSError):
+            # 작업 프로세스가 비정상 종료된 경우 풀을 폐기하고 남은 파일은 순차 처리로 대체
+            for future in pending:
+                future.cancel()
+            _shutdown_process_pool()
+    
+    for filename, file_bytes in zip(filenames[done:], payloads[done:]):
+        yield parse_wos_file(filename, file_bytes, lazy_tags)
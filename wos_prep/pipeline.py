@@ -0,0 +1,54 @@
+"""파일 병합 → 중복 제거 → 논문 분류 파이프라인 (Streamlit UI와 배치 CLI 공용)"""
+import hashlib
+
+import numpy as np
+
+from wos_prep.merge import load_and_merge_wos_files, NEAR_DUP_DEFAULT_THRESHOLD
+from wos_prep.classify import classify_articles
+from wos_prep.views import RecordView
+from wos_prep.sources import compute_source_hash, is_stream_source
+from wos_prep.profiling import PipelineProfile
+
+# --- 캐시 키 ---
+def compute_upload_key(uploaded_files):
+    """업로드 파일들의 이름/순서/바이트 내용 기반 캐시 키 생성"""
+    hasher = hashlib.sha256()
+    for uploaded_file in uploaded_files:
+        hasher.update(uploaded_file.name.encode('utf-8'))
+        hasher.update(b'\0')
+        if is_stream_source(uploaded_file):
+            hasher.update(bytes.fromhex(compute_source_hash(uploaded_file)))
+        else:
+            hasher.update(hashlib.sha256(uploaded_file.getvalue()).digest())
+    return hasher.hexdigest()
+
+# --- 파이프라인 실행 ---
+def run_pipeline(uploaded_files, near_duplicate_mode='off', near_duplicate_threshold=NEAR_DUP_DEFAULT_THRESHOLD,
+                 profile=None, lazy_tags=None, classifier=classify_articles):
+    """파일 병합 + 중복 제거 + 논문 분류 (merged_df에 'Classification' 컬럼 추가)
+
+    profile: 단계별 계측을 기록할 PipelineProfile (선택)
+    lazy_tags: 원본 구간으로만 보관할 태그 (load_and_merge_wos_files 참고)
+    classifier: DataFrame → 분류 라벨 Series 함수 (기본: 기본 프로필, classify.profile_classifier 참고)
+
+    Returns:
+        (병합 DataFrame 또는 None, 파일별 상태, 제거된 중복 수, 중복 제거 리포트)
+    """
+    if profile is None:
+        profile = PipelineProfile()
+    merged_df, file_status, duplicates_removed, dedup_report = load_and_merge_wos_files(
+        uploaded_files, near_duplicate_mode, near_duplicate_threshold, profile, lazy_tags
+    )
+    if merged_df is not None:
+        with profile.stage('classify', records=len(merged_df)):
+            merged_df['Classification'] = classifier(merged_df).astype('category')
+    return merged_df, file_status, duplicates_removed, dedup_report
+
+def split_classified(merged_df):
+    """분류 결과로 분석 대상 / 배제 논문을 나눈 뷰 (merged_df 하나를 공유하며 복사하지 않음)
+
+    Returns:
+        (분석 대상 RecordView (Classification 포함), 배제 RecordView)
+    """
+    excluded_mask = merged_df['Classification'].str.startswith('Exclude', na=False).to_numpy(dtype=bool)
+    return RecordView(merged_df, np.flatnonzero(~excluded_mask)), RecordView(merged_df, np.flatnonzero(excluded_mask))
@@ -0,0 +1,162 @@
+"""파이프라인 단계별 실행 시간 / 레코드 수 / 메모리 변화 계측
+
+메모리
+    rss_delta_mb   단계 전후 RSS 변화 (/proc/self/status, Linux)
+    peak_delta_mb  단계 중 tracemalloc 최대 할당량 - 단계 시작 시 할당량 (Python/NumPy 할당, Arrow 버퍼 제외)
+                   tracemalloc이 켜져 있을 때만 측정 (start_memory_tracing, 꺼져 있으면 None)
+                   할당마다 추적하므로 처리 시간이 몇 배 늘어남 → 앱은 WOS_PREP_TRACE_MEMORY=1, CLI는 --trace-memory로만 켬
+tracemalloc 최고치는 프로세스 전체 값이라, 최고치를 초기화할 때마다 진행 중인 모든 단계에 그때까지의 최고치를
+먼저 반영함 (동시에 실행되는 세션/작업 스레드나 중첩 단계가 서로의 최고치를 지우지 않음, 다른 스레드의 할당은 포함됨)
+"""
+import os
+import re
+import time
+import json
+import threading
+import tracemalloc
+import contextlib
+from datetime import datetime, timezone
+
+# --- 프로세스 메모리 측정 (Linux /proc 기반, 그 외 환경에서는 None) ---
+def read_process_memory_mb(field='VmRSS'):
+    """/proc/self/status의 메모리 항목(MB): VmRSS(현재 RSS), VmHWM(최대 RSS)"""
+    try:
+        with open('/proc/self/status') as f:
+            match = re.search(rf'^{field}:\s+(\d+) kB', f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(match.group(1)) / 1024 if match else None
+
+def reset_peak_memory():
+    """최대 RSS(VmHWM)를 현재 RSS로 초기화 (성공 여부 반환)
+
+    프로세스 전체 최고치를 지우므로 단일 프로세스 벤치마크(benchmarks/run_benchmarks.py) 전용
+    (앱/CLI 단계 계측은 tracemalloc 기반 PipelineProfile.stage 사용)
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+# --- 단계별 최대 할당량 (tracemalloc) ---
+TRACE_MEMORY_ENV = 'WOS_PREP_TRACE_MEMORY'
+_peak_lock = threading.Lock()
+_active_peaks = {}  # 진행 중인 단계 id → 단계 시작 이후 관측한 최고 할당량 (바이트)
+
+def start_memory_tracing():
+    """단계별 최대 할당량 측정을 위해 tracemalloc 시작 (이미 켜져 있으면 그대로)"""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def memory_tracing_requested():
+    """WOS_PREP_TRACE_MEMORY가 켜져 있는지 (1/true/yes)"""
+    return os.environ.get(TRACE_MEMORY_ENV, '').strip().lower() in ('1', 'true', 'yes')
+
+def _fold_peak():
+    # 현재 최고치를 진행 중인 모든 단계에 반영 (_peak_lock 안에서 호출)
+    peak = tracemalloc.get_traced_memory()[1]
+    for token, seen in _active_peaks.items():
+        if peak > seen:
+            _active_peaks[token] = peak
+
+def _begin_peak(token):
+    """단계 시작: 진행 중인 단계에 최고치를 반영한 뒤 최고치 초기화 (시작 시 할당량 반환, 측정 불가면 None)"""
+    if not tracemalloc.is_tracing():
+        return None
+    with _peak_lock:
+        _fold_peak()
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        _active_peaks[token] = current
+    return current
+
+def _end_peak(token):
+    """단계 종료: 단계 중 최고 할당량 (바이트, 측정 불가면 None)"""
+    with _peak_lock:
+        if token not in _active_peaks:
+            return None
+        if tracemalloc.is_tracing():
+            _fold_peak()
+        return _active_peaks.pop(token)
+
+# --- 단계 시작 알림 (백그라운드 작업의 단계 진행 표시용, 스레드별) ---
+_stage_listeners = threading.local()
+
+@contextlib.contextmanager
+def stage_listener(callback):
+    """with 블록 안에서 현재 스레드의 계측 단계가 시작될 때마다 callback(단계 이름) 호출"""
+    previous = getattr(_stage_listeners, 'callback', None)
+    _stage_listeners.callback = callback
+    try:
+        yield
+    finally:
+        _stage_listeners.callback = previous
+
+# --- 단계별 계측 기록 ---
+class PipelineProfile:
+    """단계별 계측 결과 목록 (stage, seconds, records, rss_delta_mb, peak_delta_mb, ...)"""
+
+    def __init__(self):
+        self.stages = []
+        self.created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+    @contextlib.contextmanager
+    def stage(self, name, records=None, **details):
+        """with 블록 실행 시간과 메모리 변화를 기록 (yield된 dict에 records 등을 나중에 채울 수 있음)"""
+        entry = {'stage': name, 'records': records, **details}
+        listener = getattr(_stage_listeners, 'callback', None)
+        if listener is not None:
+            listener(name)
+        token = object()
+        traced_before = _begin_peak(token)
+        rss_before = read_process_memory_mb('VmRSS')
+        started = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - started
+            rss_after = read_process_memory_mb('VmRSS')
+            peak = _end_peak(token)
+            entry['rss_delta_mb'] = None if rss_before is None or rss_after is None else rss_after - rss_before
+            entry['peak_delta_mb'] = (
+                None if traced_before is None or peak is None else max(peak - traced_before, 0) / 1024 / 1024
+            )
+            self.stages.append(entry)
+
+    def add(self, name, seconds, records=None, **details):
+        """with 블록으로 감싸기 어려운 구간이나 다른 곳(작업 프로세스 등)에서 측정한 시간을 단계로 추가 (메모리 정보 없음)"""
+        self.stages.append({
+            'stage': name, 'records': records, 'seconds': seconds,
+            'rss_delta_mb': None, 'peak_delta_mb': None, **details
+        })
+
+    def extend(self, other):
+        """다른 계측 결과(PipelineProfile 또는 단계 dict 목록)의 단계를 이어 붙임"""
+        self.stages.extend(dict(entry) for entry in getattr(other, 'stages', other))
+
+    @property
+    def total_seconds(self):
+        return sum(entry['seconds'] for entry in self.stages if not entry.get('nested'))
+
+    def to_records(self):
+        """표/JSON 출력용 단계 목록 (소수점 정리)"""
+        rounded = []
+        for entry in self.stages:
+            row = dict(entry)
+            row['seconds'] = round(row['seconds'], 4)
+            for key in ('rss_delta_mb', 'peak_delta_mb'):
+                if row.get(key) is not None:
+                    row[key] = round(row[key], 1)
+            rounded.append(row)
+        return rounded
+
+    def to_json(self, **metadata):
+        """계측 결과를 JSON 문자열로 직렬화 (metadata는 최상위 필드로 추가)"""
+        return json.dumps({
+            'created_at': self.created_at,
+            'total_seconds': round(self.total_seconds, 4),
+            **metadata,
+            'stages': self.to_records(),
+        }, ensure_ascii=False, indent=2, default=str)
@@ -0,0 +1,61 @@
+"""분류 규칙 프로필 설정 파일 (TOML) 로딩
+
+설정: 환경 변수 WOS_PREP_RULES_FILE 또는 CLI --rules (형식은 rule_profiles.example.toml 참고)
+    [profiles.<이름>]                    title, matching ('substring' | 'token'), core_keywords, irrelevant_domain_keywords, non_academic_types,
+                                         non_interactive_keywords, methodology_keywords (빈 목록이면 해당 단계 생략)
+    [profiles.<이름>.dimension_keywords] 차원 → 키워드 목록 (둘 이상의 차원에 해당하면 다학제)
+    [profiles.<이름>.labels]             차원 / Multidisciplinary / etc → 포함 라벨
+    [profiles.<이름>.exclude_labels]     규칙 키 → 배제 라벨 ('Exclude'로 시작)
+기본 프로필(live_streaming)은 항상 첫 번째로 포함되며, 설정 파일에 같은 이름이 있으면 설정 파일의 규칙을 사용
+"""
+import os
+
+from wos_prep.classify import BUILTIN_RULE_PROFILE, DEFAULT_PROFILE_NAME, make_rule_profile
+
+RULES_FILE_ENV = 'WOS_PREP_RULES_FILE'
+
+_loaded_profiles = {}  # (경로, 크기, 수정 시각) → 프로필 dict (설정 파일이 바뀌면 다시 읽음)
+
+def _load_toml(path):
+    try:
+        import tomllib
+    except ImportError:  # Python 3.10 이하
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("Python 3.10 이하에서 규칙 설정 파일을 읽으려면 tomli 설치가 필요합니다: pip install tomli")
+    with open(path, 'rb') as f:
+        return tomllib.load(f)
+
+def get_rules_file():
+    """WOS_PREP_RULES_FILE로 지정된 규칙 설정 파일 (지정하지 않았으면 None)"""
+    return os.environ.get(RULES_FILE_ENV) or None
+
+def load_rule_profiles(path=None):
+    """기본 프로필 + 설정 파일의 프로필 {이름: 프로필} (path가 없으면 WOS_PREP_RULES_FILE, 그것도 없으면 기본 프로필만)
+
+    Raises:
+        ValueError: 설정 파일 형식 오류 (프로필 이름과 원인 포함)
+    """
+    path = path or get_rules_file()
+    if not path:
+        return {DEFAULT_PROFILE_NAME: BUILTIN_RULE_PROFILE}
+    stat = os.stat(path)
+    memo_key = (os.path.realpath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _loaded_profiles:
+        profiles = {DEFAULT_PROFILE_NAME: BUILTIN_RULE_PROFILE}
+        config_profiles = _load_toml(path).get('profiles')
+        if not isinstance(config_profiles, dict) or not config_profiles:
+            raise ValueError(f"{path}: [profiles.<이름>] 항목이 없습니다")
+        for name, config in config_profiles.items():
+            try:
+                rules = {key: value for key, value in config.items() if key not in ('title', 'labels', 'exclude_labels', 'matching')}
+                profiles[name] = make_rule_profile(
+                    rules, config.get('labels'), config.get('exclude_labels'), config.get('title', name),
+                    config.get('matching', 'substring')
+                )
+            except (ValueError, AttributeError, TypeError) as e:
+                raise ValueError(f"{path}: 프로필 '{name}' 형식 오류 - {e}") from e
+        _loaded_profiles.clear()
+        _loaded_profiles[memo_key] = profiles
+    return dict(_loaded_profiles[memo_key])
@@ -0,0 +1,348 @@
+"""병합 결과 전문 검색 (TI/AB/DE/ID/SO/AU 역색인 + WOS 고급 검색 형식 질의)
+
+역색인: 필드별 토큰 → 그 토큰이 있는 레코드 위치 배열 (정렬, 병합 결과마다 한 번만 생성)
+질의: TS= TI= AB= AK=(DE) KP=(ID) SO= AU= PY=, AND / OR / NOT, 괄호, "구문", 와일드카드 (* ? $)
+    - 연산자 우선순위는 WOS와 같이 NOT > AND > OR, 연산자 없이 이어 쓴 검색어는 AND
+    - 필드 없이 쓴 검색어는 TS (주제: 제목 / 초록 / 저자 키워드 / Keywords Plus)
+    - 검색어는 포스팅 목록의 교집합/합집합/차집합으로 계산하고, 구문만 후보 레코드 원문에서 단어 순서를 확인
+    - PY=2020, PY=2018-2022 (발행 연도 범위)
+예: TS=("live stream*" OR livestream*) AND PY=2018-2024 NOT DT=... 처럼 WOS 검색식을 그대로 붙여 넣어 확인
+"""
+import re
+import bisect
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.views import RecordView
+
+SEARCH_FIELDS = ('TI', 'AB', 'DE', 'ID', 'SO', 'AU')
+SEARCH_FIELD_ALIASES = {
+    'TS': ('TI', 'AB', 'DE', 'ID'),  # 주제 (Topic)
+    'TI': ('TI',),
+    'AB': ('AB',),
+    'AK': ('DE',), 'DE': ('DE',),  # 저자 키워드
+    'KP': ('ID',), 'ID': ('ID',),  # Keywords Plus
+    'SO': ('SO',),
+    'AU': ('AU',),
+}
+SEARCH_YEAR_FIELD = 'PY'
+SEARCH_QUERY_CACHE_ENTRIES = 64
+SEARCH_RESULT_COLUMNS = ('UT', 'PY', 'TI', 'AU', 'SO', 'DT', 'Classification')  # 화면 결과 표 컬럼
+
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+_QUERY_SPLIT_PATTERN = re.compile(r'[^\w*?$]+|_')
+_QUERY_TOKEN_PATTERN = re.compile(r'\s*(?:(?P<phrase>"[^"]*")|(?P<paren>[()])|(?P<field>[A-Za-z]{2})\s*=|(?P<word>[^\s()"]+))')
+_QUERY_OPERATORS = ('AND', 'OR', 'NOT')
+_WILDCARD_CHARS = '*?$'
+
+class WosQueryError(ValueError):
+    """검색식을 해석할 수 없을 때 발생 (메시지는 화면에 그대로 표시)"""
+
+def tokenize_text(text):
+    """검색용 토큰 (소문자, 문자/숫자 연속 구간)"""
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+# --- 역색인 ---
+class _FieldIndex:
+    """필드 하나의 역색인: 정렬된 토큰 목록 + 토큰별 레코드 위치 (CSR: offsets, rows)"""
+
+    def __init__(self, values):
+        # 범주형은 범주별로, 그 외는 서로 다른 값별로 한 번만 토큰화하여 레코드에 펼침
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy()
+            texts = values.cat.categories
+        else:
+            codes, texts = pd.factorize(values)
+        term_ids, text_terms, text_counts = {}, [], []
+        findall = _TOKEN_PATTERN.findall
+        for text in texts:
+            tokens = set(findall(str(text).lower()))
+            text_terms.extend([term_ids.setdefault(token, len(term_ids)) for token in tokens])
+            text_counts.append(len(tokens))
+        text_offsets = np.concatenate(([0], np.cumsum(text_counts, dtype=np.int64)))
+        text_terms = np.asarray(text_terms, dtype=np.int32)
+        del texts, text_counts
+
+        # 레코드별 토큰: 레코드 값 번호(codes)의 토큰 구간을 레코드 순서대로 펼침 (값이 없는 레코드 제외)
+        records = np.flatnonzero(codes >= 0)
+        counts = np.diff(text_offsets)[codes[records]]
+        rows = np.repeat(records.astype(np.int32), counts)
+        starts = np.repeat(text_offsets[codes[records]] - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        terms = text_terms[starts + np.arange(len(rows))] if len(rows) else np.empty(0, dtype=np.int32)
+        del starts, text_terms
+
+        # 토큰 번호를 알파벳 순서로 바꾼 뒤 토큰별로 모음 (안정 정렬이라 토큰별 레코드 위치는 오름차순 유지)
+        vocabulary = sorted(term_ids, key=term_ids.get)
+        alphabetical = np.argsort(np.array(vocabulary, dtype=object)) if vocabulary else np.empty(0, dtype=np.intp)
+        rank = np.empty(len(vocabulary), dtype=np.int32)
+        rank[alphabetical] = np.arange(len(vocabulary), dtype=np.int32)
+        terms = rank[terms]
+        order = np.argsort(terms, kind='stable')
+        self.rows = rows[order]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(terms, minlength=len(vocabulary))))).astype(np.int64)
+        self.terms = [vocabulary[position] for position in alphabetical]
+        self._term_positions = {term: position for position, term in enumerate(self.terms)}
+
+    def postings(self, term):
+        position = self._term_positions.get(term)
+        if position is None:
+            return np.empty(0, dtype=np.int32)
+        return self.rows[self.offsets[position]:self.offsets[position + 1]]
+
+    def matching_terms(self, pattern):
+        """와일드카드 패턴(* ? $)에 맞는 토큰 위치 범위 (앞부분 글자로 범위를 좁힌 뒤 패턴 확인)"""
+        prefix = re.split(r'[*?$]', pattern, maxsplit=1)[0]
+        low = bisect.bisect_left(self.terms, prefix)
+        high = bisect.bisect_left(self.terms, prefix + '\U0010ffff') if prefix else len(self.terms)
+        if pattern == prefix + '*':
+            return range(low, high)
+        matcher = re.compile(_wildcard_regex(pattern) + r'\Z')
+        return [position for position in range(low, high) if matcher.match(self.terms[position])]
+
+    def wildcard_postings(self, pattern):
+        positions = self.matching_terms(pattern)
+        if len(positions) == 0:
+            return np.empty(0, dtype=np.int32)
+        if isinstance(positions, range):
+            # 연속 범위: 해당 토큰들의 레코드 위치가 한 구간에 모여 있음
+            return np.unique(self.rows[self.offsets[positions.start]:self.offsets[positions.stop]])
+        return np.unique(np.concatenate([self.rows[self.offsets[p]:self.offsets[p + 1]] for p in positions]))
+
+    @property
+    def nbytes(self):
+        return self.rows.nbytes + self.offsets.nbytes
+
+def _wildcard_regex(pattern):
+    """WOS 와일드카드 → 정규식 (* 0자 이상, ? 1자, $ 0~1자)"""
+    return ''.join(
+        r'\w*' if char == '*' else r'\w' if char == '?' else r'\w?' if char == '$' else re.escape(char)
+        for char in pattern
+    )
+
+class WosSearchIndex:
+    """병합 결과 DataFrame 하나에 대한 필드별 역색인 + WOS 형식 질의 실행기
+
+    df: 병합 결과 (지연 필드 포함 가능, 복사하지 않고 참조만 보관)
+    search(질의) → 조건에 맞는 레코드 위치 배열 (오름차순), results(질의) → RecordView
+    """
+
+    def __init__(self, df, fields=SEARCH_FIELDS, profile=None):
+        self.df = df
+        self.view = RecordView(df)
+        self.fields = {}
+        for field in fields:
+            if field not in self.view.columns:
+                continue
+            values = self.view[field]
+            if profile is None:
+                self.fields[field] = _FieldIndex(values)
+            else:
+                with profile.stage('search_index', records=len(values), field=field) as entry:
+                    self.fields[field] = _FieldIndex(values)
+                    entry['terms'] = len(self.fields[field].terms)
+            del values
+        years = self.view[SEARCH_YEAR_FIELD] if SEARCH_YEAR_FIELD in self.view.columns else pd.Series(dtype=float)
+        self.years = pd.to_numeric(years, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        self.all_rows = np.arange(len(df), dtype=np.int32)
+        self._query_cache = {}
+
+    def __len__(self):
+        return len(self.all_rows)
+
+    @property
+    def nbytes(self):
+        return sum(field_index.nbytes for field_index in self.fields.values()) + self.years.nbytes
+
+    # --- 질의 실행 ---
+    def search(self, query):
+        """검색식에 맞는 레코드 위치 (오름차순 int 배열, 최근 질의 결과는 재사용)
+
+        Raises:
+            WosQueryError: 검색식 문법 오류
+        """
+        key = ' '.join(query.split())
+        positions = self._query_cache.pop(key, None)
+        if positions is None:
+            positions = self._evaluate(parse_wos_query(key))
+        self._query_cache[key] = positions
+        while len(self._query_cache) > SEARCH_QUERY_CACHE_ENTRIES:
+            self._query_cache.pop(next(iter(self._query_cache)))
+        return positions
+
+    def results(self, query):
+        """검색 결과 레코드 뷰 (병합 결과 순서)"""
+        return RecordView(self.df, self.search(query))
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == 'and':
+            return np.intersect1d(self._evaluate(node[1]), self._evaluate(node[2]), assume_unique=True)
+        if kind == 'or':
+            return np.union1d(self._evaluate(node[1]), self._evaluate(node[2]))
+        if kind == 'not':
+            left = self.all_rows if node[1] is None else self._evaluate(node[1])
+            return np.setdiff1d(left, self._evaluate(node[2]), assume_unique=True)
+        if kind == 'year':
+            return np.flatnonzero((self.years >= node[1]) & (self.years <= node[2])).astype(np.int32)
+        # 검색어/구문: 필드 묶음(TS 등)은 필드별 결과의 합집합
+        _, field, words = node
+        matched = [self._match_words(name, words) for name in SEARCH_FIELD_ALIASES[field] if name in self.fields]
+        if not matched:
+            return np.empty(0, dtype=np.int32)
+        return matched[0] if len(matched) == 1 else np.unique(np.concatenate(matched))
+
+    def _match_words(self, field, words):
+        field_index = self.fields[field]
+        # 포스팅 목록 교집합 (짧은 목록부터)
+        postings = sorted(
+            (field_index.wildcard_postings(word) if any(char in word for char in _WILDCARD_CHARS) else field_index.postings(word)
+             for word in words),
+            key=len
+        )
+        candidates = postings[0]
+        for other in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, other, assume_unique=True)
+        if len(words) == 1 or len(candidates) == 0:
+            return candidates
+        # 구문: 후보 레코드 원문에서만 단어가 이어져 있는지 확인 (';'로 나뉜 값 사이는 이어진 것으로 보지 않음)
+        phrase = re.compile(r'\b' + r'[^\w;]+'.join(_wildcard_regex(word) for word in words) + r'\b', re.IGNORECASE)
+        texts = RecordView(self.df, candidates)[field]
+        keep = np.fromiter((isinstance(text, str) and phrase.search(text) is not None for text in texts),
+                           dtype=bool, count=len(candidates))
+        return candidates[keep]
+
+# --- 검색식 해석 ---
+def _split_words(text):
+    """검색어 → 토큰 패턴 목록 (하이픈/공백 등으로 나뉘면 구문으로 취급, 와일드카드는 토큰에 포함)"""
+    words = tuple(word for word in _QUERY_SPLIT_PATTERN.split(text.lower()) if word)
+    if not words or any(word[0] in _WILDCARD_CHARS for word in words):
+        raise WosQueryError(f"검색할 단어가 없거나 와일드카드로 시작합니다: {text}")
+    return words
+
+def _tokenize_query(query):
+    tokens = []
+    position = 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _QUERY_TOKEN_PATTERN.match(query, position)
+        if match is None:
+            raise WosQueryError(f"검색식을 해석할 수 없습니다: {query[position:position + 20]}")
+        position = match.end()
+        if match.group('phrase') is not None:
+            tokens.append(('phrase', match.group('phrase')[1:-1]))
+        elif match.group('paren') is not None:
+            tokens.append((match.group('paren'), None))
+        elif match.group('field') is not None:
+            field = match.group('field').upper()
+            if field not in SEARCH_FIELD_ALIASES and field != SEARCH_YEAR_FIELD:
+                raise WosQueryError(f"지원하지 않는 필드입니다: {field}= (사용 가능: "
+                                    f"{', '.join(list(SEARCH_FIELD_ALIASES) + [SEARCH_YEAR_FIELD])})")
+            tokens.append(('field', field))
+        elif match.group('word').upper() in _QUERY_OPERATORS:
+            tokens.append((match.group('word').upper(), None))
+        else:
+            tokens.append(('word', match.group('word')))
+    return tokens
+
+class _QueryParser:
+    """WOS 검색식 → 트리 ('and'|'or'|'not', 왼쪽, 오른쪽) / ('words', 필드, 토큰 패턴) / ('year', 시작, 끝)"""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position][0] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise WosQueryError("검색식이 비어 있습니다.")
+        node = self.parse_or('TS')
+        if self.peek() is not None:
+            raise WosQueryError("괄호가 맞지 않습니다." if self.peek() == ')' else "검색식 끝을 해석할 수 없습니다.")
+        return node
+
+    def parse_or(self, field):
+        node = self.parse_and(field)
+        while self.peek() == 'OR':
+            self.take()
+            node = ('or', node, self.parse_and(field))
+        return node
+
+    def parse_and(self, field):
+        node = self.parse_not(field)
+        while self.peek() in ('AND', 'word', 'phrase', 'field', '('):
+            if self.peek() == 'AND':
+                self.take()
+            node = ('and', node, self.parse_not(field))
+        return node
+
+    def parse_not(self, field):
+        node = None if self.peek() == 'NOT' else self.parse_primary(field)  # 맨 앞 NOT은 전체 레코드에서 제외
+        while self.peek() == 'NOT':
+            self.take()
+            node = ('not', node, self.parse_primary(field))
+        return node
+
+    def parse_primary(self, field):
+        kind = self.peek()
+        if kind is None:
+            raise WosQueryError("검색식이 연산자로 끝났습니다.")
+        kind, value = self.take()
+        if kind == '(':
+            node = self.parse_or(field)
+            if self.peek() != ')':
+                raise WosQueryError("괄호가 닫히지 않았습니다.")
+            self.take()
+            return node
+        if kind == 'field':
+            if value == SEARCH_YEAR_FIELD:
+                return self.parse_years()
+            if self.peek() == '(':
+                self.take()
+                node = self.parse_or(value)
+                if self.peek() != ')':
+                    raise WosQueryError("괄호가 닫히지 않았습니다.")
+                self.take()
+                return node
+            return self.parse_primary(value)
+        if kind == 'word':
+            return ('words', field, _split_words(value))
+        if kind == 'phrase':
+            return ('words', field, _split_words(value))
+        raise WosQueryError(f"'{kind}' 앞에 검색어가 필요합니다.")
+
+    def parse_years(self):
+        """PY=2020 / PY=2018-2022 / PY=(2018-2020 OR 2023)"""
+        if self.peek() == '(':
+            self.take()
+            node = self.parse_years()
+            while self.peek() == 'OR':
+                self.take()
+                node = ('or', node, self.parse_years())
+            if self.peek() != ')':
+                raise WosQueryError("괄호가 닫히지 않았습니다.")
+            self.take()
+            return node
+        kind, value = self.take() if self.peek() is not None else (None, None)
+        match = re.fullmatch(r'(\d{4})(?:-(\d{4}))?', value or '') if kind == 'word' else None
+        if match is None:
+            raise WosQueryError("PY=에는 연도(2020) 또는 연도 범위(2018-2022)를 입력하세요.")
+        start, end = int(match.group(1)), int(match.group(2) or match.group(1))
+        return ('year', min(start, end), max(start, end))
+
+def parse_wos_query(query):
+    """WOS 고급 검색 형식 검색식 해석 (문법 오류는 WosQueryError)"""
+    return _QueryParser(_tokenize_query(query)).parse()
+
+def build_search_index(df, profile=None):
+    """병합 결과 전문 검색 색인 생성 (profile을 지정하면 필드별 색인 시간 기록)"""
+    return WosSearchIndex(df, profile=profile)
@@ -0,0 +1,148 @@
+"""서버 측 WOS 파일 원본 (디렉터리 / .zip 멤버 / .gz) - 내용을 한꺼번에 읽지 않고 스트림으로 제공
+
+업로드 파일(.name / .getvalue())과 같은 방식으로 쓸 수 있고, 추가로 open()으로 바이너리 스트림을 열 수 있음
+    - 내용 해시: 청크 단위로 읽어 계산 (파일 크기/수정 시각이 같으면 이전 해시 재사용)
+    - 파싱: parser.parse_wos_file이 스트림으로 직접 읽음 (프로세스 풀 작업자도 경로만 전달받아 각자 읽음)
+설정: 환경 변수 WOS_PREP_SERVER_DIR (앱에서 고를 수 있는 서버 디렉터리, 지정하지 않으면 업로드만 사용)
+"""
+import os
+import glob
+import gzip
+import struct
+import fnmatch
+import hashlib
+import zipfile
+
+SERVER_DIR_ENV = 'WOS_PREP_SERVER_DIR'
+WOS_ARCHIVE_SUFFIXES = ('.zip', '.gz')
+SOURCE_CHUNK_BYTES = 1024 * 1024
+SOURCE_HASH_MEMO_ENTRIES = 4096
+
+# --- 파일 원본 ---
+class LocalWosFile:
+    """경로 기반 WOS 파일 (업로드 파일과 동일하게 .name / .getvalue() 제공)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.size = os.path.getsize(path)
+
+    def open(self):
+        return open(self.path, 'rb')
+
+    def getvalue(self):
+        with self.open() as f:
+            return f.read()
+
+    def fingerprint(self):
+        """내용 해시 재사용 기준 (경로, 크기, 수정 시각)"""
+        stat = os.stat(self.path)
+        return ('file', os.path.realpath(self.path), stat.st_size, stat.st_mtime_ns)
+
+class GzipWosFile(LocalWosFile):
+    """.gz로 압축된 WOS 파일 (이름은 .gz를 뗀 원래 파일 이름, 읽을 때 스트림으로 압축 해제)"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.name = os.path.basename(path)[:-len('.gz')]
+        # 압축 해제 크기는 gzip 꼬리의 ISIZE (4GB 단위로 잘린 값이라 압축 크기보다 작으면 압축 크기 사용)
+        with open(path, 'rb') as f:
+            f.seek(max(self.size - 4, 0))
+            trailer = f.read(4)
+        self.size = max(struct.unpack('<I', trailer)[0] if len(trailer) == 4 else 0, self.size)
+
+    def open(self):
+        return gzip.open(self.path, 'rb')
+
+    def fingerprint(self):
+        return ('gzip',) + super().fingerprint()[1:]
+
+class ZipMemberWosFile:
+    """.zip 안의 WOS 파일 하나 (이름은 '압축 파일/멤버', 읽을 때 스트림으로 압축 해제)"""
+
+    def __init__(self, archive_path, member, size=None):
+        self.archive_path = archive_path
+        self.member = member
+        self.name = f"{os.path.basename(archive_path)}/{member}"
+        if size is None:
+            with zipfile.ZipFile(archive_path) as archive:
+                size = archive.getinfo(member).file_size
+        self.size = size
+
+    def open(self):
+        archive = zipfile.ZipFile(self.archive_path)
+        try:
+            stream = archive.open(self.member)
+        except BaseException:
+            archive.close()
+            raise
+        # 멤버 스트림을 닫을 때 압축 파일도 함께 닫힘 (ZipExtFile이 압축 파일 핸들을 공유)
+        archive.close()
+        return stream
+
+    def getvalue(self):
+        with self.open() as f:
+            return f.read()
+
+    def fingerprint(self):
+        stat = os.stat(self.archive_path)
+        return ('zip', os.path.realpath(self.archive_path), stat.st_size, stat.st_mtime_ns, self.member)
+
+# --- 내용 해시 (청크 단위) ---
+_source_hashes = {}  # fingerprint → 내용 해시 (최근 SOURCE_HASH_MEMO_ENTRIES개)
+
+def compute_source_hash(source):
+    """파일 원본 내용 SHA-256 해시 (incremental.compute_file_hash와 같은 값, 내용은 보관하지 않음)"""
+    fingerprint = source.fingerprint()
+    file_hash = _source_hashes.pop(fingerprint, None)
+    if file_hash is None:
+        hasher = hashlib.sha256()
+        with source.open() as stream:
+            for chunk in iter(lambda: stream.read(SOURCE_CHUNK_BYTES), b''):
+                hasher.update(chunk)
+        file_hash = hasher.hexdigest()
+    _source_hashes[fingerprint] = file_hash
+    while len(_source_hashes) > SOURCE_HASH_MEMO_ENTRIES:
+        _source_hashes.pop(next(iter(_source_hashes)))
+    return file_hash
+
+def is_stream_source(source):
+    """open()으로 스트림을 열 수 있는 서버 측 원본인지 (업로드 파일은 False)"""
+    return callable(getattr(source, 'open', None)) and callable(getattr(source, 'fingerprint', None))
+
+# --- 경로 → 파일 원본 ---
+def is_wos_archive(path):
+    return path.lower().endswith(WOS_ARCHIVE_SUFFIXES)
+
+def find_wos_inputs(directory, pattern='*.txt', recursive=False):
+    """디렉터리 안의 pattern에 맞는 파일과 .zip/.gz 압축 파일 경로 (정렬)"""
+    found = set()
+    for file_pattern in (pattern,) + tuple(f"*{suffix}" for suffix in WOS_ARCHIVE_SUFFIXES):
+        path_pattern = os.path.join(directory, '**', file_pattern) if recursive else os.path.join(directory, file_pattern)
+        found.update(glob.glob(path_pattern, recursive=recursive))
+    return sorted(path for path in found if os.path.isfile(path))
+
+def open_wos_sources(paths, pattern='*.txt'):
+    """파일 경로 목록을 파일 원본 목록으로 변환 (.zip은 pattern에 맞는 멤버별로 펼침, .gz는 압축 해제 스트림)"""
+    sources = []
+    for path in paths:
+        lowered = path.lower()
+        if lowered.endswith('.zip'):
+            with zipfile.ZipFile(path) as archive:
+                members = [
+                    info for info in archive.infolist()
+                    if not info.is_dir() and not info.filename.startswith('__MACOSX/')
+                    and fnmatch.fnmatch(os.path.basename(info.filename), pattern)
+                ]
+            sources.extend(ZipMemberWosFile(path, info.filename, info.file_size)
+                           for info in sorted(members, key=lambda info: info.filename))
+        elif lowered.endswith('.gz'):
+            sources.append(GzipWosFile(path))
+        else:
+            sources.append(LocalWosFile(path))
+    return sources
+
+def get_server_directory():
+    """WOS_PREP_SERVER_DIR로 지정된 서버 디렉터리 (지정하지 않았거나 디렉터리가 아니면 None)"""
+    directory = os.environ.get(SERVER_DIR_ENV)
+    return directory if directory and os.path.isdir(directory) else None
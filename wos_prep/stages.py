@@ -0,0 +1,202 @@
+"""단계별 캐시 키로 메모이즈하는 파이프라인 (파싱 → 중복 제거 → 유사 중복 → 분류 → 진단/내보내기)
+
+각 단계 키는 상위 단계 키 + 해당 단계 파라미터로 만들어, 분류 기준만 바뀌면 파싱/중복 제거 결과를,
+내보내기 옵션만 바뀌면 분류 결과를 그대로 재사용
+    parse           파일 내용 해시 (파일별, IncrementalWosMerger가 보관)
+    dedup           파일 이름/순서/내용 (upload_key)
+    near_duplicates dedup 키 + 유사 중복 모드/임계값
+    classify        near_duplicates 키 + 분류 기준 키
+    diagnose, 내보내기  classify 키 (+ 내보내기 옵션)
+disk_cache를 지정하면 파일별 파싱 결과와 분류 라벨을 디스크에도 보관하여 세션/앱 재시작 후에도 재사용
+분류 키가 바뀌어도(파일 추가/제거/순서 변경, 유사 중복 설정 변경) 남아 있는 레코드는 레코드 식별자
+(incremental.build_record_ids)로 이전 분류 라벨을 찾아 재사용하고 새 레코드만 분류
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.merge import apply_near_duplicate_mode, near_duplicate_keep_mask, NEAR_DUP_DEFAULT_THRESHOLD
+from wos_prep.classify import classify_articles, CLASSIFIER_CONFIG_KEY
+from wos_prep.incremental import IncrementalWosMerger
+from wos_prep.diskcache import CorpusDiskCache
+from wos_prep.profiling import PipelineProfile
+
+STAGE_CACHE_MAX_ENTRIES = 4  # 단계별 보관 결과 수 (세션별)
+
+def stage_key(*parts):
+    """상위 단계 키 + 단계 파라미터로 단계 캐시 키 생성 (SHA-256 앞 16자리)"""
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+# --- 단계 결과 메모 저장소 ---
+class StageCache:
+    """단계 이름별 (키 → (결과, 계측)) 저장소, 실행마다 단계별 캐시 적중/미적중 기록
+
+    단계별로 최근에 사용한 max_entries개만 보관 (오래 사용하지 않은 키부터 제거)
+    """
+
+    def __init__(self, max_entries=STAGE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = {}  # 단계 → {키: (결과, PipelineProfile)}
+        self.events = []  # 이번 실행의 단계별 {'stage', 'key', 'cache': 'hit'|'miss', ...}
+
+    def begin_run(self):
+        """새 실행 시작 (적중/미적중 기록 초기화)"""
+        self.events = []
+
+    def record(self, stage, key, hit, **details):
+        """단계 실행 결과 기록 (캐시를 거치지 않는 단계나 외부 캐시 결과도 같은 형식으로 추가)"""
+        self.events.append({'stage': stage, 'key': key, 'cache': 'hit' if hit else 'miss', **details})
+
+    def run(self, stage, key, compute, **details):
+        """키에 해당하는 결과가 있으면 재사용하고, 없으면 compute(profile) 실행 후 보관
+
+        Returns:
+            (결과, 결과를 계산할 때의 PipelineProfile)
+        """
+        store = self.entries.setdefault(stage, {})
+        hit = key in store
+        if hit:
+            cached = store.pop(key)
+        else:
+            profile = PipelineProfile()
+            cached = (compute(profile), profile)
+        store[key] = cached
+        while len(store) > self.max_entries:
+            store.pop(next(iter(store)))
+        self.record(stage, key, hit, **details)
+        return cached
+
+# --- 세션 파이프라인 ---
+class StagedWosPipeline:
+    """파싱/중복 제거는 증분 병합기, 이후 단계는 StageCache로 메모이즈하는 세션별 파이프라인"""
+
+    def __init__(self, max_entries=STAGE_CACHE_MAX_ENTRIES, lazy_tags=None, disk_cache=None):
+        self.merger = IncrementalWosMerger(lazy_tags, disk_cache)
+        self.disk_cache = disk_cache  # 분류 라벨도 분류 단계 키로 보관 (diskcache.CorpusDiskCache, 선택)
+        self.cache = StageCache(max_entries)
+        self.keys = {}  # 이번 실행의 단계별 키
+        self._profiles = {}  # 이번 실행 결과를 만든 단계별 계측
+        self._label_memo = {}  # 분류 기준 키 → 마지막 분류 결과 라벨 Series (index: 레코드 식별자)
+
+    def run(self, uploaded_files, near_duplicate_mode='off', near_duplicate_threshold=NEAR_DUP_DEFAULT_THRESHOLD,
+            classifier_key=CLASSIFIER_CONFIG_KEY, classifier=classify_articles, progress=None):
+        """업로드 목록 기준 병합 + 분류 (바뀐 단계와 그 하위 단계만 다시 계산)
+
+        classifier: DataFrame → 분류 라벨 Series 함수 (classifier_key는 그 기준을 나타내는 키)
+        progress: 새로 읽은 파일 하나마다 호출 (IncrementalWosMerger.update 참고)
+
+        Returns:
+            (병합 DataFrame 또는 None, 파일별 상태, 제거된 중복 수, 중복 제거 리포트)
+            - run_pipeline과 같은 형식, DataFrame은 'Classification' 컬럼 포함 (단계 간 공유하므로 수정하지 말 것)
+        """
+        self.cache.begin_run()
+        merger = self.merger
+        previous_upload_key = merger.upload_key if merger.file_order else None
+        merged_df, file_status, dedup_counts = merger.update(uploaded_files, progress)
+
+        # 파싱 / 중복 제거: 병합기가 파일 내용 해시별로 보관 (바뀐 파일만 파싱)
+        dedup_key = stage_key('dedup', merger.upload_key)
+        changed = merger.upload_key != previous_upload_key
+        parsed_now = merger.last_update['parsed'] if changed else 0
+        disk_now = merger.last_update['disk_cached'] if changed else 0
+        self.keys = {
+            'parse': stage_key('parse', *sorted({file_hash for _, file_hash in merger.file_order})),
+            'dedup': dedup_key,
+        }
+        self.cache.record('parse', self.keys['parse'], parsed_now == 0,
+                          files=len(file_status), parsed=parsed_now, disk_cached=disk_now)
+        self.cache.record('dedup', dedup_key, not changed, merge=merger.last_update['merge'] if changed else 'none')
+        self._profiles = {'ingest': merger.ingest_profile}
+
+        if merged_df is None:
+            return None, file_status, 0, {'counts': {}, 'near_duplicates': None}
+
+        # 유사 중복: 모드가 'off'면 임계값과 무관
+        near_settings = (near_duplicate_mode, None if near_duplicate_mode == 'off' else near_duplicate_threshold)
+        near_key = stage_key('near_duplicates', dedup_key, *near_settings)
+
+        def compute_near_duplicates(profile):
+            counts = dict(dedup_counts)
+            near_df, near_duplicates = apply_near_duplicate_mode(
+                merged_df, counts, near_duplicate_mode, near_duplicate_threshold, profile
+            )
+            near_ids = merger.record_ids
+            if near_duplicate_mode == 'auto':
+                near_ids = near_ids[near_duplicate_keep_mask(len(merged_df), near_duplicates)].reset_index(drop=True)
+            return near_df, counts, near_duplicates, near_ids
+
+        (near_df, dedup_counts, near_duplicates, near_ids), self._profiles['near_duplicates'] = self.cache.run(
+            'near_duplicates', near_key, compute_near_duplicates, mode=near_duplicate_mode
+        )
+
+        # 분류: 같은 분류 기준으로 이전에 분류한 레코드는 라벨을 재사용하고 새 레코드만 분류
+        classify_key = stage_key('classify', near_key, classifier_key)
+        memo = self._label_memo.get(classifier_key)
+        known = np.zeros(len(near_df), dtype=bool) if memo is None else near_ids.isin(memo.index).to_numpy()
+
+        def compute_classification(profile):
+            # 디스크 캐시: 같은 업로드/설정/분류 기준으로 분류한 라벨이 있으면 분류 생략
+            disk_key = CorpusDiskCache.entry_key('classified', classify_key)
+            if self.disk_cache is not None and self.disk_cache.enabled:
+                with profile.stage('disk_cache_load', records=0) as entry:
+                    loaded = self.disk_cache.load(disk_key)
+                    if loaded is not None and len(loaded[0]) == len(near_df):
+                        entry['records'] = len(near_df)
+                        labels = loaded[0]['Classification']
+                        return near_df.assign(Classification=labels.set_axis(near_df.index).astype('category'))
+            with profile.stage('classify', records=len(near_df)) as entry:
+                if not known.any():
+                    labels = classifier(near_df)
+                else:
+                    labels = memo.reindex(near_ids).astype(object).set_axis(near_df.index)
+                    missing = np.flatnonzero(~known)
+                    if len(missing):
+                        labels.iloc[missing] = classifier(near_df.iloc[missing]).to_numpy(dtype=object)
+                    entry['reused_records'] = int(known.sum())
+            labels = labels.set_axis(near_df.index).astype('category')
+            if self.disk_cache is not None and self.disk_cache.enabled:
+                with profile.stage('disk_cache_store', records=len(labels)) as entry:
+                    entry['bytes'] = self.disk_cache.store(disk_key, labels.to_frame('Classification').reset_index(drop=True))
+            return near_df.assign(Classification=labels)
+
+        classified_df, self._profiles['classify'] = self.cache.run('classify', classify_key, compute_classification)
+        self._remember_labels(classifier_key, near_ids, classified_df['Classification'])
+        self.keys['near_duplicates'] = near_key
+        self.keys['classify'] = classify_key
+
+        dedup_report = {'counts': dict(dedup_counts), 'near_duplicates': near_duplicates}
+        return classified_df, file_status, sum(dedup_counts.values()), dedup_report
+
+    def _remember_labels(self, classifier_key, record_ids, labels):
+        """분류 기준 키별 분류 라벨 보관 (최근에 사용한 max_entries개 분류 기준만)
+
+        이전 실행에만 있던 레코드(제거한 파일 등)도 이번 레코드 수만큼까지 함께 보관하여 다시 추가될 때 재사용
+        """
+        memo = pd.Series(labels.to_numpy(dtype=object), index=pd.Index(record_ids))
+        previous = self._label_memo.pop(classifier_key, None)
+        if previous is not None:
+            previous = previous[~previous.index.isin(memo.index)].iloc[:len(memo)]
+            memo = pd.concat([memo, previous])
+        self._label_memo[classifier_key] = memo[~memo.index.duplicated()]
+        while len(self._label_memo) > self.cache.max_entries:
+            self._label_memo.pop(next(iter(self._label_memo)))
+
+    def run_stage(self, stage, compute, *params):
+        """분류 결과 하위 단계(진단 등)를 classify 키 + params 기준으로 메모이즈 → (결과, 계측)"""
+        key = stage_key(stage, self.keys['classify'], *params)
+        return self.cache.run(stage, key, compute)
+
+    @property
+    def pipeline_key(self):
+        """내보내기 캐시용 키 (분류 단계 키, 업로드 내용/유사 중복 설정/분류 기준 모두 반영)"""
+        return self.keys.get('classify')
+
+    def profile(self):
+        """이번 실행 결과를 만든 단계들의 계측 (재사용한 단계는 처음 계산할 때의 값)"""
+        combined = PipelineProfile()
+        combined.created_at = self._profiles['ingest'].created_at
+        for name in ('ingest', 'near_duplicates', 'classify'):
+            if name in self._profiles:
+                combined.extend(self._profiles[name])
+        return combined
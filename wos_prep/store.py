@@ -0,0 +1,80 @@
+"""병합 레코드 저장 형식 압축 (반복 태그는 범주형, 건수/연도는 정수, 반복 많은 저자/키워드는 값 공유)"""
+import pandas as pd
+
+from wos_prep.parser import LAZY_SPAN_PREFIX
+
+# 값 종류가 적어 레코드마다 같은 문자열이 반복되는 태그 (항상 범주형)
+COMPACT_CATEGORY_TAGS = ('PT', 'LA', 'DT', 'SO', 'J9', 'JI', 'WC', 'SC', 'PU', 'PI', 'PA', 'PD', 'OA')
+# 숫자만 들어 있는 건수/연도/권호 태그 → 값 범위에 맞는 nullable 정수 (텍스트로 되돌려도 같은 값일 때만)
+COMPACT_INTEGER_TAGS = ('PY', 'TC', 'Z9', 'NR', 'U1', 'U2', 'PG', 'VL', 'IS')
+# 저자/키워드 태그: 같은 값이 충분히 반복되면 범주형으로 값을 한 번만 저장 (중복 값 공유)
+COMPACT_TOKEN_TAGS = ('AU', 'AF', 'DE', 'ID', 'C3')
+COMPACT_TOKEN_MAX_UNIQUE_RATIO = 0.5
+
+_NULLABLE_INTEGER_DTYPES = (('Int16', 2 ** 15 - 1), ('Int32', 2 ** 31 - 1), ('Int64', 2 ** 63 - 1))
+
+def _compact_integer_column(column):
+    """숫자 문자열 컬럼을 nullable 정수로 변환 (앞자리 0, 부호, 공백 등 텍스트가 바뀌는 값이 있으면 None)"""
+    values = column.dropna()
+    if values.empty:
+        return None
+    text = values.astype(str)
+    if not text.str.fullmatch(r'0|[1-9][0-9]{0,17}').all():
+        return None
+    numbers = text.astype('int64')
+    for dtype, max_value in _NULLABLE_INTEGER_DTYPES:
+        if numbers.max() <= max_value:
+            return pd.to_numeric(column, errors='coerce').astype(dtype)
+    return None
+
+def compact_wos_frame(df):
+    """WOS 레코드 DataFrame의 태그별 저장 형식을 압축한 새 DataFrame 반환 (값/순서/컬럼 동일)
+
+    - 범주형 컬럼은 결측 비교, .str 접근, 값 비교가 그대로 동작하지만 새 값을 대입할 수는 없음
+    - 정수 컬럼은 텍스트로 변환하면 원래 문자열과 같음 (내보내기 결과 동일)
+    - 지연 필드 구간/원본 줄 컬럼은 그대로 (구간은 int64로 유지)
+    """
+    converted = {}
+    for tag in df.columns:
+        column = df[tag]
+        if tag.startswith(LAZY_SPAN_PREFIX):
+            # 지연 필드 구간: 이 필드가 없는 파일과 concat하면 결측 때문에 실수형이 되므로 -1(없음) 정수로 복원
+            if not pd.api.types.is_integer_dtype(column.dtype):
+                converted[tag] = column.fillna(-1).astype('int64')
+            continue
+        if isinstance(column.dtype, pd.CategoricalDtype) or pd.api.types.is_integer_dtype(column.dtype):
+            continue
+        if tag in COMPACT_INTEGER_TAGS:
+            compact = _compact_integer_column(column)
+            if compact is not None:
+                converted[tag] = compact
+        elif tag in COMPACT_CATEGORY_TAGS:
+            converted[tag] = column.astype('category')
+        elif tag in COMPACT_TOKEN_TAGS and len(column) > 0:
+            if column.nunique() <= len(column) * COMPACT_TOKEN_MAX_UNIQUE_RATIO:
+                converted[tag] = column.astype('category')
+    return df.assign(**converted) if converted else df
+
+def frame_memory_bytes(df):
+    """DataFrame 실제 메모리 사용량 (문자열 내용 포함, 바이트)"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def frame_memory_report(df, compact_df):
+    """압축 전/후 컬럼별 메모리 사용량 비교 (큰 컬럼 순)
+
+    Returns:
+        [{'column', 'dtype_before', 'dtype_after', 'bytes_before', 'bytes_after'}, ...]
+    """
+    before = df.memory_usage(index=False, deep=True)
+    after = compact_df.memory_usage(index=False, deep=True)
+    rows = [
+        {
+            'column': column,
+            'dtype_before': str(df[column].dtype),
+            'dtype_after': str(compact_df[column].dtype),
+            'bytes_before': int(before[column]),
+            'bytes_after': int(after[column]),
+        }
+        for column in df.columns
+    ]
+    return sorted(rows, key=lambda row: row['bytes_before'], reverse=True)
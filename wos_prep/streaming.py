@@ -0,0 +1,198 @@
+"""대용량 입력용 스트리밍 병합 (파일별 파싱 → 누적 중복 키 → 분류 → SCIMAT/테이블 기록, 병합 DataFrame 없음)
+
+메모리에는 분류/기록 단위(STREAMING_BATCH_RECORDS + 파일 하나) 분량의 레코드, 누적 중복 키 집합,
+화면/요약용 집계(유형별 중복 수, 분류별/연도별 편수, 품질 진단 필드 건수)만 남음
+    - SCIMAT 파일: 파일별 분석 대상 레코드를 그대로 이어서 기록
+    - 테이블(CSV/xlsx): 전체 컬럼 목록은 마지막 파일까지 읽어야 알 수 있으므로, 파일별 결과를 출력 위치의
+      임시 파일에 모았다가 마지막에 한 조각씩 읽어 기록
+결과 파일은 같은 입력을 일괄 병합(pipeline.run_pipeline)한 뒤 내보낸 것과 같음 (유사 중복 탐지는 전체 레코드
+비교가 필요하므로 지원하지 않음)
+"""
+import os
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from wos_prep.parser import iter_parse_wos_files, columns_to_frame
+from wos_prep.merge import build_dedup_keys
+from wos_prep.incremental import DEDUP_KEY_TYPES, count_dedup_key_types
+from wos_prep.classify import classify_articles
+from wos_prep.diagnostics import count_quality_fields, merge_quality_counts
+from wos_prep.export import ScimatWosWriter, write_excel_frames
+from wos_prep.pipeline import split_classified
+from wos_prep.sources import is_stream_source
+from wos_prep.store import compact_wos_frame
+from wos_prep.views import as_record_view
+from wos_prep.profiling import PipelineProfile
+
+STREAMING_BATCH_RECORDS = 10000  # 분류/기록 단위 (메모리에 남는 레코드 수 상한의 기준)
+STREAMING_TABLE_KINDS = ('included', 'excluded')  # 분석 대상 (Classification 제외) / 배제 (Classification 포함)
+
+def _count_years(view):
+    """분석 대상 레코드의 발행 연도별 편수 (PY가 숫자가 아닌 레코드 제외)"""
+    if 'PY' not in view.columns:
+        return {}
+    years = pd.to_numeric(view['PY'], errors='coerce').dropna().astype(int)
+    return {int(year): int(count) for year, count in years.value_counts().items()}
+
+def _add_counts(total, counts):
+    for key, count in counts.items():
+        if count > 0:
+            total[key] = total.get(key, 0) + int(count)
+
+def _write_table(spool_paths, columns, target, sheet_name):
+    """임시 파일에 모은 파일별 조각을 columns 순서로 맞춰 CSV/xlsx 하나로 기록 (조각 하나씩 읽음)"""
+    frames = (pd.read_pickle(path).reindex(columns=columns) for path in spool_paths)
+    if str(target).lower().endswith('.xlsx'):
+        write_excel_frames(frames, columns, target, sheet_name)
+        return
+    with open(target, 'w', encoding='utf-8-sig', newline='') as output:
+        pd.DataFrame(columns=columns).to_csv(output, index=False)
+        for frame in frames:
+            frame.to_csv(output, header=False, index=False)
+
+def stream_merge_wos_files(uploaded_files, scimat_target, table_targets=(), lazy_tags=None, profile=None,
+                           classifier=classify_articles, progress=None, batch_records=STREAMING_BATCH_RECORDS):
+    """파일별로 파싱 → 누적 키 집합으로 중복 제거 → 분류 → 분석 대상 SCIMAT/테이블 기록
+
+    scimat_target: 분석 대상 SCIMAT 파일 경로
+    table_targets: [(종류 'included'|'excluded', 경로, 시트 이름)] - 확장자가 .xlsx면 엑셀, 그 외 CSV
+    lazy_tags: 원본 구간으로만 보관할 태그 (SCIMAT 파일에 원본 줄 그대로 기록, parser.parse_wos_file 참고)
+    classifier: DataFrame → 분류 라벨 Series 함수 (레코드별로 독립적이어야 함)
+    progress: 파일 하나를 처리할 때마다 호출 (처리한 파일 수, 전체 파일 수, 파일별 상태)
+    batch_records: 파싱한 레코드를 이만큼 모아 중복 제거/분류/기록 (작은 파일마다 처리하는 고정 비용 절감)
+
+    Returns:
+        (파일별 상태, 집계 dict)
+        - 집계: papers_merged, duplicates_removed, dedup_counts, included, excluded,
+          classification_counts (전체), year_counts (분석 대상), quality_counts {'merged', 'included'}
+    """
+    if profile is None:
+        profile = PipelineProfile()
+    file_status = []
+    seen_keys = set()
+    columns = {}  # 일괄 병합 결과와 같은 컬럼 순서 (파일별 컬럼의 처음 등장 순서)
+    summary = {
+        'papers_merged': 0,
+        'duplicates_removed': 0,
+        'dedup_counts': dict.fromkeys(DEDUP_KEY_TYPES, 0),
+        'included': 0,
+        'excluded': 0,
+        'classification_counts': {},
+        'year_counts': {},
+        'quality_counts': {'merged': None, 'included': None},
+    }
+    seconds = dict.fromkeys(('parse', 'dedup', 'compact', 'classify', 'scimat_build', 'table_spool'), 0.0)
+    spooled_kinds = {kind for kind, _, _ in table_targets}
+    spool_paths = {kind: [] for kind in STREAMING_TABLE_KINDS}
+    batch = []  # 중복 제거/분류/기록을 기다리는 파일별 DataFrame
+
+    with profile.stage('read', records=len(uploaded_files)) as entry:
+        named_payloads = [
+            (uploaded_file.name, uploaded_file if is_stream_source(uploaded_file) else uploaded_file.getvalue())
+            for uploaded_file in uploaded_files
+        ]
+        entry['bytes'] = sum(payload.size if is_stream_source(payload) else len(payload) for _, payload in named_payloads)
+
+    def flush(writer, spool_dir):
+        """모아 둔 레코드를 중복 제거/분류하여 SCIMAT/임시 테이블 조각에 기록하고 집계에 반영"""
+        frame = pd.concat(batch, ignore_index=True) if len(batch) > 1 else batch[0]
+        batch.clear()
+
+        # 중복 제거: 앞 단위까지의 키 집합 + 단위 안에서 먼저 나온 키 (일괄 병합의 keep='first'와 같음)
+        started = time.perf_counter()
+        keys = build_dedup_keys(frame)
+        seen = np.fromiter((key in seen_keys for key in keys), dtype=bool, count=len(keys))
+        duplicate_mask = keys.notna().to_numpy() & (seen | keys.duplicated(keep='first').to_numpy())
+        _add_counts(summary['dedup_counts'], count_dedup_key_types(keys[duplicate_mask]))
+        seen_keys.update(keys[~duplicate_mask].dropna())
+        if duplicate_mask.any():
+            frame = frame[~duplicate_mask].reset_index(drop=True)
+        del keys, seen, duplicate_mask
+        seconds['dedup'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        frame = compact_wos_frame(frame)
+        seconds['compact'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        frame['Classification'] = classifier(frame).astype('category')
+        included, excluded = split_classified(frame)
+        included_output = included.drop_columns(['Classification'])
+        seconds['classify'] += time.perf_counter() - started
+
+        started = time.perf_counter()
+        writer.write(included_output)
+        seconds['scimat_build'] += time.perf_counter() - started
+
+        # 테이블용 조각 (지연 필드는 디코딩한 값으로)
+        started = time.perf_counter()
+        for kind, view in (('included', included_output), ('excluded', excluded)):
+            if kind in spooled_kinds and len(view) > 0:
+                spool_path = os.path.join(spool_dir, f"{kind}_{len(spool_paths[kind]):06d}.pkl")
+                view.to_frame().to_pickle(spool_path)
+                spool_paths[kind].append(spool_path)
+        seconds['table_spool'] += time.perf_counter() - started
+
+        # 화면/요약용 집계
+        summary['papers_merged'] += len(frame)
+        summary['included'] += len(included)
+        summary['excluded'] += len(excluded)
+        _add_counts(summary['classification_counts'], frame['Classification'].value_counts())
+        _add_counts(summary['year_counts'], _count_years(included_output))
+        quality_counts = summary['quality_counts']
+        quality_counts['merged'] = merge_quality_counts(quality_counts['merged'], count_quality_fields(frame))
+        quality_counts['included'] = merge_quality_counts(quality_counts['included'], count_quality_fields(included_output))
+
+    output_dir = os.path.dirname(os.path.abspath(scimat_target))
+    with tempfile.TemporaryDirectory(prefix='.wos_prep_spool_', dir=output_dir) as spool_dir, \
+            open(scimat_target, 'wb') as scimat_output, \
+            profile.stage('stream_merge', records=0, files=len(named_payloads)) as stream_entry:
+        writer = ScimatWosWriter(scimat_output)
+        parsed_files = iter_parse_wos_files(named_payloads, lazy_tags=lazy_tags)
+        del named_payloads
+        batch_size = 0
+
+        while True:
+            started = time.perf_counter()
+            parsed = next(parsed_files, None)
+            if parsed is None:
+                break
+            file_columns = parsed.pop('columns')
+            file_status.append(parsed)
+            frame = columns_to_frame(file_columns) if file_columns is not None else None
+            del file_columns
+            seconds['parse'] += time.perf_counter() - started
+
+            if frame is not None:
+                columns.update(dict.fromkeys(as_record_view(frame).columns))
+                stream_entry['records'] += len(frame)
+                batch.append(frame)
+                batch_size += len(frame)
+                del frame
+                if batch_size >= batch_records:
+                    flush(writer, spool_dir)
+                    batch_size = 0
+            if progress is not None:
+                progress(len(file_status), len(uploaded_files), parsed)
+        if batch:
+            flush(writer, spool_dir)
+
+        for stage, stage_seconds in seconds.items():
+            profile.add(stage, stage_seconds, nested=True)
+        profile.add('encoding_sniff', sum(parsed['encoding_detect_ms'] for parsed in file_status) / 1000,
+                    records=len(file_status), nested=True)
+
+        # 테이블: 모든 파일의 컬럼 순서로 맞춰 기록
+        if table_targets:
+            with profile.stage('table_build', records=summary['papers_merged'], tables=len(table_targets)):
+                for kind, target, sheet_name in table_targets:
+                    table_columns = list(columns) + (['Classification'] if kind == 'excluded' else [])
+                    _write_table(spool_paths[kind], table_columns, target, sheet_name)
+
+    summary['duplicates_removed'] = sum(summary['dedup_counts'].values())
+    summary['classification_counts'] = dict(sorted(summary['classification_counts'].items(), key=lambda item: -item[1]))
+    summary['year_counts'] = dict(sorted(summary['year_counts'].items()))
+    return file_status, summary
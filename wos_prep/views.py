@@ -0,0 +1,125 @@
+"""병합 결과 DataFrame 하나를 기준으로 한 행 부분 집합 뷰 (분석 대상/배제 분리 시 전체 복사 없음)"""
+import numpy as np
+import pandas as pd
+
+from wos_prep.parser import LAZY_RAW_COLUMN, LAZY_SPAN_PREFIX, decode_lazy_field
+
+VIEW_CHUNK_RECORDS = 2000
+
+def _visible_columns(columns):
+    """기준 DataFrame 컬럼 중 보이는 컬럼 ('__lazy_CR' → 'CR', '__raw' 제외, 순서 유지)"""
+    if LAZY_RAW_COLUMN not in columns:
+        return columns
+    return pd.Index([
+        column[len(LAZY_SPAN_PREFIX):] if column.startswith(LAZY_SPAN_PREFIX) else column
+        for column in columns if column != LAZY_RAW_COLUMN
+    ])
+
+def as_record_view(df):
+    """지연 필드가 있는 DataFrame은 RecordView로 감싸 반환 (그 외 DataFrame/RecordView는 그대로)"""
+    if isinstance(df, pd.DataFrame) and LAZY_RAW_COLUMN in df.columns:
+        return RecordView(df)
+    return df
+
+class _RecordViewRows:
+    """RecordView.iloc: 구간으로 자른 RecordView 반환 (DataFrame.iloc[start:stop] 대응)"""
+
+    def __init__(self, view):
+        self._view = view
+
+    def __getitem__(self, rows):
+        if not isinstance(rows, slice):
+            raise TypeError('RecordView.iloc은 구간(slice)만 지원')
+        return RecordView(self._view.base, self._view.positions[rows], self._view.columns)
+
+class RecordView:
+    """기준 DataFrame + 행 위치 배열로 표현한 부분 집합
+
+    내보내기/진단 함수가 쓰는 DataFrame 기능(len, columns, [컬럼], iloc[구간], to_numpy)을 제공하며,
+    컬럼 하나 또는 구간 하나를 꺼낼 때만 해당 부분을 복사 (CR/AB 같은 긴 텍스트 컬럼 전체 복사 없음)
+    기준 DataFrame의 지연 필드('__lazy_CR' 등)는 원래 태그 이름('CR')으로 보이고, 꺼낼 때 원본 구간을 디코딩
+    """
+
+    def __init__(self, base, positions=None, columns=None):
+        self.base = base
+        self.positions = np.arange(len(base)) if positions is None else np.asarray(positions, dtype=np.intp)
+        self.columns = _visible_columns(base.columns) if columns is None else columns
+        self.iloc = _RecordViewRows(self)
+        self._raw_values = None  # 뷰 행의 원본 줄 (지연 필드를 처음 꺼낼 때 한 번만 가져옴)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, column):
+        """컬럼 하나를 뷰의 행 순서대로 꺼낸 Series (0부터 시작하는 인덱스, 범주형은 뷰에 있는 값만 범주로 유지)"""
+        if column not in self.columns:
+            raise KeyError(column)
+        if self.is_lazy_field(column):
+            return pd.Series(self._decode_lazy(column))
+        values = self.base[column].take(self.positions).reset_index(drop=True)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.remove_unused_categories()
+        return values
+
+    # --- 지연 필드 ---
+    def is_lazy_field(self, column):
+        """기준 DataFrame에 원본 구간으로만 보관된 필드인지 여부"""
+        return LAZY_SPAN_PREFIX + column in self.base.columns and column not in self.base.columns
+
+    def _decode_lazy(self, column, verbatim=False, multi_line=False):
+        # 뷰 행만 꺼낸 뒤 변환 (원본 줄 컬럼 전체를 Python bytes로 바꾸지 않음)
+        if self._raw_values is None:
+            self._raw_values = self.base[LAZY_RAW_COLUMN].array.take(self.positions).to_numpy()
+        spans = self.base[LAZY_SPAN_PREFIX + column].array.take(self.positions).to_numpy()
+        return [decode_lazy_field(raw, int(span), verbatim, multi_line) for raw, span in zip(self._raw_values, spans)]
+
+    def lazy_span_lengths(self, column):
+        """지연 필드의 뷰 행별 원본 구간 바이트 수 (디코딩 없음, 없으면 0)
+
+        태그와 줄바꿈 들여쓰기를 포함한 UTF-8 바이트 수이므로 디코딩한 값의 글자 수 이상
+        """
+        spans = self.base[LAZY_SPAN_PREFIX + column].to_numpy()[self.positions]
+        return np.where(spans < 0, 0, spans & 0xFFFFFFFF)
+
+    def verbatim_field_lines(self, column, multi_line=False):
+        """지연 필드의 레코드별 내보내기용 WOS 줄 ('CR 첫 값\n   다음 값', 빈 값이면 None, 즉시 필드와 같은 정리 규칙)"""
+        return self._decode_lazy(column, verbatim=True, multi_line=multi_line)
+
+    # --- 부분 집합 ---
+    def subset(self, mask):
+        """뷰 행 기준 불리언 마스크로 고른 새 뷰"""
+        return RecordView(self.base, self.positions[np.asarray(mask, dtype=bool)], self.columns)
+
+    def drop_columns(self, columns):
+        """일부 컬럼을 숨긴 새 뷰 (기준 DataFrame은 그대로)"""
+        return RecordView(self.base, self.positions, self.columns.drop(list(columns), errors='ignore'))
+
+    # --- DataFrame으로 꺼내기 (구간 단위) ---
+    def to_frame(self):
+        """뷰 전체를 DataFrame으로 복사 (작은 구간에만 사용, 지연 필드는 디코딩한 문자열)"""
+        lazy_columns = [column for column in self.columns if self.is_lazy_field(column)]
+        stored_columns = self.columns.drop(lazy_columns) if lazy_columns else self.columns
+        column_positions = self.base.columns.get_indexer(stored_columns)
+        frame = self.base.iloc[self.positions, column_positions].reset_index(drop=True)
+        if lazy_columns:
+            frame = frame.assign(**{column: self[column] for column in lazy_columns})[list(self.columns)]
+        return frame
+
+    def head(self, n=5):
+        return self.iloc[:n].to_frame()
+
+    def to_numpy(self, dtype=None):
+        return self.to_frame().to_numpy(dtype=dtype)
+
+    def iter_frames(self, chunk_records=VIEW_CHUNK_RECORDS):
+        """chunk_records 행씩 잘라 DataFrame으로 생성"""
+        for start in range(0, len(self), chunk_records):
+            yield self.iloc[start:start + chunk_records].to_frame()
+
+    def to_csv(self, path, encoding='utf-8-sig', chunk_records=VIEW_CHUNK_RECORDS, **kwargs):
+        """구간 단위로 CSV 기록 (헤더는 첫 구간에만)"""
+        with open(path, 'w', encoding=encoding, newline='') as output:
+            if len(self) == 0:
+                self.to_frame().to_csv(output, **kwargs)
+            for number, frame in enumerate(self.iter_frames(chunk_records)):
+                frame.to_csv(output, header=number == 0, **kwargs)